@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+benchmark.py — Măsurători de performanță pentru pipeline-ul Python de rețete.
+
+Utilizare:
+  python scripts/benchmark.py separate-adjectives
+  python scripts/benchmark.py separate-adjectives --repeat 200 --db webapp/dev.db
+  python scripts/benchmark.py grammar
+  python scripts/benchmark.py process-lines
+  python scripts/benchmark.py fuzzy-match --catalog-size 5000
+  python scripts/benchmark.py db-matches
+  python scripts/benchmark.py mapping-match --extra 2000
+  python scripts/benchmark.py startup --budget-ms 150
+
+Corpus: liniile de ingrediente din fișierele scraped (data/urls/*.txt,
+parsed_recipes.txt) + numele brute din data/ingredient_name_mappings.json.
+Fiecare benchmark verifică întâi că implementarea nouă dă aceleași rezultate
+ca referința, apoi raportează timpul per linie.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+
+# ──────────────────────────────────────────────────────────────
+# Corpus
+# ──────────────────────────────────────────────────────────────
+
+CORPUS_FILES = [
+    "data/urls/*.txt",
+    "parsed_recipes.txt",
+    "data/local/*.txt",
+]
+MAPPINGS_CORPUS = "data/ingredient_name_mappings.json"
+
+# Linii adăugate corpusului, cu rezultatul așteptat de la process_ingredient_line
+# (legăturile "de" / "of" păstrate, liniile neparsabile întoarse neatinse)
+PROCESS_LINE_CASES = {
+    "400 de grame de fasole": ("400 de grame de fasole", None),
+    "2 linguri de ulei": ("2 linguri de ulei", None),
+    "2 cloves of garlic": ("2 cloves of garlic", None),
+    "  ceva   ciudat  ": ("  ceva   ciudat  ", None),
+}
+
+_META_RE = re.compile(r"^(Servings|Time|Difficulty|Favorite|Link|Category|Categories|Slices|Image|Steps|Method)\s*:", re.I)
+
+
+def load_ingredient_lines() -> list[str]:
+    """Liniile care arată a ingredient ('[qty unit] x' sau 'qty x') din corpus."""
+    lines: list[str] = []
+    for pattern in CORPUS_FILES:
+        for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, pattern))):
+            with open(path, encoding="utf-8") as f:
+                in_steps = False
+                for raw in f:
+                    line = raw.strip()
+                    if line.startswith("==="):
+                        in_steps = False
+                        continue
+                    if re.match(r"^(Steps|Method|## )", line):
+                        in_steps = True
+                        continue
+                    if in_steps or not line or _META_RE.match(line):
+                        continue
+                    if line.startswith("[") or line[0].isdigit():
+                        lines.append(line)
+    lines.extend(PROCESS_LINE_CASES)
+    return lines
+
+
+def load_ingredient_names() -> list[str]:
+    """Nume de ingrediente fără cantitate/unitate (inputul lui separate_adjectives)."""
+    names = []
+    for line in load_ingredient_lines():
+        name = re.sub(r"^\[[^\]]*\]\s*", "", line)
+        name = re.sub(r"^[\d./,\s-]+(?:[a-zA-Z]{1,5}\.?\s+)?", "", name)
+        if name:
+            names.append(name)
+    path = os.path.join(PROJECT_ROOT, MAPPINGS_CORPUS)
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            names.extend(json.load(f).keys())
+    return names
+
+
+def _timeit(fn, items: list, repeat: int) -> float:
+    """Rulează fn pe toate item-urile de `repeat` ori; returnează µs per apel."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(item)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * max(len(items), 1)) * 1e6
+
+
+def _print_header(title: str):
+    print(f"\n{'═'*62}")
+    print(f"  {title}")
+    print(f"{'═'*62}")
+
+
+# ──────────────────────────────────────────────────────────────
+# separate_adjectives: n-grame vs trie
+# ──────────────────────────────────────────────────────────────
+
+def _ngram_best_match(processor, words_lower: list[str]):
+    """Căutarea veche: toate n-gramele contigue, de la cel mai lung la cel mai scurt."""
+    best = None
+    best_len = 0
+    best_priority = 0
+    for length in range(len(words_lower), 0, -1):
+        for start in range(len(words_lower) - length + 1):
+            candidate = ' '.join(words_lower[start:start + length])
+            if candidate in processor.grocery_items:
+                priority = 2
+            elif candidate in processor.COMMON_BASE_INGREDIENTS:
+                priority = 1
+            else:
+                continue
+            if priority > best_priority or (priority == best_priority and length > best_len):
+                best = (start, start + length, priority)
+                best_len = length
+                best_priority = priority
+    return best
+
+
+def bench_separate_adjectives(args):
+    from ingredient_processor import IngredientProcessor
+
+    processor = IngredientProcessor(use_notion=False, db_path=args.db)
+    names = load_ingredient_names()
+    word_lists = [n.lower().split() for n in names]
+
+    _print_header("separate_adjectives — n-grame vs trie")
+    print(f"  Corpus   : {len(names)} nume de ingrediente")
+    print(f"  Catalog  : {len(processor.grocery_items)} grocery items")
+
+    mismatches = [
+        n for n, w in zip(names, word_lists)
+        if _ngram_best_match(processor, w) != processor._match_trie.best_match(w)
+    ]
+    print(f"  Diferențe: {len(mismatches)}")
+    for n in mismatches[:10]:
+        print(f"    ✗ {n}")
+
+    old_us = _timeit(lambda w: _ngram_best_match(processor, w), word_lists, args.repeat)
+    new_us = _timeit(processor._match_trie.best_match, word_lists, args.repeat)
+    full_us = _timeit(processor.separate_adjectives, names, args.repeat)
+    print()
+    print(f"  n-grame (vechi)        : {old_us:8.2f} µs/linie")
+    print(f"  trie                   : {new_us:8.2f} µs/linie   ({old_us / new_us:.1f}×)")
+    print(f"  separate_adjectives()  : {full_us:8.2f} µs/linie")
+    return 1 if mismatches else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# Gramatica comună: throughput per parser
+# ──────────────────────────────────────────────────────────────
+
+def bench_grammar(args):
+    from ingredient_grammar import tokenize
+    from ingredient_processor import IngredientProcessor
+    import normalize_units
+    import web_import_handler
+
+    processor = IngredientProcessor(use_notion=False, db_path=args.db)
+    lines = load_ingredient_lines()
+    plain = [l for l in lines if not l.startswith("[")]
+
+    _print_header("ingredient_grammar — throughput")
+    print(f"  Corpus   : {len(lines)} linii ({len(plain)} fără bracket)")
+
+    unparsed = [l for l in plain if tokenize(l) is None]
+    print(f"  Neparsate: {len(unparsed)}")
+    for l in unparsed[:10]:
+        print(f"    ? {l!r}")
+
+    wrong = [(l, processor.process_ingredient_line(l)) for l, expected in PROCESS_LINE_CASES.items()
+             if processor.process_ingredient_line(l) != expected]
+    print(f"  Greșite  : {len(wrong)} din {len(PROCESS_LINE_CASES)} cazuri fixe")
+    for l, got in wrong:
+        print(f"    ✗ {l!r} → {got!r} (așteptat {PROCESS_LINE_CASES[l]!r})")
+
+    print()
+    for label, fn, items in [
+        ("tokenize()",                             tokenize,                                      lines),
+        ("normalize_units.parse_ingredient_line",  normalize_units.parse_ingredient_line,         plain),
+        ("web_import._parse_simple_ingredient",    web_import_handler._parse_simple_ingredient,   lines),
+        ("web_import._normalize_ingredient_line",  web_import_handler._normalize_ingredient_line, plain),
+        ("IngredientProcessor.process_ingredient_line", processor.process_ingredient_line,        lines),
+    ]:
+        us = _timeit(fn, items, args.repeat)
+        print(f"  {label:<44}: {us:8.2f} µs/linie  ({1e6 / us:>10,.0f} linii/s)")
+    return 1 if wrong else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# process_lines: cache LRU pe linii
+# ──────────────────────────────────────────────────────────────
+
+def bench_process_lines(args):
+    from ingredient_processor import IngredientProcessor
+
+    lines = load_ingredient_lines()
+    uncached = IngredientProcessor(use_notion=False, db_path=args.db, cache_size=0)
+    cached = IngredientProcessor(use_notion=False, db_path=args.db, cache_size=args.cache_size)
+
+    _print_header("process_lines — cache LRU")
+    print(f"  Corpus   : {len(lines)} linii, {len(set(lines))} unice")
+
+    mismatches = [l for l in lines if uncached.process_ingredient_line(l) != cached.process_ingredient_line(l)]
+    print(f"  Diferențe: {len(mismatches)}")
+    for l in mismatches[:10]:
+        print(f"    ✗ {l}")
+
+    # Un batch = corpusul de `repeat` ori, ca la un scrape mare cu fraze repetate
+    batch = lines * args.repeat
+    start = time.perf_counter()
+    uncached.process_lines(batch)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    cached.process_lines(batch)
+    warm = time.perf_counter() - start
+
+    stats = cached.cache_stats()
+    print()
+    print(f"  fără cache             : {cold / len(batch) * 1e6:8.2f} µs/linie")
+    print(f"  cu cache               : {warm / len(batch) * 1e6:8.2f} µs/linie   ({cold / warm:.1f}×)")
+    print(f"  hit rate linii / nume  : {stats['lines']['hit_rate']:.1%} / {stats['names']['hit_rate']:.1%}")
+    return 1 if mismatches else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# fuzzy_match: scanare liniară vs index de trigrame
+# ──────────────────────────────────────────────────────────────
+
+def _synthetic_catalog(grocery_items: dict, size: int, seed: int = 7) -> dict:
+    """Extinde catalogul cu variante perturbate ale numelor reale, până la `size` chei."""
+    import random
+    rnd = random.Random(seed)
+    keys = list(grocery_items)
+    items = dict(grocery_items)
+    while keys and len(items) < size:
+        base = rnd.choice(keys)
+        word = ''.join(rnd.choice('abcdefghijklmnoprstuvz') for _ in range(rnd.randint(3, 8)))
+        name = f"{word} {base}" if rnd.random() < 0.5 else f"{base} {word}"
+        items.setdefault(name, {"name": name, "unit": "", "unit2": ""})
+    return items
+
+
+def bench_fuzzy_match(args):
+    import normalize_units
+
+    grocery_items = normalize_units.load_grocery_items(args.db)
+    if args.catalog_size:
+        grocery_items = _synthetic_catalog(grocery_items, args.catalog_size)
+    names = sorted({n.lower().strip() for n in load_ingredient_names() if n.strip()})
+
+    _print_header("fuzzy_match — scanare liniară vs index de trigrame")
+    print(f"  Corpus   : {len(names)} nume unice")
+    print(f"  Catalog  : {len(grocery_items)} chei")
+
+    start = time.perf_counter()
+    index = normalize_units.FuzzyIndex(grocery_items)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = [
+        n for n in names
+        if normalize_units.fuzzy_match(n, grocery_items, args.threshold)
+        is not normalize_units.fuzzy_match(n, grocery_items, args.threshold, index=index)
+    ]
+    print(f"  Diferențe: {len(mismatches)}")
+    for n in mismatches[:10]:
+        print(f"    ✗ {n}")
+
+    old_us = _timeit(lambda n: normalize_units.fuzzy_match(n, grocery_items, args.threshold), names, args.repeat)
+    new_us = _timeit(lambda n: normalize_units.fuzzy_match(n, grocery_items, args.threshold, index=index),
+                     names, args.repeat)
+    print()
+    print(f"  construire index       : {build_ms:8.1f} ms")
+    print(f"  scanare liniară        : {old_us:8.1f} µs/nume")
+    print(f"  index trigrame         : {new_us:8.1f} µs/nume   ({old_us / new_us:.1f}×)")
+    return 1 if mismatches else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# _find_top_db_matches vs _DbMatchRanker (rezolvare interactivă)
+# ──────────────────────────────────────────────────────────────
+
+def bench_db_matches(args):
+    import scrape_recipes
+
+    db_items = scrape_recipes._load_scraper_db_items(args.db)
+    names = [n.lower().strip() for n in load_ingredient_names() if n.strip()]
+
+    _print_header("top potriviri DB — scanare vs ranker n-grame")
+    print(f"  Corpus   : {len(names)} nume ({len(set(names))} unice)")
+    print(f"  Catalog  : {len(db_items)} chei")
+    print(f"  numpy    : {'da' if scrape_recipes._NUMPY_AVAILABLE else 'nu (fallback scanare completă)'}")
+
+    ranker = scrape_recipes._DbMatchRanker(db_items)
+    mismatches = [n for n in set(names)
+                  if scrape_recipes._find_top_db_matches(n, db_items) != ranker.top(n)]
+    print(f"  Diferențe: {len(mismatches)}")
+    for n in mismatches[:10]:
+        print(f"    ✗ {n}")
+
+    # Ca în _resolve_ingredient_names_interactive: probe "known?" + prompt → 2 apeluri/nume
+    start = time.perf_counter()
+    for n in names:
+        scrape_recipes._find_top_db_matches(n, db_items)
+        scrape_recipes._find_top_db_matches(n, db_items)
+    old = time.perf_counter() - start
+    start = time.perf_counter()
+    ranker = scrape_recipes._DbMatchRanker(db_items)
+    for n in names:
+        ranker.top(n)
+        ranker.top(n)
+    new = time.perf_counter() - start
+    print()
+    print(f"  scanare (probe + prompt): {old * 1000:8.1f} ms total")
+    print(f"  ranker (cu construire)  : {new * 1000:8.1f} ms total   ({old / new:.1f}×)")
+    return 1 if mismatches else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# normalize_ingredient_name: scanare mappings vs Aho-Corasick
+# ──────────────────────────────────────────────────────────────
+
+def _load_benchmark_mappings(extra: int) -> dict:
+    """grocery_mappings (dacă există) + ingredient_name_mappings.json + `extra` chei sintetice."""
+    import random
+    import normalize_units
+
+    mappings = normalize_units.load_ingredient_mappings(os.path.join(PROJECT_ROOT, "data", "ingredient_mappings.json"))
+    path = os.path.join(PROJECT_ROOT, MAPPINGS_CORPUS)
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            for raw, target in json.load(f).items():
+                mappings.setdefault(raw.lower().strip(), target.get("groceryItemName", raw))
+    rnd = random.Random(11)
+    words = [w for k in list(mappings) for w in k.split()] or ["x"]
+    target = len(mappings) + extra
+    while len(mappings) < target:
+        key = " ".join(rnd.choice(words) for _ in range(rnd.randint(2, 3)))
+        mappings.setdefault(key, key.title())
+    return mappings
+
+
+def bench_mapping_match(args):
+    import normalize_units
+
+    mappings = _load_benchmark_mappings(args.extra)
+    names = [n.lower().strip() for n in load_ingredient_names() if n.strip()]
+
+    _print_header("normalize_ingredient_name — scanare vs Aho-Corasick")
+    print(f"  Corpus   : {len(names)} nume")
+    print(f"  Mappings : {len(mappings)} chei")
+
+    start = time.perf_counter()
+    matcher = normalize_units.MappingMatcher(mappings)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = [
+        n for n in names
+        if normalize_units.normalize_ingredient_name(n, mappings, {})
+        != normalize_units.normalize_ingredient_name(n, mappings, {}, matcher=matcher)
+    ]
+    print(f"  Diferențe: {len(mismatches)}")
+    for n in mismatches[:10]:
+        print(f"    ✗ {n}")
+
+    old_us = _timeit(lambda n: normalize_units.normalize_ingredient_name(n, mappings, {}), names, args.repeat)
+    new_us = _timeit(lambda n: normalize_units.normalize_ingredient_name(n, mappings, {}, matcher=matcher),
+                     names, args.repeat)
+    print()
+    print(f"  construire automat     : {build_ms:8.1f} ms")
+    print(f"  scanare mappings       : {old_us:8.2f} µs/nume")
+    print(f"  Aho-Corasick           : {new_us:8.2f} µs/nume   ({old_us / new_us:.1f}×)")
+    return 1 if mismatches else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# startup: cold start per entry point (python -X importtime)
+# ──────────────────────────────────────────────────────────────
+
+STARTUP_ENTRY_POINTS = [
+    "web_import_handler",
+    "import_recipes",
+    "normalize_units",
+    "scrape_recipes",
+    "manage_mappings",
+    "recipes",
+    "recipe_dedup",
+]
+
+
+def _import_profile(module: str) -> dict:
+    """
+    Importă modulul într-un interpretor nou cu -X importtime.
+    Returnează timpul cumulat al importului (µs), timpul total al procesului
+    și cele mai scumpe importuri directe.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPT_DIR, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "?"
+        return {"error": last, "wall_ms": wall_ms}
+
+    # "import time:      self [us] |  cumulative | imported package"; nivelul = indentarea numelui
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, name.strip(), int(cum_us)))
+
+    total_us = 0
+    children = []
+    # Liniile vin în post-ordine: copiii unui modul apar înaintea lui
+    for i, (depth, name, cum_us) in enumerate(entries):
+        if name == module:
+            total_us = cum_us
+            j = i - 1
+            while j >= 0 and entries[j][0] > depth:
+                if entries[j][0] == depth + 1:
+                    children.append((entries[j][2], entries[j][1]))
+                j -= 1
+            break
+    children.sort(reverse=True)
+    return {"import_us": total_us, "wall_ms": wall_ms, "heaviest": children[:3]}
+
+
+def bench_startup(args):
+    modules = args.modules or STARTUP_ENTRY_POINTS
+    _print_header(f"Cold start per entry point (min din {args.repeat} rulări)")
+
+    # Referința: interpretorul gol
+    base_ms = min(_import_profile("sys")["wall_ms"] for _ in range(args.repeat))
+    print(f"  {'python (gol)':<22} {'':>10} {base_ms:9.1f} ms proces")
+
+    over_budget = 0
+    for module in modules:
+        runs = [_import_profile(module) for _ in range(args.repeat)]
+        if "error" in runs[0]:
+            print(f"  {module:<22} ✗ {runs[0]['error']}")
+            over_budget += 1
+            continue
+        best = min(runs, key=lambda r: r["import_us"])
+        import_ms = best["import_us"] / 1000
+        flag = ""
+        if args.budget_ms and import_ms > args.budget_ms:
+            flag = f"  ✗ peste buget ({args.budget_ms:.0f} ms)"
+            over_budget += 1
+        print(f"  {module:<22} {import_ms:7.1f} ms {min(r['wall_ms'] for r in runs):9.1f} ms proces{flag}")
+        for cum_us, name in best["heaviest"]:
+            print(f"      {name:<28} {cum_us / 1000:7.1f} ms")
+    return 1 if over_budget else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# Main
+# ──────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark-uri pentru pipeline-ul de rețete")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("separate-adjectives", help="Trie vs n-grame în separate_adjectives")
+    p.add_argument("--db", "-d", default=os.path.join(PROJECT_ROOT, "webapp", "dev.db"))
+    p.add_argument("--repeat", "-n", type=int, default=50)
+    p.set_defaults(func=bench_separate_adjectives)
+
+    p = sub.add_parser("grammar", help="Throughput ingredient_grammar + parserele care o folosesc")
+    p.add_argument("--db", "-d", default=os.path.join(PROJECT_ROOT, "webapp", "dev.db"))
+    p.add_argument("--repeat", "-n", type=int, default=200)
+    p.set_defaults(func=bench_grammar)
+
+    p = sub.add_parser("process-lines", help="process_lines cu/fără cache LRU")
+    p.add_argument("--db", "-d", default=os.path.join(PROJECT_ROOT, "webapp", "dev.db"))
+    p.add_argument("--repeat", "-n", type=int, default=20)
+    p.add_argument("--cache-size", type=int, default=4096)
+    p.set_defaults(func=bench_process_lines)
+
+    p = sub.add_parser("fuzzy-match", help="fuzzy_match liniar vs FuzzyIndex")
+    p.add_argument("--db", "-d", default=os.path.join(PROJECT_ROOT, "webapp", "dev.db"))
+    p.add_argument("--repeat", "-n", type=int, default=1)
+    p.add_argument("--threshold", type=float, default=0.80)
+    p.add_argument("--catalog-size", type=int, default=0,
+                   help="Extinde catalogul cu nume sintetice până la N chei")
+    p.set_defaults(func=bench_fuzzy_match)
+
+    p = sub.add_parser("db-matches", help="_find_top_db_matches vs _DbMatchRanker")
+    p.add_argument("--db", "-d", default=os.path.join(PROJECT_ROOT, "webapp", "dev.db"))
+    p.set_defaults(func=bench_db_matches)
+
+    p = sub.add_parser("mapping-match", help="normalize_ingredient_name cu/fără MappingMatcher")
+    p.add_argument("--repeat", "-n", type=int, default=20)
+    p.add_argument("--extra", type=int, default=0, help="Adaugă N mappings sintetice")
+    p.set_defaults(func=bench_mapping_match)
+
+    p = sub.add_parser("startup", help="Timp de import (cold start) per entry point")
+    p.add_argument("modules", nargs="*", help=f"Module (default: {', '.join(STARTUP_ENTRY_POINTS)})")
+    p.add_argument("--repeat", "-n", type=int, default=5)
+    p.add_argument("--budget-ms", type=float, default=0,
+                   help="Eșuează (exit 1) dacă un import depășește bugetul")
+    p.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
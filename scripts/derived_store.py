@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+derived_store.py — Tabelele derivate ale scripturilor, în afara dev.db.
+
+dev.db aparține schemei Prisma; tabelele calculate de scripturile Python
+(RecipeFingerprint, RecipeMinHash, RecipeMinHashBand) stau într-un SQLite separat
+din data/cache/, unul per DB sursă, atașat conexiunii la dev.db ca schema `derived`:
+
+  - interogările pot face JOIN cu tabelele din dev.db (ex: doar rețetele existente)
+  - scrierile intră în aceeași tranzacție cu rândurile din Recipe (SQLite face
+    commit atomic peste DB-urile atașate, dev.db nefiind în modul WAL)
+  - nu există FOREIGN KEY spre Recipe: rândurile rețetelor șterse din webapp sunt
+    ignorate la citire (JOIN) și curățate de cei care le întrețin
+
+Fișierul poate fi șters oricând: fingerprint-urile dispar (rețetele existente sunt
+sărite la re-import, ca la un import vechi), iar semnăturile MinHash se recalculează
+la următoarea deschidere a indexului de duplicate.
+
+Utilizare:
+  python scripts/derived_store.py               # calea + tabelele pentru dev.db
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from typing import Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache")
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "webapp", "dev.db")
+
+SCHEMA = "derived"
+
+
+def derived_path(db_path: str) -> str:
+    """Fișierul derivat al unui DB: data/cache/<nume>-<hash cale>.sqlite3."""
+    db_path = os.path.abspath(db_path)
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    digest = hashlib.blake2b(db_path.encode("utf-8"), digest_size=6).hexdigest()
+    return os.path.join(CACHE_DIR, f"{stem}-{digest}.sqlite3")
+
+
+def _main_file(conn: sqlite3.Connection) -> Optional[str]:
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return path or None
+    return None
+
+
+def attach(conn: sqlite3.Connection) -> bool:
+    """
+    Atașează fișierul derivat ca schema `derived` (idempotent). Fără fișier pe
+    disc pentru DB-ul principal (ex: :memory:) se atașează un DB în memorie.
+    False dacă fișierul nu poate fi deschis.
+    """
+    attached = {name for _, name, _ in conn.execute("PRAGMA database_list")}
+    if SCHEMA in attached:
+        return True
+    main = _main_file(conn)
+    target = ":memory:"
+    if main:
+        target = derived_path(main)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        conn.execute(f"ATTACH DATABASE ? AS {SCHEMA}", (target,))
+    except sqlite3.Error as e:
+        print(f"  ⚠ Nu pot deschide tabelele derivate ({target}): {e}", file=sys.stderr)
+        return False
+    return True
+
+
+def exists(db_path: str) -> bool:
+    """True dacă DB-ul are deja un fișier derivat (cititorii nu-l creează degeaba)."""
+    return os.path.isfile(derived_path(db_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabelele derivate ale unui dev.db")
+    parser.add_argument("--db", "-d", default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    path = derived_path(args.db)
+    print(f"\n{'═'*62}")
+    print(f"  Tabele derivate pentru {os.path.relpath(os.path.abspath(args.db), PROJECT_ROOT)}")
+    print(f"{'═'*62}")
+    print(f"  Fișier : {os.path.relpath(path, PROJECT_ROOT)}")
+    if not os.path.isfile(path):
+        print("  (nu există încă — se creează la primul import)")
+        return
+    conn = sqlite3.connect(path)
+    try:
+        for (table,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name").fetchall():
+            count = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            print(f"  {table:<20} {count}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
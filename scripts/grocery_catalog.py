@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+grocery_catalog.py — Snapshot serializat al catalogului de grocery items.
+
+La fiecare pornire, IngredientProcessor citea tot GroceryItem din SQLite (sau pagina
+prin toată baza Notion Groceries) și reconstruia seturile + trie-ul de match.
+Snapshot-ul din data/cache/grocery_catalog.pickle păstrează:
+  - rândurile sursei (id → nume)
+  - cheia de validare: (cale, mtime, size, plus -wal) pentru dev.db, respectiv watermark-ul
+    last_edited_time pentru Notion
+  - setul grocery_items (cu variantele de plural) și indexul precalculat (trie-ul)
+
+fold_key / FoldedIndex: cheia de lookup fără diacritice și plural, încercată înaintea
+oricărui scor fuzzy de normalize_units, import_recipes și scrape_recipes.
+
+Refresh:
+  - SQLite: snapshot-ul e valid cât timp dev.db (și -wal) are același mtime/size; altfel
+    se recitesc rândurile și se reconstruiește indexul
+  - Notion: se cer doar paginile cu last_edited_time >= watermark; paginile
+    arhivate/șterse dispar doar la un refresh complet (--full)
+
+Utilizare:
+  python scripts/grocery_catalog.py              # refresh + statistici
+  python scripts/grocery_catalog.py --full       # ignoră snapshot-ul existent
+  python scripts/grocery_catalog.py --notion     # forțează sursa Notion
+"""
+
+import argparse
+import functools
+import os
+import pickle
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, "data", "cache", "grocery_catalog.pickle")
+SNAPSHOT_VERSION = 1
+
+
+# ──────────────────────────────────────────────────────────────
+# Chei normalizate (diacritice, plural, spații)
+# ──────────────────────────────────────────────────────────────
+
+_WS_RE = re.compile(r"\s+")
+# Litere fără descompunere NFKD
+_EXTRA_FOLD = str.maketrans({"ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d"})
+
+
+def _singular(word: str) -> str:
+    """Plural englezesc simplu: tomatoes → tomato, berries → berry, eggs → egg."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes", "sses")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+@functools.lru_cache(maxsize=65536)
+def fold_key(name: str) -> str:
+    """
+    Cheia de lookup tolerantă: fără diacritice (ceapă → ceapa, jalapeño → jalapeno),
+    lowercase, spații comprimate, ultimul cuvânt la singular.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.lower().translate(_EXTRA_FOLD))
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    words = _WS_RE.sub(" ", folded).strip().split(" ")
+    words[-1] = _singular(words[-1])
+    return " ".join(words)
+
+
+class FoldedIndex:
+    """
+    fold_key → cheia originală din catalog, construit o dată per încărcare de catalog.
+    Se încearcă după match-ul exact și înainte de orice scor fuzzy. La coliziuni
+    (două nume din catalog cu aceeași cheie) câștigă primul.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.index: Dict[str, str] = {}
+        for key in keys:
+            self.index.setdefault(fold_key(key), key)
+
+    def get(self, name: str) -> Optional[str]:
+        return self.index.get(fold_key(name))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+# ──────────────────────────────────────────────────────────────
+# Catalog
+# ──────────────────────────────────────────────────────────────
+
+class GroceryCatalog:
+    """
+    Rândurile catalogului + seturile derivate + indexul precalculat.
+
+    `index` e opac pentru acest modul: IngredientProcessor îl construiește o dată
+    (trie-ul) și îl salvează în snapshot împreună cu `index_key`, ca să-l poată
+    refolosi cât timp nici catalogul, nici lista de ingrediente comune nu s-au schimbat.
+    """
+
+    def __init__(self, source: str, rows: Dict[str, str],
+                 key: Any = None, watermark: Optional[str] = None):
+        self.source = source            # 'sqlite' sau 'notion'
+        self.rows = rows                # id → nume
+        self.key = key                  # (cale, mtime_ns, size, -wal) pentru SQLite
+        self.watermark = watermark      # max(last_edited_time) pentru Notion
+        self.index: Any = None
+        self.index_key: Optional[str] = None
+        self.changed = True             # False dacă a fost servit direct din snapshot
+        self._rebuild_sets()
+
+    def _rebuild_sets(self):
+        grocery_items: Set[str] = set()
+        for name in self.rows.values():
+            name_lower = name.lower().strip()
+            if not name_lower:
+                continue
+            grocery_items.add(name_lower)
+            # Varianta fără 's' final (aproximare plural)
+            if name_lower.endswith("s"):
+                grocery_items.add(name_lower[:-1])
+        self.grocery_items = grocery_items
+
+    def to_state(self) -> Dict[str, Any]:
+        # dict simplu (nu instanța) — snapshot-ul rămâne citibil și când modulul
+        # rulează ca __main__
+        state = self.__dict__.copy()
+        state.pop("changed", None)
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "GroceryCatalog":
+        catalog = cls.__new__(cls)
+        catalog.__dict__.update(state)
+        catalog.changed = False
+        return catalog
+
+
+def _read_snapshot(path: str) -> Optional[GroceryCatalog]:
+    """Snapshot-ul de pe disc; None (= cache miss) pentru orice fișier lipsă sau stricat."""
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            return None
+        return GroceryCatalog.from_state(payload["state"])
+    except Exception:
+        return None
+
+
+def save_snapshot(catalog: GroceryCatalog, path: str = SNAPSHOT_PATH):
+    """
+    Scrie snapshot-ul atomic, printr-un fișier temporar unic per scriitor (workerii
+    din pool-uri și procesele web_import_handler pot salva în același timp) + rename;
+    erorile de I/O nu sunt fatale.
+    """
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path),
+                                   prefix=os.path.basename(path) + ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "state": catalog.to_state()}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"  ⚠ Nu pot salva snapshot-ul catalogului: {e}", file=sys.stderr)
+    finally:
+        # Rămâne doar dacă rename-ul n-a mai avut loc
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+# ──────────────────────────────────────────────────────────────
+# Surse
+# ──────────────────────────────────────────────────────────────
+
+def _db_key(db_path: str) -> Tuple[str, int, int, int, int]:
+    # Un DB în modul WAL (deschis așa de alt tool) primește scrierile în -wal,
+    # fără să-și schimbe mtime/size până la checkpoint → intră și -wal în cheie
+    st = os.stat(db_path)
+    try:
+        wal = os.stat(f"{db_path}-wal")
+        wal_mtime, wal_size = wal.st_mtime_ns, wal.st_size
+    except OSError:
+        wal_mtime = wal_size = 0
+    return os.path.abspath(db_path), st.st_mtime_ns, st.st_size, wal_mtime, wal_size
+
+
+def catalog_key(db_path: Optional[str]) -> Optional[Tuple[str, int, int, int, int]]:
+    """
+    Cheia snapshot-ului pentru dev.db (None dacă DB-ul lipsește): se schimbă la
+    orice scriere, deci apelanții care țin date derivate din catalog știu când să
+    le reîncarce.
+    """
+    try:
+        return _db_key(db_path) if db_path else None
+    except OSError:
+        return None
+
+
+def _fetch_sqlite_rows(db_path: str) -> Dict[str, str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute('SELECT id, name FROM "GroceryItem"').fetchall())
+    finally:
+        conn.close()
+
+
+def _fetch_notion_rows(since: Optional[str]) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Paginile din Groceries editate la/după `since` (toate dacă since e None).
+    Returnează (id → nume, watermark nou).
+    """
+    from notion_client import Client
+    from dotenv import load_dotenv
+
+    load_dotenv('notion.env')
+    db_groceries = os.getenv('DB_GROCERIES_ID')
+    if not db_groceries:
+        raise RuntimeError("DB_GROCERIES_ID nu este setat")
+    notion = Client(auth=os.getenv('NOTION_TOKEN'))
+
+    query: Dict[str, Any] = {"database_id": db_groceries}
+    if since:
+        query["filter"] = {"timestamp": "last_edited_time",
+                           "last_edited_time": {"on_or_after": since}}
+
+    rows: Dict[str, str] = {}
+    watermark = since
+    start_cursor = None
+    while True:
+        if start_cursor:
+            query["start_cursor"] = start_cursor
+        results = notion.databases.query(**query)
+        for item in results.get('results', []):
+            title = item.get('properties', {}).get('Name', {}).get('title', [])
+            name = title[0].get('text', {}).get('content', '').strip() if title else ''
+            rows[item['id']] = name
+            edited = item.get('last_edited_time')
+            if edited and (watermark is None or edited > watermark):
+                watermark = edited
+        if not results.get('has_more'):
+            break
+        start_cursor = results.get('next_cursor')
+    return rows, watermark
+
+
+# ──────────────────────────────────────────────────────────────
+# API
+# ──────────────────────────────────────────────────────────────
+
+def load_catalog(db_path: Optional[str] = None, use_notion: bool = True,
+                 snapshot_path: str = SNAPSHOT_PATH, full: bool = False) -> Optional[GroceryCatalog]:
+    """
+    Returnează catalogul, din snapshot dacă e încă valid.
+    SQLite are prioritate; Notion e folosit doar dacă DB-ul local lipsește sau e gol.
+    Returnează None dacă nicio sursă nu e disponibilă.
+    """
+    snapshot = None if full else _read_snapshot(snapshot_path)
+
+    if db_path and os.path.isfile(db_path):
+        try:
+            key = _db_key(db_path)
+            if snapshot and snapshot.source == "sqlite" and snapshot.key == key:
+                return snapshot
+            rows = _fetch_sqlite_rows(db_path)
+            if rows:
+                catalog = GroceryCatalog("sqlite", rows, key=key)
+                # Același conținut (ex: doar mtime atins) → păstrează indexul
+                if snapshot and snapshot.source == "sqlite" and snapshot.rows == rows:
+                    catalog.index, catalog.index_key = snapshot.index, snapshot.index_key
+                save_snapshot(catalog, snapshot_path)
+                return catalog
+        except sqlite3.Error as e:
+            print(f"  ⚠ Nu pot încărca grocery items din DB: {e}", file=sys.stderr)
+
+    if not use_notion:
+        return None
+
+    notion_snapshot = snapshot if snapshot and snapshot.source == "notion" else None
+    since = notion_snapshot.watermark if notion_snapshot else None
+    try:
+        changed_rows, watermark = _fetch_notion_rows(since)
+    except Exception as e:
+        print(f"  ⚠ Nu pot încărca grocery items din Notion: {e}", file=sys.stderr)
+        # Snapshot vechi e mai bun decât nimic când nu avem conexiune
+        return notion_snapshot
+
+    if notion_snapshot:
+        if not any(notion_snapshot.rows.get(pid) != name for pid, name in changed_rows.items()):
+            if watermark != notion_snapshot.watermark:
+                notion_snapshot.watermark = watermark
+                save_snapshot(notion_snapshot, snapshot_path)
+            return notion_snapshot
+        rows = dict(notion_snapshot.rows)
+        rows.update(changed_rows)
+    else:
+        rows = changed_rows
+
+    catalog = GroceryCatalog("notion", rows, watermark=watermark)
+    save_snapshot(catalog, snapshot_path)
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh snapshot catalog grocery items")
+    parser.add_argument("--db", "-d", default=os.path.join(PROJECT_ROOT, "webapp", "dev.db"))
+    parser.add_argument("--notion", action="store_true", help="Ignoră dev.db, folosește Notion")
+    parser.add_argument("--full", action="store_true", help="Reconstruiește de la zero")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = load_catalog(None if args.notion else args.db, use_notion=True, full=args.full)
+    elapsed = (time.perf_counter() - start) * 1000
+    if catalog is None:
+        print("✗ Nicio sursă de grocery items disponibilă")
+        sys.exit(1)
+
+    print(f"\n{'═'*62}")
+    print(f"  Catalog grocery items ({catalog.source})")
+    print(f"{'═'*62}")
+    print(f"  Rânduri       : {len(catalog.rows)}")
+    print(f"  Nume + plural : {len(catalog.grocery_items)}")
+    print(f"  Din snapshot  : {'da' if not catalog.changed else 'nu (reîncărcat)'}")
+    if catalog.watermark:
+        print(f"  Watermark     : {catalog.watermark}")
+    print(f"  Timp          : {elapsed:.1f} ms")
+    print(f"  Snapshot      : {os.path.relpath(SNAPSHOT_PATH, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
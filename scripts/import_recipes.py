@@ -6,13 +6,20 @@ Utilizare:
   python scripts/import_recipes.py
   python scripts/import_recipes.py --input data/local/scraped_local_recipes.txt
   python scripts/import_recipes.py --dry-run
-  python scripts/import_recipes.py --force    # re-importă rețete existente
+  python scripts/import_recipes.py --force    # rescrie în loc rețetele existente
+
+Re-import: fiecare rețetă importată are un fingerprint (hash canonic pe metadate,
+ingrediente, pași) în tabela RecipeFingerprint (derived_store.py, în afara dev.db).
+Rețetele neschimbate sunt sărite,
+iar la cele modificate se rescriu doar părțile care diferă, în același rând Recipe.
+Rețetele existente fără fingerprint sunt sărite, cu excepția --force.
 
 Pipeline:
   scrape_recipes.py  →  normalize_units.py  →  import_recipes.py
 """
 
 import argparse
+import hashlib
 import json
 import os
 import re
@@ -20,56 +27,75 @@ import secrets
 import shutil
 import sqlite3
 import string
-from fractions import Fraction
-from typing import Optional
+import time
+from typing import Iterable, Iterator, Optional
+
+from derived_store import SCHEMA as DERIVED, attach as attach_derived, exists as derived_exists
+from grocery_catalog import FoldedIndex
+from ingredient_grammar import BRACKET_RE, parse_quantity, split_bracket
+from mapping_tables import NameMappings, UnitChoices, connect as connect_mapping_tables
+from recipe_dedup import (DEFAULT_THRESHOLD, NearDuplicateIndex, minhash, open_index,
+                           recipe_features, write_signatures)
+from recipe_dedup import ensure_tables as ensure_minhash_tables
 
 
 # ──────────────────────────────────────────────────────────────
 # ID generation (CUID-like, compatibil cu Prisma)
 # ──────────────────────────────────────────────────────────────
 
+_ID_ALPHABET = string.ascii_lowercase + string.digits
+_ID_LEN = 24
+# Octeții >= 252 sunt eliminați: 252 = 7 × 36, deci b % 36 rămâne uniform
+_ID_BYTE_LIMIT = 256 - 256 % len(_ID_ALPHABET)
+_ID_TABLE = bytes(ord(_ID_ALPHABET[b % len(_ID_ALPHABET)]) if b < _ID_BYTE_LIMIT else 0
+                  for b in range(256))
+_ID_REJECT = bytes(range(_ID_BYTE_LIMIT, 256))
+
+
+def _id_chars(n: int) -> str:
+    return secrets.token_bytes(n).translate(_ID_TABLE, _ID_REJECT).decode("ascii")
+
+
+def new_ids(n: int) -> list[str]:
+    """n ID-uri CUID-like dintr-o singură extragere token_bytes (plus rar o completare)."""
+    needed = n * _ID_LEN
+    # ~1.6% din octeți sunt eliminați → o marjă de 1/16 acoperă aproape mereu tot
+    chars = _id_chars(needed + needed // 16 + 8)
+    while len(chars) < needed:
+        chars += _id_chars(needed - len(chars) + 8)
+    return ["c" + chars[i:i + _ID_LEN] for i in range(0, needed, _ID_LEN)]
+
+
 def new_id() -> str:
-    alphabet = string.ascii_lowercase + string.digits
-    return "c" + "".join(secrets.choice(alphabet) for _ in range(24))
+    return new_ids(1)[0]
 
 
 # ──────────────────────────────────────────────────────────────
 # Parsare format scraped
 # ──────────────────────────────────────────────────────────────
 
-BRACKET_RE   = re.compile(r"^\[([^\]]+)\]\s*(.+)$")
+TITLE_RE     = re.compile(r"^===\s*(.+?)\s*===$")
 OLD_GROUP_RE = re.compile(r"^\[(\d+)\]$")          # [1] [2] [3] — format vechi
 META_RE      = re.compile(r"^(Servings|Time|Difficulty|Favorite|Link|Category|Slices|Image):\s*(.*)")
 STEP_RE      = re.compile(r"^(\d+)\.\s+(.*)")
 
 
-def _parse_bracket(bracket: str) -> tuple[str, Optional[str]]:
-    bracket = bracket.strip()
-    m = re.match(r"^([0-9./\s]+)\s+(.+)$", bracket)
-    if m:
-        return m.group(1).strip(), m.group(2).strip()
-    return bracket, None
-
-
-def _parse_qty(s: Optional[str]) -> Optional[float]:
-    if not s:
-        return None
-    try:
-        return float(Fraction(s.strip()))
-    except Exception:
-        return None
+def parse_scraped_file(content: str) -> list[dict]:
+    """Parsează conținutul unui fișier scraped și returnează lista de rețete."""
+    return list(iter_scraped_recipes(content.splitlines()))
 
 
-def parse_scraped_file(content: str) -> list[dict]:
+def iter_scraped_recipes(lines: Iterable[str]) -> Iterator[dict]:
     """
-    Parsează fișier scraped și returnează lista de rețete.
+    Generator: produce câte o rețetă de îndată ce s-a terminat (la următorul titlu
+    sau la finalul input-ului). `lines` poate fi chiar handle-ul fișierului, deci
+    memoria rămâne O(o rețetă) indiferent de mărimea exportului.
 
     Formate suportate:
       [N]            — header de grup, format vechi (scrape înainte de fix)
       Group Name     — header de grup, format nou (text simplu)
       [qty unit] name — ingredient
     """
-    recipes: list[dict] = []
     r: Optional[dict] = None
     state: Optional[str] = None  # 'meta' | 'desc' | 'ingr' | 'steps'
 
@@ -84,15 +110,15 @@ def parse_scraped_file(content: str) -> list[dict]:
             r["description"] = " ".join(desc_lines)
         desc_lines.clear()
 
-    for raw in content.splitlines():
+    for raw in lines:
         line = raw.strip()
 
         # ── Titlu rețetă ─────────────────────────────────────
-        m = re.match(r"^===\s*(.+?)\s*===$", line)
+        m = TITLE_RE.match(line)
         if m:
             if r:
                 flush_desc()
-                recipes.append(r)
+                yield r
             r = {
                 "name": m.group(1).rstrip("."),
                 "servings": None, "time": None, "difficulty": None,
@@ -172,14 +198,14 @@ def parse_scraped_file(content: str) -> list[dict]:
 
                 state = "ingr"
 
-                qty_str, unit_str = _parse_bracket(bracket)
+                qty_str, unit_str = split_bracket(bracket)
                 name = rest.split(",")[0].strip()
                 name = re.sub(r"\s*\(.*?\)", "", name).strip()
                 name = re.sub(r"\s+(?:OR|or)\s+.*$", "", name).strip()
 
                 r["ingredients"].append({
                     "name":       name.lower(),
-                    "qty":        _parse_qty(qty_str),
+                    "qty":        parse_quantity(qty_str),
                     "unit":       unit_str,
                     "groupName":  group_name,
                     "groupOrder": group_order,
@@ -197,22 +223,44 @@ def parse_scraped_file(content: str) -> list[dict]:
 
     if r:
         flush_desc()
-        recipes.append(r)
-
-    return recipes
+        yield r
 
 
 # ──────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────
 
-def load_choices(path: str) -> dict:
+def load_choices(path: str, mapping_conn: Optional[sqlite3.Connection] = None):
+    """UnitChoices peste UnitRule dacă avem dev.db; altfel tot JSON-ul, ca dict."""
+    if mapping_conn is not None:
+        return UnitChoices(mapping_conn, path)
     if not os.path.isfile(path):
         return {}
     with open(path, encoding="utf-8") as f:
         return json.load(f)
 
 
+def lookup_grocery(name: str, grocery_items: dict, name_mappings: Optional[NameMappings],
+                   folded: Optional[FoldedIndex] = None) -> Optional[dict]:
+    """
+    Match exact în GroceryItem, apoi pe cheia normalizată (diacritice/plural),
+    apoi prin IngredientNameMapping (rawName).
+    """
+    grocery = grocery_items.get(name)
+    if grocery:
+        return grocery
+    if folded is not None:
+        key = folded.get(name)
+        if key is not None:
+            return grocery_items[key]
+    if name_mappings is None:
+        return None
+    mapping = name_mappings.get(name)
+    if not mapping:
+        return None
+    return {"id": mapping["groceryItemId"], "name": mapping["groceryItemName"]}
+
+
 def load_grocery_items(db_path: str) -> dict[str, dict]:
     if not os.path.isfile(db_path):
         return {}
@@ -224,15 +272,95 @@ def load_grocery_items(db_path: str) -> dict[str, dict]:
     return {name.lower().strip(): {"id": id_, "name": name} for id_, name in rows}
 
 
-def existing_recipe_names(db_path: str) -> set[str]:
+def existing_recipes(db_path: str) -> dict[str, str]:
+    """name_lower → id pentru rețetele deja în DB."""
     if not os.path.isfile(db_path):
-        return set()
+        return {}
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
-    cur.execute('SELECT name FROM "Recipe"')
-    names = {row[0].lower().strip() for row in cur.fetchall()}
+    cur.execute('SELECT id, name FROM "Recipe"')
+    recipes = {name.lower().strip(): id_ for id_, name in cur.fetchall()}
     conn.close()
-    return names
+    return recipes
+
+
+# ──────────────────────────────────────────────────────────────
+# Fingerprint conținut (re-import incremental)
+# ──────────────────────────────────────────────────────────────
+
+# Părțile unei rețete care pot fi rescrise independent la re-import
+RECIPE_PARTS = ("meta", "ingredients", "instructions")
+_PART_LABELS = {"meta": "metadate", "ingredients": "ingrediente", "instructions": "pași"}
+_META_FIELDS = ("name", "servings", "time", "difficulty", "category", "favorite",
+                "link", "image", "description")
+
+# În DB-ul derivat (derived_store.py): fără FOREIGN KEY spre Recipe, deci citirile
+# fac JOIN cu Recipe, iar rețetele șterse între timp sunt importate ca noi
+_FINGERPRINT_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS {DERIVED}."RecipeFingerprint" (
+      "nameKey"          TEXT NOT NULL PRIMARY KEY,
+      "recipeId"         TEXT NOT NULL,
+      "contentHash"      TEXT NOT NULL,
+      "metaHash"         TEXT NOT NULL,
+      "ingredientsHash"  TEXT NOT NULL,
+      "instructionsHash" TEXT NOT NULL,
+      "updatedAt"        DATETIME NOT NULL
+    )
+"""
+_FINGERPRINT_SQL = f"""
+    INSERT INTO {DERIVED}."RecipeFingerprint"
+      ("nameKey", "recipeId", "contentHash", "metaHash", "ingredientsHash",
+       "instructionsHash", "updatedAt")
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT("nameKey") DO UPDATE SET
+      "recipeId" = excluded."recipeId", "contentHash" = excluded."contentHash",
+      "metaHash" = excluded."metaHash", "ingredientsHash" = excluded."ingredientsHash",
+      "instructionsHash" = excluded."instructionsHash", "updatedAt" = excluded."updatedAt"
+"""
+
+
+def _digest(obj) -> str:
+    canonical = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def recipe_fingerprint(recipe: dict) -> dict[str, str]:
+    """Hash canonic per parte (meta / ingredients / instructions) + hash-ul întregului."""
+    fp = {
+        "meta": _digest({k: recipe.get(k) for k in _META_FIELDS}),
+        "ingredients": _digest(recipe["ingredients"]),
+        "instructions": _digest(recipe["instructions"]),
+    }
+    fp["content"] = _digest([fp[part] for part in RECIPE_PARTS])
+    return fp
+
+
+def ensure_fingerprint_table(conn: sqlite3.Connection):
+    """Atașează DB-ul derivat și creează tabela de fingerprint-uri dacă lipsește."""
+    if not attach_derived(conn):
+        raise sqlite3.OperationalError("DB-ul derivat (fingerprint-uri) nu poate fi deschis")
+    conn.execute(_FINGERPRINT_SCHEMA)
+
+
+def load_fingerprints(db_path: str) -> dict[str, dict]:
+    """nameKey → {recipeId, content, meta, ingredients, instructions}; doar rețete existente."""
+    if not os.path.isfile(db_path) or not derived_exists(db_path):
+        return {}
+    conn = sqlite3.connect(db_path)
+    try:
+        attach_derived(conn)
+        rows = conn.execute(
+            'SELECT f."nameKey", f."recipeId", f."contentHash", f."metaHash", '
+            'f."ingredientsHash", f."instructionsHash" '
+            f'FROM {DERIVED}."RecipeFingerprint" f JOIN "Recipe" r ON r.id = f."recipeId"').fetchall()
+    except sqlite3.OperationalError:
+        # Tabela apare la primul import cu fingerprint
+        return {}
+    finally:
+        conn.close()
+    return {key: {"recipeId": rid, "content": content, "meta": meta,
+                  "ingredients": ingr, "instructions": instr}
+            for key, rid, content, meta, ingr, instr in rows}
 
 
 # ──────────────────────────────────────────────────────────────
@@ -294,82 +422,459 @@ def apply_choice(name: str, qty: Optional[float], unit: Optional[str],
 # Insert în DB
 # ──────────────────────────────────────────────────────────────
 
-def insert_recipe(conn: sqlite3.Connection, recipe: dict, grocery_items: dict,
-                  choices: dict, verbose: bool) -> dict:
-    recipe_id = new_id()
+_RECIPE_SQL = """
+    INSERT INTO "Recipe"
+      (id, name, servings, time, difficulty, category, favorite, link,
+       "imageUrl", notes, "createdAt", "updatedAt")
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+"""
+_INGREDIENT_SQL = """
+    INSERT INTO "Ingredient"
+      (id, "recipeId", "groceryItemId", "groupName", "groupOrder",
+       quantity, unit, "order")
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSTRUCTION_SQL = """
+    INSERT INTO "Instruction"
+      (id, "recipeId", step, text, "isSection")
+    VALUES (?, ?, ?, ?, ?)
+"""
+_RECIPE_UPDATE_SQL = """
+    UPDATE "Recipe" SET
+      name = ?, servings = ?, time = ?, difficulty = ?, category = ?, favorite = ?,
+      link = ?, "imageUrl" = ?, notes = ?, "updatedAt" = datetime('now')
+    WHERE id = ?
+"""
+
+
+def tune_session(conn: sqlite3.Connection):
+    """
+    Sesiune pentru import în masă: synchronous=NORMAL (mai puține fsync-uri per commit),
+    cache de 64 MB, tabele temporare în RAM. Modul de jurnal al dev.db nu e schimbat:
+    e persistent (ar rămâne WAL după import) și ar ascunde scrierile de cheia
+    snapshot-ului de catalog (mtime/size ale dev.db).
+    Tranzacțiile sunt gestionate explicit (BEGIN / SAVEPOINT) de RecipeBatchWriter.
+    """
+    conn.isolation_level = None
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    # Fingerprint-urile și semnăturile MinHash se scriu în lotul Recipe (DB-ul derivat)
+    ensure_fingerprint_table(conn)
+    ensure_minhash_tables(conn)
+
+
+def _ids_needed(recipe: dict) -> int:
+    return 1 + len(recipe["ingredients"]) + len(recipe["instructions"])
+
+
+def build_recipe_rows(recipe: dict, grocery_items: dict, choices: dict, verbose: bool,
+                      name_mappings: Optional[NameMappings] = None,
+                      folded: Optional[FoldedIndex] = None,
+                      ids: Optional[Iterator[str]] = None,
+                      recipe_id: Optional[str] = None) -> dict:
+    """
+    Construiește rândurile Recipe / Ingredient / Instruction ale unei rețete, fără
+    să atingă DB-ul. `ids` — ID-uri pregenerate pentru tot lotul (vezi _ids_needed);
+    `recipe_id` — ID-ul rețetei existente, la actualizare.
+    """
+    if ids is None:
+        ids = iter(new_ids(_ids_needed(recipe)))
+    new_recipe_id = next(ids)
+    recipe_id = recipe_id or new_recipe_id
     unmapped = 0
 
     image_url = resolve_image(recipe.get("image"))
 
-    conn.execute(
-        """
-        INSERT INTO "Recipe"
-          (id, name, servings, time, difficulty, category, favorite, link,
-           "imageUrl", notes, "createdAt", "updatedAt")
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
-        """,
-        (
-            recipe_id,
-            recipe["name"],
-            recipe.get("servings"),
-            recipe.get("time"),
-            recipe.get("difficulty"),
-            recipe.get("category"),
-            1 if recipe.get("favorite") else 0,
-            recipe.get("link"),
-            image_url,
-            recipe.get("description"),
-        ),
+    recipe_row = (
+        recipe_id,
+        recipe["name"],
+        recipe.get("servings"),
+        recipe.get("time"),
+        recipe.get("difficulty"),
+        recipe.get("category"),
+        1 if recipe.get("favorite") else 0,
+        recipe.get("link"),
+        image_url,
+        recipe.get("description"),
     )
 
+    ingredient_rows = []
     for order, ingr in enumerate(recipe["ingredients"]):
         name = ingr["name"]
         # Ingredient fără unitate → piece implicit
         raw_unit = ingr["unit"] if ingr["unit"] is not None else "piece"
         qty, unit = apply_choice(name, ingr["qty"], raw_unit, choices)
 
-        grocery = grocery_items.get(name)
+        grocery = lookup_grocery(name, grocery_items, name_mappings, folded)
         grocery_id = grocery["id"] if grocery else None
         if not grocery_id:
             unmapped += 1
             if verbose:
                 print(f"      ⚠  nemapat: '{name}'")
 
-        conn.execute(
-            """
-            INSERT INTO "Ingredient"
-              (id, "recipeId", "groceryItemId", "groupName", "groupOrder",
-               quantity, unit, "order")
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                new_id(), recipe_id, grocery_id,
-                ingr.get("groupName"), ingr.get("groupOrder", 0),
-                qty, unit, order,
-            ),
-        )
+        ingredient_rows.append((
+            next(ids), recipe_id, grocery_id,
+            ingr.get("groupName"), ingr.get("groupOrder", 0),
+            qty, unit, order,
+        ))
 
+    instruction_rows = []
     step_num = 1
     for instr in recipe["instructions"]:
         is_section = instr["isSection"]
-        conn.execute(
-            """
-            INSERT INTO "Instruction"
-              (id, "recipeId", step, text, "isSection")
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                new_id(), recipe_id,
-                0 if is_section else step_num,
-                instr["text"],
-                1 if is_section else 0,
-            ),
-        )
+        instruction_rows.append((
+            next(ids), recipe_id,
+            0 if is_section else step_num,
+            instr["text"],
+            1 if is_section else 0,
+        ))
         if not is_section:
             step_num += 1
 
-    return {"ingr_total": len(recipe["ingredients"]), "ingr_unmapped": unmapped,
-            "has_image": bool(image_url)}
+    return {
+        "recipe": recipe_row,
+        "ingredients": ingredient_rows,
+        "instructions": instruction_rows,
+        "stats": {"ingr_total": len(recipe["ingredients"]), "ingr_unmapped": unmapped,
+                  "has_image": bool(image_url)},
+    }
+
+
+def _write_rows(conn: sqlite3.Connection, built: list[dict]):
+    """
+    Un executemany per tabel și operație pentru toate rețetele din `built`.
+    Rețetele noi sunt inserate complet; la cele existente se rescriu doar părțile
+    din `changed` (copiii unei părți modificate sunt șterși și reinserați).
+    """
+    inserts = [b for b in built if b["recipe_id"] is None]
+    updates = [b for b in built if b["recipe_id"] is not None]
+    with_ingredients = inserts + [b for b in updates if "ingredients" in b["changed"]]
+    with_instructions = inserts + [b for b in updates if "instructions" in b["changed"]]
+
+    conn.executemany(_RECIPE_SQL, [b["recipe"] for b in inserts])
+    conn.executemany(_RECIPE_UPDATE_SQL, [b["recipe"][1:] + b["recipe"][:1]
+                                          for b in updates if "meta" in b["changed"]])
+    conn.executemany('DELETE FROM "Ingredient" WHERE "recipeId" = ?',
+                     [(b["recipe_id"],) for b in updates if "ingredients" in b["changed"]])
+    conn.executemany('DELETE FROM "Instruction" WHERE "recipeId" = ?',
+                     [(b["recipe_id"],) for b in updates if "instructions" in b["changed"]])
+    conn.executemany(_INGREDIENT_SQL, [row for b in with_ingredients for row in b["ingredients"]])
+    conn.executemany(_INSTRUCTION_SQL, [row for b in with_instructions for row in b["instructions"]])
+    conn.executemany(_FINGERPRINT_SQL, [
+        (b["recipe"][1].lower().strip(), b["recipe"][0], fp["content"], fp["meta"],
+         fp["ingredients"], fp["instructions"])
+        for b in built if (fp := b["fingerprint"])
+    ])
+    write_signatures(conn, [(b["recipe"][0], b["recipe"][1], b["signature"])
+                            for b in built if b["signature"] is not None])
+
+
+class RecipeBatchWriter:
+    """
+    Scrie rețetele în loturi de `batch_size`: rândurile întregului lot sunt construite
+    în Python și inserate cu câte un executemany per tabel, într-o singură tranzacție.
+    Dacă lotul eșuează în DB, se reia rețetă cu rețetă, fiecare în SAVEPOINT propriu,
+    ca o rețetă invalidă să nu anuleze restul lotului.
+
+    add() / flush() returnează rezultatele rețetelor scrise, în ordinea de intrare:
+    {"recipe", "stats", "changed"} sau {"recipe", "error"}; "changed" e None pentru
+    rețetele noi și lista părților rescrise pentru cele actualizate.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, grocery_items: dict, choices: dict,
+                 name_mappings: Optional[NameMappings] = None,
+                 folded: Optional[FoldedIndex] = None,
+                 batch_size: int = 500, verbose: bool = False):
+        self.conn = conn
+        self.grocery_items = grocery_items
+        self.choices = choices
+        self.name_mappings = name_mappings
+        self.folded = folded
+        self.batch_size = max(1, batch_size)
+        self.verbose = verbose
+        self.pending: list[dict] = []
+
+    def add(self, recipe: dict, fingerprint: Optional[dict] = None,
+            recipe_id: Optional[str] = None,
+            changed: Iterable[str] = RECIPE_PARTS, signature=None) -> list[dict]:
+        """
+        Adaugă o rețetă în lot. Cu `recipe_id`, rețeta existentă e actualizată în loc,
+        rescriind doar părțile din `changed`. `signature` — semnătura MinHash salvată
+        pentru detectarea aproape-duplicatelor (vezi recipe_dedup).
+        """
+        self.pending.append((recipe, fingerprint, recipe_id, tuple(changed), signature))
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self) -> list[dict]:
+        if not self.pending:
+            return []
+        results: list[dict] = []
+        built: list[dict] = []
+        # Toate ID-urile lotului dintr-o singură extragere
+        ids = iter(new_ids(sum(_ids_needed(r) for r, *_ in self.pending)))
+        for recipe, fingerprint, recipe_id, changed, signature in self.pending:
+            try:
+                rows = build_recipe_rows(recipe, self.grocery_items, self.choices, self.verbose,
+                                         self.name_mappings, self.folded, ids, recipe_id)
+                rows.update(fingerprint=fingerprint, recipe_id=recipe_id, changed=changed,
+                            signature=signature)
+                results.append({"recipe": recipe, "stats": rows["stats"],
+                                "changed": changed if recipe_id else None})
+                built.append(rows)
+            except Exception as e:
+                results.append({"recipe": recipe, "error": str(e)})
+        self.pending = []
+
+        ok = [r for r in results if "error" not in r]
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            conn.execute("SAVEPOINT batch")
+            try:
+                _write_rows(conn, built)
+            except sqlite3.Error:
+                conn.execute("ROLLBACK TO batch")
+                self._write_one_by_one(ok, built)
+            conn.execute("RELEASE batch")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+
+    def _write_one_by_one(self, ok: list[dict], built: list[dict]):
+        for result, rows in zip(ok, built):
+            self.conn.execute("SAVEPOINT recipe")
+            try:
+                _write_rows(self.conn, [rows])
+            except sqlite3.Error as e:
+                self.conn.execute("ROLLBACK TO recipe")
+                result.pop("stats")
+                result["error"] = str(e)
+            self.conn.execute("RELEASE recipe")
+
+
+# ──────────────────────────────────────────────────────────────
+# Import (refolosit de recipes.py și pipeline.py cu rețete deja în memorie)
+# ──────────────────────────────────────────────────────────────
+
+class ImportPlanner:
+    """
+    Decizia per rețetă, înainte de scriere: duplicat în input, neschimbată, existentă
+    fără fingerprint, aproape duplicat — sau de scris (nouă / doar părțile schimbate).
+    Contoarele skipped / unchanged / near_dupes se adună aici.
+    """
+
+    def __init__(self, db_path: str, grocery_items: dict,
+                 name_mappings: Optional[NameMappings] = None,
+                 folded: Optional[FoldedIndex] = None,
+                 dedup: Optional[NearDuplicateIndex] = None, *,
+                 force: bool = False, verbose: bool = False,
+                 skip_near_duplicates: bool = False):
+        self.grocery_items = grocery_items
+        self.name_mappings = name_mappings
+        self.folded = folded
+        self.dedup = dedup
+        self.force = force
+        self.verbose = verbose
+        self.skip_near_duplicates = skip_near_duplicates
+        self.existing = existing_recipes(db_path)
+        self.fingerprints = load_fingerprints(db_path)
+        self.seen: set[str] = set()
+        self.skipped = self.unchanged = self.near_dupes = 0
+
+    def signature_of(self, recipe: dict):
+        # Numele grocery item dacă e mapat (ca la indexarea rețetelor din DB), altfel cel brut
+        names = []
+        for ingr in recipe["ingredients"]:
+            grocery = lookup_grocery(ingr["name"], self.grocery_items, self.name_mappings, self.folded)
+            names.append(grocery["name"] if grocery else ingr["name"])
+        return minhash(recipe_features(recipe["name"], names))
+
+    def plan(self, recipe: dict) -> Optional[tuple]:
+        """(fingerprint, recipe_id, changed, signature) sau None dacă rețeta e sărită."""
+        name = recipe["name"]
+        key = name.lower().strip()
+
+        if key in self.seen:
+            print(f"  ↷  {name}  (duplicat în fișier)")
+            self.skipped += 1
+            return None
+        self.seen.add(key)
+
+        fingerprint = recipe_fingerprint(recipe)
+        known = self.fingerprints.get(key)
+        recipe_id = None
+        changed: tuple = RECIPE_PARTS
+        if known:
+            # Importată anterior: compară hash-urile, rescrie doar ce s-a schimbat
+            if not self.force:
+                changed = tuple(p for p in RECIPE_PARTS if fingerprint[p] != known[p])
+            if not changed:
+                self.unchanged += 1
+                if self.verbose:
+                    print(f"  =  {name}")
+                return None
+            recipe_id = known["recipeId"]
+        elif key in self.existing:
+            # Existentă fără fingerprint (import vechi / creată în webapp)
+            if not self.force:
+                print(f"  ↷  {name}")
+                self.skipped += 1
+                return None
+            recipe_id = self.existing[key]
+
+        signature = self.signature_of(recipe)
+        if self.dedup and signature is not None:
+            matches = self.dedup.query(signature, exclude=recipe_id, limit=1)
+            if matches and not recipe_id:
+                score, _, other = matches[0]
+                if self.skip_near_duplicates:
+                    print(f"  ≈  {name}  (aproape duplicat al '{other}', {score:.0%}) — sărit")
+                    self.near_dupes += 1
+                    return None
+                print(f"  ≈  {name}  seamănă cu '{other}' ({score:.0%})")
+                self.near_dupes += 1
+            # Și rețetele din același fișier, încă neimportate
+            self.dedup.remember(f"file:{key}", name, signature)
+
+        return fingerprint, recipe_id, changed, signature
+
+
+class ImportTally:
+    """Contoarele importului + afișarea rezultatelor întoarse de RecipeBatchWriter."""
+
+    def __init__(self):
+        self.imported = self.updated = self.errors = 0
+        self.total_ingr = self.total_unmapped = 0
+
+    def record(self, results: list[dict]):
+        for result in results:
+            recipe = result["recipe"]
+            if "error" in result:
+                print(f"  ✗  {recipe['name']}: {result['error']}")
+                self.errors += 1
+                continue
+            stats = result["stats"]
+            self.total_ingr     += stats["ingr_total"]
+            self.total_unmapped += stats["ingr_unmapped"]
+            flag = f"  ({stats['ingr_unmapped']} nemapate)" if stats["ingr_unmapped"] else ""
+            img_flag = "  🖼" if stats.get("has_image") else ""
+            if result["changed"] is None:
+                print(f"  ✓  {recipe['name']}  "
+                      f"[{stats['ingr_total']} ingr, "
+                      f"{len(recipe['instructions'])} pași]{flag}{img_flag}")
+                self.imported += 1
+            else:
+                parts = ", ".join(_PART_LABELS[p] for p in result["changed"])
+                print(f"  ↻  {recipe['name']}  [actualizat: {parts}]{flag}{img_flag}")
+                self.updated += 1
+
+    def stats(self, parsed: int, planner: ImportPlanner, seconds: float) -> dict:
+        return {
+            "parsed": parsed, "imported": self.imported, "updated": self.updated,
+            "unchanged": planner.unchanged, "skipped": planner.skipped,
+            "near_dupes": planner.near_dupes, "errors": self.errors,
+            "total_ingr": self.total_ingr, "total_unmapped": self.total_unmapped,
+            "seconds": seconds,
+        }
+
+
+def run_import(recipes: Iterable[dict], db_path: str, grocery_items: dict, choices,
+               name_mappings: Optional[NameMappings] = None,
+               folded: Optional[FoldedIndex] = None, *,
+               dry_run: bool = False, force: bool = False, verbose: bool = False,
+               batch_size: int = 500, skip_near_duplicates: bool = False,
+               near_threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """
+    Importă rețetele (dict-uri iter_scraped_recipes) pe măsură ce sosesc.
+    Datele comune (grocery items, choices, mappings) vin de la apelant, încărcate o dată.
+    Returnează contoarele pentru print_import_summary.
+    """
+    start = time.perf_counter()
+    parsed = 0
+    tally = ImportTally()
+
+    conn = writer = None
+    if not dry_run:
+        conn = sqlite3.connect(db_path)
+        tune_session(conn)
+        writer = RecipeBatchWriter(conn, grocery_items, choices, name_mappings, folded,
+                                   batch_size=batch_size, verbose=verbose)
+    # Aceeași conexiune ca writer-ul (cache de pagini comun, fără invalidare la fiecare lot).
+    # Dry run: fără backfill (nu scrie în DB) → doar rețetele deja indexate sunt comparate
+    dedup = (NearDuplicateIndex(conn, near_threshold) if conn
+             else open_index(db_path, near_threshold, backfill=False))
+    planner = ImportPlanner(db_path, grocery_items, name_mappings, folded, dedup,
+                            force=force, verbose=verbose,
+                            skip_near_duplicates=skip_near_duplicates)
+    print(f"  {len(planner.existing)} rețete deja în DB "
+          f"({len(planner.fingerprints)} cu fingerprint)\n")
+
+    try:
+        # Streaming: fiecare rețetă intră în writer imediat ce a fost parsată
+        for recipe in recipes:
+            parsed += 1
+            plan = planner.plan(recipe)
+            if plan is None:
+                continue
+            fingerprint, recipe_id, changed, signature = plan
+
+            if dry_run:
+                name = recipe["name"]
+                unmapped = sum(1 for i in recipe["ingredients"]
+                               if not lookup_grocery(i["name"], grocery_items, name_mappings, folded))
+                flag = f"  ({unmapped} nemapate)" if unmapped else ""
+                img_path = recipe.get("image")
+                img_flag = f"  🖼  {os.path.basename(img_path)}" if img_path and os.path.isfile(img_path) else ""
+                if recipe_id:
+                    parts = ", ".join(_PART_LABELS[p] for p in changed)
+                    print(f"  [DRY] ↻ {name}  [actualizat: {parts}]{flag}{img_flag}")
+                    tally.updated += 1
+                else:
+                    print(f"  [DRY] {name}  "
+                          f"[{len(recipe['ingredients'])} ingr, "
+                          f"{len(recipe['instructions'])} pași]{flag}{img_flag}")
+                    tally.imported += 1
+                tally.total_ingr     += len(recipe["ingredients"])
+                tally.total_unmapped += unmapped
+                continue
+
+            tally.record(writer.add(recipe, fingerprint, recipe_id, changed, signature))
+
+        if writer:
+            tally.record(writer.flush())
+
+    finally:
+        if conn:
+            conn.close()
+        if dedup and dedup.conn is not conn:
+            dedup.conn.close()
+
+    return tally.stats(parsed, planner, time.perf_counter() - start)
+
+
+def print_import_summary(stats: dict, skip_near_duplicates: bool = False):
+    print(f"\n{'═'*62}")
+    print(f"  SUMAR")
+    print(f"{'═'*62}")
+    print(f"  Parsate         : {stats['parsed']}")
+    print(f"  Importate       : {stats['imported']}")
+    print(f"  Actualizate     : {stats['updated']}")
+    print(f"  Neschimbate     : {stats['unchanged']}")
+    print(f"  Sărite          : {stats['skipped']}")
+    print(f"  Aproape duplic. : {stats['near_dupes']}{' (sărite)' if skip_near_duplicates else ''}")
+    print(f"  Erori           : {stats['errors']}")
+    print(f"  Total ingr.     : {stats['total_ingr']}")
+    print(f"  Ingr. nemapate  : {stats['total_unmapped']}")
+    print(f"  Timp            : {stats['seconds']:.2f} s")
+    if stats["total_unmapped"]:
+        print(f"\n  → Rulează normalize_units.py pentru a rezolva ingredientele nemapate,")
+        print(f"    apoi re-importă cu --force.")
+    print()
 
 
 # ──────────────────────────────────────────────────────────────
@@ -386,9 +891,15 @@ def main():
     parser.add_argument("--dry-run", action="store_true",
                         help="Simulează fără a scrie în DB")
     parser.add_argument("--force",   action="store_true",
-                        help="Re-importă rețetele deja existente")
+                        help="Rescrie în loc rețetele existente (și cele neschimbate / fără fingerprint)")
     parser.add_argument("--verbose", "-v", action="store_true",
                         help="Afișează ingredientele nemapate la GroceryItem")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="Rețete per tranzacție (default: 500)")
+    parser.add_argument("--skip-near-duplicates", action="store_true",
+                        help="Sare peste rețetele noi care seamănă cu una existentă (altfel doar le semnalează)")
+    parser.add_argument("--near-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similaritatea minimă pentru aproape-duplicate (default: {DEFAULT_THRESHOLD})")
     args = parser.parse_args()
 
     print(f"\n{'═'*62}")
@@ -405,80 +916,27 @@ def main():
         print(f"  ✗ '{args.input}' nu există.")
         return
 
-    with open(args.input, encoding="utf-8") as f:
-        content = f.read()
-
-    choices       = load_choices(args.choices)
+    mapping_conn  = connect_mapping_tables(args.db, readonly=False)
+    name_mappings = NameMappings(mapping_conn) if mapping_conn else None
+    choices       = load_choices(args.choices, mapping_conn)
     grocery_items = load_grocery_items(args.db)
-    existing      = set() if args.force else existing_recipe_names(args.db)
-    recipes       = parse_scraped_file(content)
+    folded        = FoldedIndex(grocery_items)
 
-    print(f"  {len(recipes)} rețete parsate")
     print(f"  {len(grocery_items)} ingrediente în DB")
     print(f"  {len(choices)} unit choices")
-    print(f"  {len(existing)} rețete deja în DB\n")
-
-    imported = skipped = errors = 0
-    total_ingr = total_unmapped = 0
-
-    conn = None if args.dry_run else sqlite3.connect(args.db)
 
     try:
-        for recipe in recipes:
-            name = recipe["name"]
-
-            if name.lower().strip() in existing:
-                print(f"  ↷  {name}")
-                skipped += 1
-                continue
-
-            if args.dry_run:
-                unmapped = sum(1 for i in recipe["ingredients"]
-                               if not grocery_items.get(i["name"]))
-                flag = f"  ({unmapped} nemapate)" if unmapped else ""
-                img_path = recipe.get("image")
-                img_flag = f"  🖼  {os.path.basename(img_path)}" if img_path and os.path.isfile(img_path) else ""
-                print(f"  [DRY] {name}  "
-                      f"[{len(recipe['ingredients'])} ingr, "
-                      f"{len(recipe['instructions'])} pași]{flag}{img_flag}")
-                imported += 1
-                total_ingr     += len(recipe["ingredients"])
-                total_unmapped += unmapped
-                continue
-
-            try:
-                stats = insert_recipe(conn, recipe, grocery_items, choices, args.verbose)
-                total_ingr     += stats["ingr_total"]
-                total_unmapped += stats["ingr_unmapped"]
-                flag = f"  ({stats['ingr_unmapped']} nemapate)" if stats["ingr_unmapped"] else ""
-                img_flag = "  🖼" if stats.get("has_image") else ""
-                print(f"  ✓  {name}  "
-                      f"[{stats['ingr_total']} ingr, "
-                      f"{len(recipe['instructions'])} pași]{flag}{img_flag}")
-                imported += 1
-            except Exception as e:
-                print(f"  ✗  {name}: {e}")
-                errors += 1
-
-        if conn:
-            conn.commit()
-
+        with open(args.input, encoding="utf-8") as input_file:
+            stats = run_import(iter_scraped_recipes(input_file), args.db, grocery_items, choices,
+                               name_mappings, folded, dry_run=args.dry_run, force=args.force,
+                               verbose=args.verbose, batch_size=args.batch_size,
+                               skip_near_duplicates=args.skip_near_duplicates,
+                               near_threshold=args.near_threshold)
     finally:
-        if conn:
-            conn.close()
+        if mapping_conn:
+            mapping_conn.close()
 
-    print(f"\n{'═'*62}")
-    print(f"  SUMAR")
-    print(f"{'═'*62}")
-    print(f"  Importate       : {imported}")
-    print(f"  Sărite          : {skipped}")
-    print(f"  Erori           : {errors}")
-    print(f"  Total ingr.     : {total_ingr}")
-    print(f"  Ingr. nemapate  : {total_unmapped}")
-    if total_unmapped:
-        print(f"\n  → Rulează normalize_units.py pentru a rezolva ingredientele nemapate,")
-        print(f"    apoi re-importă cu --force.")
-    print()
+    print_import_summary(stats, args.skip_near_duplicates)
 
 
 if __name__ == "__main__":
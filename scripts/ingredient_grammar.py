@@ -0,0 +1,224 @@
+"""
+ingredient_grammar.py — Gramatica comună pentru liniile de ingrediente.
+
+Un singur set de unități și regex-uri precompilate, folosite de toate parserele:
+  - IngredientProcessor.process_ingredient_line   (ingredient_processor.py)
+  - parse_ingredient_line / extract_ingredients_*  (normalize_units.py)
+  - _parse_simple_ingredient / normalize_text      (web_import_handler.py)
+  - parse_scraped_file                             (import_recipes.py)
+
+Acoperă:
+  - cantități: întregi, zecimale (1.5 / 1,5), fracții (1/2, 1⁄2), numere mixte
+    (1 1/2), fracții unicode (½, 1½), range-uri (2-3, 2 – 3, 1 to 2)
+  - unități englezești și românești, cu punct opțional (tbsp., buc.)
+  - unități lipite de cantitate (200g) sau de nume (tbspOlive Oil)
+  - legături "of" / "de" (2 cloves of garlic, 400 de grame de fasole)
+  - format bracket: [qty unit] name / [qty] name
+"""
+
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+
+# ──────────────────────────────────────────────────────────────
+# Unități
+# ──────────────────────────────────────────────────────────────
+
+# Forme de suprafață (lowercase, fără punct final). Normalizarea la forma canonică
+# rămâne la apelant (normalize_units.UNIT_NORMALIZE, web_import_handler._ABBR_MAP).
+KNOWN_UNITS = frozenset({
+    # Volumetric
+    'cup', 'cups', 'tsp', 'tsps', 'teaspoon', 'teaspoons',
+    'tbsp', 'tbsps', 'tablespoon', 'tablespoons',
+    'ml', 'milliliter', 'milliliters', 'l', 'liter', 'liters',
+    'dl', 'cl', 'pint', 'pints',
+    # Gravimetric
+    'g', 'gram', 'grams', 'kg', 'kilogram', 'kilograms', 'mg',
+    'oz', 'ounce', 'ounces', 'lb', 'lbs', 'pound', 'pounds',
+    # Numărabile
+    'piece', 'pieces', 'pinch', 'pinches', 'dash', 'handful', 'handfuls',
+    'clove', 'cloves', 'slice', 'slices', 'can', 'cans',
+    'bottle', 'bottles', 'jar', 'jars', 'package', 'packages',
+    'bunch', 'bunches', 'head', 'heads', 'scoop',
+    # Lungime (ghimbir, scorțișoară)
+    'cm', 'mm', 'inch',
+    # Românești
+    'buc', 'bucată', 'bucata', 'bucăți', 'bucati',
+    'lingură', 'lingura', 'linguri',
+    'linguriță', 'lingurița', 'lingurita', 'lingurițe', 'lingurite',
+    'cană', 'cana', 'căni', 'cani', 'ceașcă', 'ceasca', 'cești',
+    'grame', 'kilograme', 'mililitri', 'mililitru', 'litri', 'litru',
+    'fir', 'fire',
+})
+
+# Prefix-uri pentru unități lipite de nume ("tbspOlive"), cele mai lungi primele
+_GLUED_PREFIXES = tuple(sorted((u for u in KNOWN_UNITS if len(u) >= 2), key=len, reverse=True))
+
+_UNIT_ALT = '|'.join(re.escape(u) for u in sorted(KNOWN_UNITS, key=len, reverse=True))
+
+
+def is_unit(word: str) -> bool:
+    """True dacă word (cu sau fără punct final) e o unitate cunoscută."""
+    return word.lower().rstrip('.') in KNOWN_UNITS
+
+
+# ──────────────────────────────────────────────────────────────
+# Cantități
+# ──────────────────────────────────────────────────────────────
+
+_VULGAR_FRACTIONS = {
+    '½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4',
+    '⅕': '1/5', '⅖': '2/5', '⅗': '3/5', '⅘': '4/5', '⅙': '1/6', '⅚': '5/6',
+    '⅛': '1/8', '⅜': '3/8', '⅝': '5/8', '⅞': '7/8',
+}
+_VULGAR = '[' + ''.join(_VULGAR_FRACTIONS) + ']'
+
+_AMOUNT = (
+    rf'(?:\d+\s+\d+\s*[/⁄]\s*\d+'      # 1 1/2
+    rf'|\d+\s*[/⁄]\s*\d+'               # 1/2
+    rf'|\d+\s*{_VULGAR}'                 # 1½
+    rf'|{_VULGAR}'                       # ½
+    rf'|\d+(?:[.,]\d+)?)'                # 2, 1.5, 1,5
+)
+_RANGE_SEP = r'(?:\s*[-–—]\s*|\s+to\s+)'
+
+QTY_RE = re.compile(rf'^(?P<qty>{_AMOUNT}(?:{_RANGE_SEP}{_AMOUNT})?)')
+_RANGE_SPLIT_RE = re.compile(rf'{_RANGE_SEP}')
+_VULGAR_RE = re.compile(rf'(\d*)\s*({_VULGAR})')
+
+
+def _amount_to_fraction(s: str) -> Optional[Fraction]:
+    s = s.strip().replace('⁄', '/').replace(',', '.')
+    parts = s.split()
+    try:
+        if len(parts) == 2:
+            return Fraction(parts[0]) + Fraction(parts[1])
+        return Fraction(s.replace(' ', ''))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_quantity(s: Optional[str]) -> Optional[float]:
+    """
+    Convertește textul unei cantități la float; None dacă nu e cantitate.
+    Range-urile ("2-3", "1 to 2") devin media, ca în scraper.
+    """
+    if not s:
+        return None
+    s = _VULGAR_RE.sub(
+        lambda m: f"{m.group(1)} {_VULGAR_FRACTIONS[m.group(2)]}" if m.group(1)
+        else _VULGAR_FRACTIONS[m.group(2)],
+        s.strip(),
+    )
+    values = []
+    for part in _RANGE_SPLIT_RE.split(s):
+        value = _amount_to_fraction(part)
+        if value is None:
+            return None
+        values.append(value)
+    if not values:
+        return None
+    return float(sum(values) / len(values))
+
+
+# ──────────────────────────────────────────────────────────────
+# Tokenizer
+# ──────────────────────────────────────────────────────────────
+
+BRACKET_RE = re.compile(r'^\[([^\]]+)\]\s*(.+)$')
+
+# Unitate separată prin spațiu (opțional precedată de "de"), urmată de limită de cuvânt
+_UNIT_RE = re.compile(rf'^(?:de\s+)?(?P<unit>(?:{_UNIT_ALT})\.?)(?=\s|,|\)|$)', re.I)
+# Unitate lipită de cantitate: "200g făină", "1.5kg", "2tbsp."
+_GLUED_QTY_UNIT_RE = re.compile(rf'^(?P<unit>(?:{_UNIT_ALT})\.?)(?=\s|,|\)|$)', re.I)
+# Legătură după unitate: "cloves of garlic", "grame de fasole"
+_CONNECTOR_RE = re.compile(r'^(?P<conn>of|de)\s+', re.I)
+
+
+class IngredientTokens(NamedTuple):
+    qty: str                  # textul cantității, așa cum apare ("1 1/2", "2-3", "200")
+    unit: Optional[str]       # unitatea așa cum apare ("Tbsp.", "grame") sau None
+    name: str                 # restul liniei (nume + observații)
+    connector: Optional[str]  # "of" / "de" dintre unitate și nume, dacă există
+    bracketed: bool           # True pentru format [qty unit] name
+
+
+def split_glued_unit(word: str) -> tuple[Optional[str], str]:
+    """Dacă cuvântul începe cu o unitate lipită (ex: 'tbspOlive'), returnează (unit, rest)."""
+    w_lower = word.lower()
+    for prefix in _GLUED_PREFIXES:
+        if w_lower.startswith(prefix) and len(word) > len(prefix):
+            remainder = word[len(prefix):]
+            # Acceptă doar dacă restul începe cu literă mare sau cifră (ingredient real)
+            if remainder[0].isupper() or remainder[0].isdigit():
+                return word[:len(prefix)], remainder
+    return None, word
+
+
+def split_bracket(bracket: str) -> tuple[str, Optional[str]]:
+    """Extrage (qty, unit) din conținutul unui bracket: '0.5 cup' → ('0.5', 'cup')."""
+    bracket = bracket.strip()
+    m = QTY_RE.match(bracket)
+    if m:
+        rest = bracket[m.end():].strip()
+        if rest:
+            return m.group('qty').strip(), rest
+    return bracket, None
+
+
+def tokenize(line: str) -> Optional[IngredientTokens]:
+    """
+    Împarte o linie de ingredient în (qty, unit, name).
+    Returnează None dacă linia nu începe cu o cantitate (sau un bracket).
+    """
+    line = line.strip()
+    m = BRACKET_RE.match(line)
+    if m:
+        qty, unit = split_bracket(m.group(1))
+        return IngredientTokens(qty, unit, m.group(2).strip(), None, True)
+
+    m = QTY_RE.match(line)
+    if not m:
+        return None
+    qty = m.group('qty').strip()
+    rest = line[m.end():]
+    unit = None
+
+    if rest and not rest[0].isspace():
+        # Unitate lipită de cantitate ("200g făină") sau și de nume ("1tbspOlive Oil")
+        mu = _GLUED_QTY_UNIT_RE.match(rest)
+        if mu:
+            unit = mu.group('unit')
+            rest = rest[mu.end():]
+        else:
+            first, _, tail = rest.partition(' ')
+            glued_unit, glued_rest = split_glued_unit(first)
+            if not glued_unit:
+                return None
+            unit = glued_unit
+            rest = f"{glued_rest} {tail}"
+    else:
+        rest = rest.lstrip()
+        mu = _UNIT_RE.match(rest)
+        if mu and rest[mu.end():].strip():
+            unit = mu.group('unit')
+            rest = rest[mu.end():]
+        elif rest:
+            glued_unit, glued_rest = split_glued_unit(rest.split(' ', 1)[0])
+            if glued_unit:
+                unit = glued_unit
+                rest = glued_rest + rest[len(glued_unit) + len(glued_rest):]
+
+    rest = rest.strip()
+    connector = None
+    if unit:
+        mc = _CONNECTOR_RE.match(rest)
+        if mc:
+            connector = mc.group('conn').lower()
+            rest = rest[mc.end():]
+    if not rest:
+        return None
+    return IngredientTokens(qty, unit, rest.strip(), connector, False)
@@ -3,13 +3,117 @@ Helper pentru procesarea ingredientelor - separarea adjectivelor de nume
 Folosește lista de grocery items din Notion pentru match-uri inteligente
 """
 
+import hashlib
 import os
 import re
 import sys
-import sqlite3
-from typing import Dict, List, Optional, Tuple, Set
-from notion_client import Client
-from dotenv import load_dotenv
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple, Set
+
+from grocery_catalog import GroceryCatalog, load_catalog, save_snapshot
+from ingredient_grammar import BRACKET_RE, is_unit, tokenize
+
+
+class _TokenTrie:
+    """
+    Trie pe cuvinte peste numele din catalog.
+
+    Fiecare nod e un dict cuvânt → nod copil; cheia None marchează sfârșitul unui
+    nume și ține prioritatea lui (2 = grocery items, 1 = ingrediente comune).
+    """
+
+    __slots__ = ('root',)
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def add(self, name: str, priority: int):
+        # split(' ') (nu split()) — la fel ca ' '.join din căutarea veche, un nume cu
+        # spații duble nu poate face match nici aici
+        node = self.root
+        for token in name.split(' '):
+            node = node.setdefault(token, {})
+        if priority > node.get(None, 0):
+            node[None] = priority
+
+    def best_match(self, words: List[str]) -> Optional[Tuple[int, int, int]]:
+        """
+        Găsește cel mai bun match (start, end, priority) într-o singură trecere
+        stânga→dreapta: prioritate mai mare, apoi mai lung, apoi cel mai din stânga.
+        """
+        root = self.root
+        best = None
+        best_priority = 0
+        best_length = 0
+        n = len(words)
+        for start in range(n):
+            node = root.get(words[start])
+            end = start
+            while node is not None:
+                end += 1
+                priority = node.get(None)
+                if priority and (priority > best_priority or
+                                 (priority == best_priority and end - start > best_length)):
+                    best = (start, end, priority)
+                    best_priority = priority
+                    best_length = end - start
+                if end >= n:
+                    break
+                node = node.get(words[end])
+        return best
+
+
+class _LRUCache:
+    """Cache LRU mărginit (OrderedDict), cu contoare hit/miss.
+
+    Protejat de un lock: parse-urls procesează URL-uri pe mai multe thread-uri
+    cu același procesor (move_to_end după o evicție din alt thread → KeyError).
+    """
+
+    __slots__ = ('maxsize', 'hits', 'misses', '_data', '_lock')
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return self._MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
 
 
 class IngredientProcessor:
@@ -83,11 +187,13 @@ class IngredientProcessor:
         'dry', 'wet', 'soft', 'hard', 'firm', 'tender',
     }
     
-    def __init__(self, use_notion: bool = True, db_path: Optional[str] = None):
+    def __init__(self, use_notion: bool = True, db_path: Optional[str] = None,
+                 cache_size: int = 4096):
         """
         Args:
             use_notion: Dacă True, încearcă să încarce grocery items din Notion
             db_path: Cale opțională către webapp/dev.db pentru fallback local
+            cache_size: Nr. maxim de linii/nume memorate (0 = fără cache)
         """
         self.grocery_items: Set[str] = set()
         self.all_ingredients: Set[str] = set()  # Notion + Common ingredients
@@ -96,13 +202,76 @@ class IngredientProcessor:
         # Adaugă ingredientele comune de bază
         self.all_ingredients.update(self.COMMON_BASE_INGREDIENTS)
 
-        # Încearcă SQLite local mai întâi (mai rapid și nu necesită conexiune)
+        # SQLite local mai întâi (mai rapid, fără conexiune), apoi Notion;
+        # ambele servite din snapshot cât timp sursa nu s-a schimbat
         resolved_db = db_path or self._find_local_db()
-        if resolved_db:
-            self._load_grocery_items_from_db(resolved_db)
+        catalog = load_catalog(resolved_db, use_notion=use_notion)
+        if catalog:
+            self.grocery_items.update(catalog.grocery_items)
+            self.all_ingredients.update(catalog.grocery_items)
+            source = "DB local" if catalog.source == "sqlite" else "Notion"
+            cached = " (snapshot)" if not catalog.changed else ""
+            print(f"  ℹ Încărcate {len(self.grocery_items)} grocery items din {source}{cached}", file=sys.stderr)
+        else:
+            print("  ℹ Folosesc doar lista de adjective comune", file=sys.stderr)
+
+        # Rezultatele depind doar de text + catalog → memo pe linie și pe nume
+        self._line_cache = _LRUCache(cache_size)
+        self._name_cache = _LRUCache(cache_size)
+        self._catalog_version = 0
+        self._build_match_index(catalog)
+
+    @classmethod
+    def _index_key(cls) -> str:
+        """Identifică lista de ingrediente comune pe care e construit un trie salvat."""
+        common = '\n'.join(sorted(cls.COMMON_BASE_INGREDIENTS))
+        return 'trie-v1:' + hashlib.sha1(common.encode('utf-8')).hexdigest()
 
-        if use_notion and not self.grocery_items:
-            self._load_grocery_items_from_notion()
+    def _build_match_index(self, catalog: Optional[GroceryCatalog] = None):
+        """
+        Construiește trie-ul folosit de separate_adjectives (grocery items > comune).
+        Dacă vine dintr-un catalog cu index precalculat compatibil, îl refolosește.
+        """
+        trie = _TokenTrie()
+        if catalog is not None and catalog.index is not None and catalog.index_key == self._index_key():
+            trie.root = catalog.index
+        else:
+            for name in self.COMMON_BASE_INGREDIENTS:
+                trie.add(name, 1)
+            for name in self.grocery_items:
+                trie.add(name, 2)
+            if catalog is not None:
+                catalog.index, catalog.index_key = trie.root, self._index_key()
+                save_snapshot(catalog)
+        self._match_trie = trie
+        self._line_cache.clear()
+        self._name_cache.clear()
+        self._catalog_signature = (self._catalog_version, len(self.grocery_items))
+
+    def _check_catalog(self):
+        """Reconstruiește indexul (și golește cache-ul) dacă s-a schimbat catalogul."""
+        if self._catalog_signature != (self._catalog_version, len(self.grocery_items)):
+            self._build_match_index()
+
+    def add_grocery_item(self, name: str):
+        """Adaugă un grocery item nou (ex: creat interactiv) și invalidează cache-ul."""
+        name_lower = name.lower().strip()
+        if not name_lower:
+            return
+        self.grocery_items.add(name_lower)
+        self.all_ingredients.add(name_lower)
+        if name_lower.endswith("s"):
+            self.grocery_items.add(name_lower[:-1])
+            self.all_ingredients.add(name_lower[:-1])
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """Marchează catalogul ca modificat; indexul se reconstruiește la următorul apel."""
+        self._catalog_version += 1
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Statistici hit/miss pentru cache-ul de linii și cel de nume."""
+        return {'lines': self._line_cache.stats(), 'names': self._name_cache.stats()}
 
     def _find_local_db(self) -> Optional[str]:
         """Caută webapp/dev.db relativ la directorul curent sau la script."""
@@ -115,76 +284,6 @@ class IngredientProcessor:
                 return path
         return None
 
-    def _load_grocery_items_from_db(self, db_path: str):
-        """Încarcă grocery items din SQLite local."""
-        try:
-            conn = sqlite3.connect(db_path)
-            cur = conn.cursor()
-            cur.execute('SELECT name FROM "GroceryItem"')
-            rows = cur.fetchall()
-            conn.close()
-            for (name,) in rows:
-                name_lower = name.lower().strip()
-                self.grocery_items.add(name_lower)
-                self.all_ingredients.add(name_lower)
-                if name_lower.endswith("s"):
-                    self.grocery_items.add(name_lower[:-1])
-                    self.all_ingredients.add(name_lower[:-1])
-            print(f"  ℹ Încărcate {len(self.grocery_items)} grocery items din DB local", file=sys.stderr)
-        except Exception as e:
-            print(f"  ⚠ Nu pot încărca grocery items din DB: {e}", file=sys.stderr)
-    
-    def _load_grocery_items_from_notion(self):
-        """Încarcă lista de grocery items din Notion pentru match-uri inteligente"""
-        try:
-            load_dotenv('notion.env')
-            notion = Client(auth=os.getenv('NOTION_TOKEN'))
-            db_groceries = os.getenv('DB_GROCERIES_ID')
-            
-            if not db_groceries:
-                print("  ⚠ DB_GROCERIES_ID nu este setat - folosesc doar lista de adjective", file=sys.stderr)
-                return
-            
-            # Fetch toate grocery items (cu paginare pentru >100 items)
-            has_more = True
-            start_cursor = None
-            
-            while has_more:
-                if start_cursor:
-                    results = notion.databases.query(
-                        database_id=db_groceries,
-                        start_cursor=start_cursor
-                    )
-                else:
-                    results = notion.databases.query(database_id=db_groceries)
-                
-                for item in results.get('results', []):
-                    name_prop = item.get('properties', {}).get('Name', {})
-                    title = name_prop.get('title', [])
-                    if title and len(title) > 0:
-                        name = title[0].get('text', {}).get('content', '').strip()
-                        if name:
-                            # Adaugă variante: singular, plural, lowercase
-                            name_lower = name.lower()
-                            self.grocery_items.add(name_lower)
-                            self.all_ingredients.add(name_lower)
-                            
-                            # Adaugă și varianta fără 's' final (aproximare plural)
-                            if name_lower.endswith('s'):
-                                self.grocery_items.add(name_lower[:-1])
-                                self.all_ingredients.add(name_lower[:-1])
-                
-                # Verifică dacă mai sunt pagini
-                has_more = results.get('has_more', False)
-                start_cursor = results.get('next_cursor')
-            
-            print(f"  ℹ Încărcate {len(self.grocery_items)} grocery items din Notion", file=sys.stderr)
-            print(f"  ℹ Total {len(self.all_ingredients)} ingrediente disponibile pentru matching", file=sys.stderr)
-
-        except Exception as e:
-            print(f"  ⚠ Nu pot încărca grocery items din Notion: {e}", file=sys.stderr)
-            print(f"  ℹ Folosesc doar lista de adjective comune", file=sys.stderr)
-    
     def separate_adjectives(self, ingredient_name: str) -> Tuple[str, Optional[str]]:
         """
         Separă adjectivele și descrierile de numele ingredientului
@@ -197,6 +296,16 @@ class IngredientProcessor:
         """
         if not ingredient_name:
             return ingredient_name, None
+
+        self._check_catalog()
+        cached = self._name_cache.get(ingredient_name)
+        if cached is not _LRUCache._MISSING:
+            return cached
+        result = self._separate_adjectives(ingredient_name)
+        self._name_cache.put(ingredient_name, result)
+        return result
+
+    def _separate_adjectives(self, ingredient_name: str) -> Tuple[str, Optional[str]]:
         
         # Strip punctuation de la sfârșit (virgule, puncte) și curăță virgule extra din interior
         original = ingredient_name.strip().rstrip(',.;:')
@@ -212,36 +321,14 @@ class IngredientProcessor:
         if original.lower() in self.all_ingredients:
             return original, None
         
-        # 2. Strategie îmbunătățită: caută ingredientul de bază scanând toate combinațiile
-        # Preferă match-uri din Notion, apoi din lista comună
+        # 2. Caută ingredientul de bază în trie-ul catalogului (o singură trecere)
+        # Preferă match-uri din Notion, apoi din lista comună, apoi cel mai lung
         best_match = None
-        best_match_start = -1
-        best_match_end = -1
-        best_match_priority = 0  # 2 = Notion, 1 = Common ingredients
-        
-        # Încearcă toate combinațiile posibile de cuvinte consecutive
-        for length in range(len(words_lower), 0, -1):  # De la cel mai lung la cel mai scurt
-            for start in range(len(words_lower) - length + 1):
-                end = start + length
-                candidate = ' '.join(words_lower[start:end])
-                
-                # Verifică în Notion items (prioritate mare)
-                if candidate in self.grocery_items:
-                    priority = 2
-                # Verifică în ingrediente comune (prioritate medie)
-                elif candidate in self.COMMON_BASE_INGREDIENTS:
-                    priority = 1
-                else:
-                    continue
-                
-                # Salvează dacă e mai bun decât match-ul curent
-                if priority > best_match_priority or \
-                   (priority == best_match_priority and length > (best_match_end - best_match_start)):
-                    best_match = ' '.join(words_original[start:end])
-                    best_match_start = start
-                    best_match_end = end
-                    best_match_priority = priority
-        
+        match = self._match_trie.best_match(words_lower)
+        if match:
+            best_match_start, best_match_end, _ = match
+            best_match = ' '.join(words_original[best_match_start:best_match_end])
+
         if best_match:
             # Colectează tot ce e înainte și după match ca descriere
             descriptions = []
@@ -329,50 +416,41 @@ class IngredientProcessor:
             Tuple[processed_line, extracted_adjectives]:
                 ("1 banana", "large, ripe") SAU ("[1] banana", "large, ripe")
         """
-        # Verifică dacă are format bracket [quantity] sau [quantity unit]
-        bracket_match = re.match(r'^\[([^\]]+)\]\s*(.+)$', line.strip())
-
-        # Unități de măsură cunoscute (definite o singură dată, folosite și în bracket path)
-        KNOWN_UNITS = {
-            'cup', 'cups', 'tsp', 'tsp.', 'tsps', 'teaspoon', 'teaspoons',
-            'tbsp', 'tbsp.', 'tbsps', 'tablespoon', 'tablespoons',
-            'oz', 'oz.', 'ounce', 'ounces', 'lb', 'lb.', 'lbs', 'pound', 'pounds',
-            'g', 'gram', 'grams', 'kg', 'kilogram', 'kilograms',
-            'ml', 'milliliter', 'milliliters', 'l', 'liter', 'liters',
-            'pinch', 'dash', 'handful', 'piece', 'pieces',
-            'clove', 'cloves', 'slice', 'slices', 'can', 'cans',
-            'bottle', 'bottles', 'jar', 'jars', 'package', 'packages',
-            'buc', 'bucată', 'bucăți', 'lingură', 'linguri',
-            'linguriță', 'lingurițe', 'lingurita', 'lingurite'
-        }
-        # Prefix-uri de unitate sortate descrescător după lungime (pentru split glued)
-        UNIT_PREFIXES = sorted(
-            [u.rstrip('.') for u in KNOWN_UNITS if len(u.rstrip('.')) >= 2],
-            key=len, reverse=True
-        )
-
-        def _split_glued_unit(word: str):
-            """Dacă cuvântul începe cu o unitate lipită (ex: 'tbspOlive'), returnează (unit, rest)."""
-            w_lower = word.lower()
-            for prefix in UNIT_PREFIXES:
-                if w_lower.startswith(prefix) and len(word) > len(prefix):
-                    remainder = word[len(prefix):]
-                    # Acceptă doar dacă restul începe cu literă mare sau cifră (ingredient real)
-                    if remainder and (remainder[0].isupper() or remainder[0].isdigit()):
-                        return prefix, remainder
-            return None, word
-
-        if bracket_match:
+        # Cheie normalizată: spațiile multiple / de la capete nu schimbă rezultatul
+        key = ' '.join(line.split())
+        self._check_catalog()
+        result = self._line_cache.get(key)
+        if result is _LRUCache._MISSING:
+            result = self._process_ingredient_line(key)
+            self._line_cache.put(key, result)
+        if result is None:
+            # Nu are format standard: linia se întoarce așa cum a venit
+            return line, None
+        return result
+
+    def process_lines(self, lines: Iterable[str]) -> List[Tuple[str, Optional[str]]]:
+        """
+        Procesează un lot de linii; frazele repetate (ex: "2 cloves garlic", "salt")
+        sunt calculate o singură dată și servite din cache.
+        Statisticile hit/miss: cache_stats().
+        """
+        return [self.process_ingredient_line(line) for line in lines]
+
+    def _process_ingredient_line(self, line: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Linia (normalizată) procesată; None dacă nu are format standard."""
+        tokens = tokenize(line)
+        if tokens is None:
+            return None
+
+        if tokens.bracketed:
             # Format: [1] ingredient sau [1 cup] ingredient
-            bracket_content = bracket_match.group(1).strip()
-            rest = bracket_match.group(2).strip()
+            bracket_content = BRACKET_RE.match(line.strip()).group(1).strip()
+            rest = tokens.name
 
             # Elimină unitatea duplicată la început (ex: "[0.5 tsp] tsp. adobo sauce")
             rest_words = rest.split()
-            if rest_words:
-                first = rest_words[0].lower().rstrip('.')
-                if first in {u.rstrip('.').lower() for u in KNOWN_UNITS}:
-                    rest = ' '.join(rest_words[1:]).strip()
+            if rest_words and is_unit(rest_words[0]):
+                rest = ' '.join(rest_words[1:]).strip()
 
             # Separă adjectivele din ingredient name
             clean_name, adjectives = self.separate_adjectives(rest)
@@ -381,68 +459,30 @@ class IngredientProcessor:
             processed = f"[{bracket_content}] {clean_name}"
             return processed, adjectives
 
-        # Format standard fără brackets
-        
-        # Pattern pentru cantitate + opțional unitate + ingredient
-        # Cantitate: număr (cu fracții, decimale, range)
-        match = re.match(
-            r'^([0-9./\s]+(?:to\s+[0-9./]+)?)\s+(.+)$',
-            line.strip()
-        )
-        
-        if not match:
-            # Nu are format standard
-            return line, None
-        
-        qty = match.group(1).strip()
-        rest = match.group(2).strip()  # Tot ce rămâne după cantitate
-        
-        # Verifică dacă începe cu o unitate cunoscută
-        words = rest.split()
-        unit = None
-        ingredient_start = 0
-        
-        if words and words[0].lower() in KNOWN_UNITS:
-            unit = words[0]
-            ingredient_start = 1
-
-            # Tratează pattern-ul "unit of ingredient" (ex: "cloves of garlic")
-            if ingredient_start < len(words) and words[ingredient_start].lower() == 'of':
-                unit = f"{unit} of"
-                ingredient_start = 2
-        elif words:
-            # Detectează unitate lipită fără spațiu (ex: "tbspOlive Oil" → unit="tbsp", name="Olive Oil")
-            glued_unit, glued_rest = _split_glued_unit(words[0])
-            if glued_unit:
-                unit = glued_unit
-                words[0] = glued_rest
-                ingredient_start = 0
-        
-        # Restul cuvintelor = ingredient name
-        if ingredient_start < len(words):
-            ingredient_name = ' '.join(words[ingredient_start:])
-        else:
-            # Nu are ingredient după unitate?
-            return line, None
-        
+        # Format standard: cantitate + opțional unitate + ingredient
+        unit = tokens.unit
+        if unit:
+            # Unitatea cu legăturile ei, ca în linie ("cloves of garlic", "400 de grame de fasole")
+            unit = line[len(tokens.qty):len(line) - len(tokens.name)].strip()
+
         # Separă adjectivele din numele ingredientului
-        clean_name, adjectives = self.separate_adjectives(ingredient_name)
-        
+        clean_name, adjectives = self.separate_adjectives(tokens.name)
+
         # Reconstruiește linia
         if unit:
-            processed = f"{qty} {unit} {clean_name}"
+            processed = f"{tokens.qty} {unit} {clean_name}"
         else:
-            processed = f"{qty} {clean_name}"
+            processed = f"{tokens.qty} {clean_name}"
         
         return processed, adjectives
 
 
-# Singleton pentru reutilizare
-_processor_instance = None
+# O instanță per DB, pentru reutilizare
+_processor_instances: Dict[Optional[str], IngredientProcessor] = {}
 
-def get_ingredient_processor(use_notion: bool = True) -> IngredientProcessor:
-    """Returnează instanța singleton a procesorului"""
-    global _processor_instance
-    if _processor_instance is None:
-        _processor_instance = IngredientProcessor(use_notion=use_notion)
-    return _processor_instance
+def get_ingredient_processor(use_notion: bool = True, db_path: Optional[str] = None) -> IngredientProcessor:
+    """Returnează procesorul pentru catalogul din db_path (None: webapp/dev.db găsit automat)"""
+    key = os.path.abspath(db_path) if db_path else None
+    if key not in _processor_instances:
+        _processor_instances[key] = IngredientProcessor(use_notion=use_notion, db_path=db_path)
+    return _processor_instances[key]
@@ -0,0 +1,747 @@
+#!/usr/bin/env python3
+"""
+job_queue.py — Coadă durabilă de joburi de scrape / import + worker cu pool de procese.
+
+Webapp-ul putea rula scraping-ul doar sincron, în request, iar rulările din CLI țin
+terminalul ocupat. Aici joburile sunt rânduri în tabela "RecipeJob": oricine le poate
+adăuga, iar `worker` le ia în lucru. Coada nu stă în dev.db (schema lui e a Prisma), ci
+într-un SQLite propriu, per dev.db: data/cache/<dev>-<hash>.jobs.sqlite3, lângă
+tabelele derivate (derived_store.py); --queue alege alt fișier.
+
+  kind            payload                  rezultat
+  parse-urls      {"urls": [...]}          ca web_import_handler.py parse-urls
+  parse-text      {"text": "..."}          ca web_import_handler.py parse-text
+  normalize-text  {"text": "..."}          ca web_import_handler.py normalize-text
+  import-url      {"url": "..."}           scrape + import în DB
+  import-text     {"text": "..."}          un bloc de rețetă locală, parsat + importat
+
+Worker-ul:
+  - ia joburi cu lease (status running + leasedUntil); lease-ul e prelungit cât timp
+    jobul rulează, iar joburile unui worker oprit brusc revin în coadă la expirare
+  - rulează scrape-ul / parsarea într-un pool de procese (câte un RecipeScraper per
+    proces, pe catalogul DB-ului dat cu --db, același în care se importă)
+  - scrie importurile din procesul principal (un singur writer → fără contenție SQLite)
+  - la eroare reîncearcă cu backoff exponențial (5 s, 10 s, 20 s … max 10 min, ±20%),
+    până la maxAttempts; apoi jobul rămâne failed (vezi `status` / `requeue`)
+  - joburile interactive (priority 0, `enqueue --interactive`) trec înaintea celor
+    batch (100); --interactive-slots procese rămân rezervate pentru ele
+
+Joburile se adaugă cu `enqueue`; rezultatul JSON apare în coloana result când
+status = done (`show <id>`). Webapp-ul nu are încă un producător: unul extern trebuie
+să folosească aceeași coadă ca worker-ul — o cale fixă dată ambelor prin --queue sau
+prin variabila de mediu RECIPE_JOB_QUEUE (ex: din webapp/.env.local), apoi
+`job_queue.py enqueue ... --interactive`.
+Importurile merg în DB-ul dat cu --db (default webapp/dev.db).
+
+Utilizare:
+  python scripts/job_queue.py enqueue import-url --urls-file data/urls/recipe_urls.txt
+  python scripts/job_queue.py enqueue import-text --text-file data/local/local_recipes.txt
+  python scripts/job_queue.py enqueue parse-urls --url https://... --interactive
+  python scripts/job_queue.py worker --workers 4
+  python scripts/job_queue.py worker --drain        # se oprește când coada e goală
+  python scripts/job_queue.py status
+  python scripts/job_queue.py show <id>
+  python scripts/job_queue.py requeue               # joburile failed → din nou în coadă
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from typing import Optional
+
+from derived_store import derived_path
+from import_recipes import new_id
+
+DEFAULT_DB = "webapp/dev.db"
+
+JOB_KINDS = ("parse-urls", "parse-text", "normalize-text", "import-url", "import-text")
+IMPORT_KINDS = ("import-url", "import-text")
+IMAGE_DIRS = {"import-url": "data/urls/img", "import-text": "data/local/img"}
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 100
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_LEASE = 300.0       # secunde; prelungit periodic cât timp jobul rulează
+BACKOFF_BASE = 5.0
+BACKOFF_MAX = 600.0
+LOG_TAIL_LINES = 8          # ultimele linii din log-ul jobului, păstrate la eroare
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS "RecipeJob" (
+  "id"          TEXT NOT NULL PRIMARY KEY,
+  "kind"        TEXT NOT NULL,
+  "payload"     TEXT NOT NULL,
+  "priority"    INTEGER NOT NULL DEFAULT 100,
+  "status"      TEXT NOT NULL DEFAULT 'queued',
+  "attempts"    INTEGER NOT NULL DEFAULT 0,
+  "maxAttempts" INTEGER NOT NULL DEFAULT 3,
+  "runAfter"    REAL NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS REAL)),
+  "leasedUntil" REAL,
+  "worker"      TEXT,
+  "result"      TEXT,
+  "error"       TEXT,
+  "createdAt"   DATETIME NOT NULL DEFAULT (datetime('now')),
+  "updatedAt"   DATETIME NOT NULL DEFAULT (datetime('now'))
+)
+"""
+_INDEX = ('CREATE INDEX IF NOT EXISTS "RecipeJob_ready_idx" '
+          'ON "RecipeJob"("status", "priority", "runAfter")')
+
+
+class JobError(Exception):
+    """Eroare a unui job (mesaj + finalul log-ului); jobul e reîncercat sau marcat failed."""
+
+
+# ──────────────────────────────────────────────────────────────
+# Tabela de joburi
+# ──────────────────────────────────────────────────────────────
+
+QUEUE_ENV = "RECIPE_JOB_QUEUE"
+
+
+def queue_path(db_path: str) -> str:
+    """Fișierul cozii pentru un dev.db (lângă DB-ul lui derivat, în data/cache)."""
+    return os.path.splitext(derived_path(db_path))[0] + ".jobs.sqlite3"
+
+
+def connect(queue_file: str) -> sqlite3.Connection:
+    """Conexiune autocommit (tranzacțiile explicite cu BEGIN IMMEDIATE) + tabela creată."""
+    os.makedirs(os.path.dirname(os.path.abspath(queue_file)), exist_ok=True)
+    conn = sqlite3.connect(queue_file, timeout=30, isolation_level=None)
+    # Fișierul e doar al cozii → WAL: `enqueue` / `status` nu așteaptă după worker
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(_SCHEMA)
+    conn.execute(_INDEX)
+    return conn
+
+
+def enqueue(conn: sqlite3.Connection, kind: str, payloads: list,
+            interactive: bool = False, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> list[str]:
+    """Adaugă câte un job per payload, într-o singură tranzacție; returnează ID-urile."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Tip de job necunoscut: {kind!r} (așteptat: {' | '.join(JOB_KINDS)})")
+    priority = PRIORITY_INTERACTIVE if interactive else PRIORITY_BATCH
+    now = time.time()
+    rows = [(new_id(), kind, json.dumps(payload, ensure_ascii=False), priority, max_attempts, now)
+            for payload in payloads]
+    conn.execute("BEGIN IMMEDIATE")
+    conn.executemany(
+        'INSERT INTO "RecipeJob" (id, kind, payload, priority, "maxAttempts", "runAfter") '
+        'VALUES (?, ?, ?, ?, ?, ?)', rows)
+    conn.execute("COMMIT")
+    return [row[0] for row in rows]
+
+
+def lease(conn: sqlite3.Connection, worker: str, limit: int, lease_seconds: float,
+          max_priority: Optional[int] = None) -> list[dict]:
+    """
+    Ia în lucru cel mult `limit` joburi gata de rulare, în ordinea priorității.
+    Selecția și marcarea ca running sunt în aceeași tranzacție IMMEDIATE → doi
+    workeri nu pot lua același job.
+    """
+    if limit <= 0:
+        return []
+    now = time.time()
+    sql = ('SELECT id, kind, payload, priority, attempts, "maxAttempts" FROM "RecipeJob" '
+           'WHERE status = \'queued\' AND "runAfter" <= ?')
+    params: list = [now]
+    if max_priority is not None:
+        sql += ' AND priority <= ?'
+        params.append(max_priority)
+    sql += ' ORDER BY priority, "runAfter", rowid LIMIT ?'
+    params.append(limit)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = conn.execute(sql, params).fetchall()
+        conn.executemany(
+            'UPDATE "RecipeJob" SET status = \'running\', attempts = attempts + 1, '
+            '"leasedUntil" = ?, worker = ?, "updatedAt" = datetime(\'now\') WHERE id = ?',
+            [(now + lease_seconds, worker, row[0]) for row in rows])
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return [{"id": job_id, "kind": kind, "payload": json.loads(payload), "priority": priority,
+             "attempts": attempts + 1, "maxAttempts": max_attempts}
+            for job_id, kind, payload, priority, attempts, max_attempts in rows]
+
+
+def extend_leases(conn: sqlite3.Connection, worker: str, job_ids: list, lease_seconds: float):
+    """Heartbeat: joburile încă în lucru nu expiră cât timp worker-ul trăiește."""
+    until = time.time() + lease_seconds
+    conn.executemany(
+        'UPDATE "RecipeJob" SET "leasedUntil" = ? '
+        'WHERE id = ? AND worker = ? AND status = \'running\'',
+        [(until, job_id, worker) for job_id in job_ids])
+
+
+def reclaim_expired(conn: sqlite3.Connection) -> int:
+    """Joburile cu lease expirat (worker oprit brusc) revin în coadă sau devin failed."""
+    cur = conn.execute(
+        'UPDATE "RecipeJob" SET '
+        'status = CASE WHEN attempts >= "maxAttempts" THEN \'failed\' ELSE \'queued\' END, '
+        'error = COALESCE(error, \'lease expirat (worker oprit?)\'), '
+        '"runAfter" = ?, "leasedUntil" = NULL, worker = NULL, "updatedAt" = datetime(\'now\') '
+        'WHERE status = \'running\' AND "leasedUntil" < ?', (time.time(), time.time()))
+    return cur.rowcount
+
+
+def complete(conn: sqlite3.Connection, worker: str, job_id: str, result) -> bool:
+    """Marchează jobul done; False dacă lease-ul a fost pierdut între timp."""
+    cur = conn.execute(
+        'UPDATE "RecipeJob" SET status = \'done\', result = ?, error = NULL, '
+        '"leasedUntil" = NULL, "updatedAt" = datetime(\'now\') '
+        'WHERE id = ? AND worker = ? AND status = \'running\'',
+        (json.dumps(result, ensure_ascii=False), job_id, worker))
+    return cur.rowcount > 0
+
+
+def backoff_seconds(attempts: int) -> float:
+    """5 s, 10 s, 20 s … (max 10 min), cu ±20% ca reîncercările să nu pornească deodată."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def fail(conn: sqlite3.Connection, worker: str, job: dict, error: str) -> Optional[float]:
+    """
+    Reprogramează jobul după backoff sau îl marchează failed dacă nu mai are încercări.
+    Returnează întârzierea (secunde) sau None pentru failed.
+    """
+    delay = backoff_seconds(job["attempts"]) if job["attempts"] < job["maxAttempts"] else None
+    conn.execute(
+        'UPDATE "RecipeJob" SET status = ?, error = ?, "runAfter" = ?, "leasedUntil" = NULL, '
+        'worker = NULL, "updatedAt" = datetime(\'now\') '
+        'WHERE id = ? AND worker = ? AND status = \'running\'',
+        ("failed" if delay is None else "queued", error,
+         time.time() + (delay or 0), job["id"], worker))
+    return delay
+
+
+def release(conn: sqlite3.Connection, worker: str, job_ids: list):
+    """La oprire: joburile neterminate revin în coadă, fără să consume o încercare."""
+    conn.executemany(
+        'UPDATE "RecipeJob" SET status = \'queued\', attempts = MAX(0, attempts - 1), '
+        '"leasedUntil" = NULL, worker = NULL, "updatedAt" = datetime(\'now\') '
+        'WHERE id = ? AND worker = ? AND status = \'running\'',
+        [(job_id, worker) for job_id in job_ids])
+
+
+def has_pending(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        'SELECT 1 FROM "RecipeJob" WHERE status IN (\'queued\', \'running\') LIMIT 1'
+    ).fetchone() is not None
+
+
+def job_label(kind: str, payload: dict) -> str:
+    if "url" in payload:
+        return payload["url"]
+    if "urls" in payload:
+        return f"{len(payload['urls'])} URL-uri"
+    first = next((line.strip() for line in payload.get("text", "").splitlines() if line.strip()), "")
+    return first[:60] or "(text gol)"
+
+
+# ──────────────────────────────────────────────────────────────
+# Execuția în procesele din pool
+# ──────────────────────────────────────────────────────────────
+
+_scrapers: dict = {}
+_catalog_db: Optional[str] = None
+
+
+def _exit_with_parent(parent_pid: int):
+    # Procesul principal omorât brusc (kill -9) nu mai închide pool-ul → ieșim singuri
+    while os.getppid() == parent_pid:
+        time.sleep(2)
+    os._exit(1)
+
+
+def _init_job_worker(parent_pid: int, db_path: Optional[str] = None):
+    global _catalog_db
+    _catalog_db = db_path
+    # Oprirea o decide procesul principal; fără prompturi interactive (nu au terminal)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sys.stdin = open(os.devnull)
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+
+
+def _job_scraper(image_dir: str):
+    """Un RecipeScraper per proces și director de imagini (catalog + cache-uri proprii)."""
+    scraper = _scrapers.get(image_dir)
+    if scraper is None:
+        # Import leneș: scrape_recipes (bs4, requests, traducere) doar în procesele din pool
+        from scrape_recipes import RecipeScraper
+
+        scraper = RecipeScraper(_catalog_db)
+        scraper.image_dir = image_dir
+        _scrapers[image_dir] = scraper
+    return scraper
+
+
+def _run_job(kind: str, payload: dict) -> dict:
+    if kind in IMPORT_KINDS:
+        scraper = _job_scraper(IMAGE_DIRS[kind])
+        if kind == "import-url":
+            recipe = scraper.scrape_recipe(payload["url"])
+            recipes = [recipe] if recipe else []
+        else:
+            from scrape_recipes import split_local_blocks
+
+            recipes = [r for r in map(scraper.parse_local_text,
+                                      split_local_blocks(payload.get("text", ""))) if r]
+        if not recipes:
+            raise JobError("nu s-a putut extrage nicio rețetă")
+        # Importul îl face procesul principal, din formatul scraped (ca import_recipes.py)
+        return {"text": "\n".join(scraper.convert_to_txt_format(r) for r in recipes)}
+
+    import web_import_handler
+
+    return {"result": web_import_handler.run_mode(kind, payload)}
+
+
+def execute_job(kind: str, payload: dict) -> dict:
+    """Rulează în pool; log-ul e capturat, iar la eroare finalul lui însoțește mesajul."""
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            return _run_job(kind, payload)
+    except Exception as e:
+        tail = [line for line in buf.getvalue().splitlines() if line.strip()][-LOG_TAIL_LINES:]
+        message = str(e) if isinstance(e, JobError) else f"{type(e).__name__}: {e}"
+        raise JobError("\n".join([message, *tail])) from None
+
+
+# ──────────────────────────────────────────────────────────────
+# Importul în procesul principal
+# ──────────────────────────────────────────────────────────────
+
+class JobImporter:
+    """
+    ImportPlanner + RecipeBatchWriter pentru joburile de import ale worker-ului.
+    Catalogul și starea planner-ului (fingerprint-uri, rețete existente) sunt
+    reîncărcate când dev.db a fost modificat din afara worker-ului (webapp, alt
+    import) — cheia snapshot-ului de catalog, recitită înaintea fiecărui job.
+    """
+
+    def __init__(self, args):
+        from import_recipes import tune_session
+        from mapping_tables import connect as connect_mapping_tables
+
+        self.args = args
+        self.mapping_conn = connect_mapping_tables(args.db, readonly=False)
+        self.conn = sqlite3.connect(args.db, timeout=30)
+        tune_session(self.conn)
+        self.db_key = None
+        self._load()
+
+    def _load(self):
+        from grocery_catalog import FoldedIndex, catalog_key
+        from import_recipes import (ImportPlanner, RecipeBatchWriter, load_choices,
+                                    load_grocery_items)
+        from mapping_tables import NameMappings
+        from recipe_dedup import NearDuplicateIndex
+
+        args = self.args
+        grocery_items = load_grocery_items(args.db)
+        folded = FoldedIndex(grocery_items)
+        name_mappings = NameMappings(self.mapping_conn) if self.mapping_conn else None
+        self.writer = RecipeBatchWriter(self.conn, grocery_items,
+                                        load_choices(args.choices, self.mapping_conn),
+                                        name_mappings, folded, batch_size=1000,
+                                        verbose=args.verbose)
+        self.planner = ImportPlanner(args.db, grocery_items, name_mappings, folded,
+                                     NearDuplicateIndex(self.conn, args.near_threshold),
+                                     force=args.force, verbose=args.verbose,
+                                     skip_near_duplicates=args.skip_near_duplicates)
+        self.db_key = catalog_key(args.db)
+
+    def _recipe_exists(self, recipe_id: str) -> bool:
+        return self.conn.execute('SELECT 1 FROM "Recipe" WHERE id = ?',
+                                 (recipe_id,)).fetchone() is not None
+
+    def import_text(self, text: str) -> dict:
+        """Importă rețetele unui job; returnează rezultatul salvat în coloana result."""
+        from grocery_catalog import catalog_key
+        from import_recipes import RECIPE_PARTS, iter_scraped_recipes
+
+        if catalog_key(self.args.db) != self.db_key:
+            self._load()
+        planner = self.planner
+        # "Duplicat în fișier" are sens doar în cadrul aceluiași job
+        planner.seen.clear()
+        before = (planner.skipped, planner.unchanged, planner.near_dupes)
+        planned = {}
+        for recipe in iter_scraped_recipes(text.splitlines()):
+            plan = planner.plan(recipe)
+            if plan is None:
+                continue
+            key = recipe["name"].lower().strip()
+            fingerprint, recipe_id, changed, signature = plan
+            if recipe_id is not None and not self._recipe_exists(recipe_id):
+                # Ștearsă între timp → importată ca rețetă nouă, nu „actualizată” fără rânduri
+                planner.fingerprints.pop(key, None)
+                planner.existing.pop(key, None)
+                recipe_id, changed = None, RECIPE_PARTS
+            planned[key] = fingerprint
+            self.writer.add(recipe, fingerprint, recipe_id, changed, signature)
+
+        summary = {"imported": [], "updated": [], "errors": []}
+        for result in self.writer.flush():
+            name = result["recipe"]["name"]
+            if "error" in result:
+                summary["errors"].append({"name": name, "error": result["error"]})
+                continue
+            summary["imported" if result["changed"] is None else "updated"].append(name)
+            self._remember(name.lower().strip(), planned[name.lower().strip()])
+        # Propriile scrieri nu cer reîncărcare
+        self.db_key = catalog_key(self.args.db)
+        summary["skipped"], summary["unchanged"], summary["near_duplicates"] = (
+            now - then for now, then in
+            zip((planner.skipped, planner.unchanged, planner.near_dupes), before))
+        return summary
+
+    def _remember(self, key: str, fingerprint: dict):
+        # Worker-ul rulează mult: rețetele scrise acum sunt comparate incremental data viitoare
+        row = self.conn.execute('SELECT "recipeId" FROM derived."RecipeFingerprint" WHERE "nameKey" = ?',
+                                (key,)).fetchone()
+        if row:
+            self.planner.fingerprints[key] = {**fingerprint, "recipeId": row[0]}
+            self.planner.existing[key] = row[0]
+
+    def close(self):
+        self.conn.close()
+        if self.mapping_conn is not None:
+            self.mapping_conn.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# Worker
+# ──────────────────────────────────────────────────────────────
+
+def _finish(job: dict, outcome: dict, importer_factory) -> dict:
+    """Rezultatul final al unui job (import în procesul principal dacă e cazul)."""
+    if job["kind"] not in IMPORT_KINDS:
+        return outcome["result"]
+    summary = importer_factory().import_text(outcome["text"])
+    if summary["errors"] and not (summary["imported"] or summary["updated"]):
+        raise JobError("; ".join(f"{e['name']}: {e['error']}" for e in summary["errors"]))
+    return summary
+
+
+def _new_pool(workers: int, db_path: str) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_job_worker,
+                               initargs=(os.getpid(), db_path))
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def run_worker(args) -> int:
+    # SIGTERM (systemd, docker stop) ca Ctrl-C: joburile în curs revin în coadă
+    signal.signal(signal.SIGTERM, _interrupt)
+    conn = connect(args.queue)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    reserved = min(args.interactive_slots, args.workers - 1)
+    importer: Optional[JobImporter] = None
+
+    def importer_factory():
+        nonlocal importer
+        if importer is None:
+            importer = JobImporter(args)
+        return importer
+
+    print(f"\n{'═'*62}")
+    print(f"  job_queue.py worker  ({worker})")
+    print(f"{'═'*62}")
+    print(f"  DB       : {args.db}")
+    print(f"  Coadă    : {args.queue}")
+    print(f"  Procese  : {args.workers}  ({reserved} rezervate pentru joburi interactive)")
+    print(f"  Lease    : {args.lease:.0f} s{'  ·  --drain' if args.drain else ''}\n")
+
+    counts = {"done": 0, "retry": 0, "failed": 0}
+    running: dict = {}           # future → job
+    pool = _new_pool(args.workers, args.db)
+    next_heartbeat = next_reclaim = 0.0
+    start = time.perf_counter()
+    interrupted = False
+
+    try:
+        while True:
+            now = time.time()
+            if now >= next_reclaim:
+                reclaimed = reclaim_expired(conn)
+                if reclaimed:
+                    print(f"  ⟲ {reclaimed} joburi cu lease expirat reprogramate")
+                next_reclaim = now + args.poll * 5
+
+            # Interactive mai întâi; batch doar pe procesele nerezervate
+            free = args.workers - len(running)
+            jobs = lease(conn, worker, free, args.lease, max_priority=PRIORITY_INTERACTIVE)
+            batch_running = sum(1 for j in running.values() if j["priority"] > PRIORITY_INTERACTIVE)
+            batch_slots = min(free - len(jobs), args.workers - reserved - batch_running)
+            jobs += lease(conn, worker, batch_slots, args.lease)
+            for job in jobs:
+                job["started"] = time.perf_counter()
+                running[pool.submit(execute_job, job["kind"], job["payload"])] = job
+
+            if not running:
+                if args.drain and not has_pending(conn):
+                    break
+                time.sleep(args.poll)
+                continue
+
+            done, _ = wait(running, timeout=args.poll, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job = running.pop(future)
+                label = f"{job['id'][:8]} {job['kind']:<14} {job_label(job['kind'], job['payload'])}"
+                try:
+                    result = _finish(job, future.result(), importer_factory)
+                except BrokenProcessPool:
+                    broken = True
+                    error = "procesul worker s-a oprit neașteptat"
+                except Exception as e:
+                    error = str(e)
+                else:
+                    elapsed = time.perf_counter() - job["started"]
+                    if complete(conn, worker, job["id"], result):
+                        print(f"  ✓ {label}  ({elapsed:.1f} s)")
+                        counts["done"] += 1
+                    else:
+                        print(f"  ⚠ {label}: lease pierdut, rezultat ignorat")
+                    continue
+                delay = fail(conn, worker, job, error)
+                first_line = error.splitlines()[0] if error else ""
+                if delay is None:
+                    print(f"  ✗ {label}: {first_line}  (eșuat după {job['attempts']} încercări)")
+                    counts["failed"] += 1
+                else:
+                    print(f"  ↻ {label}: {first_line}  (reîncercare în {delay:.0f} s)")
+                    counts["retry"] += 1
+            if broken:
+                # Un proces mort strică tot pool-ul: joburile rămase sunt reluate în altul nou
+                for future, job in list(running.items()):
+                    fail(conn, worker, job, "procesul worker s-a oprit neașteptat")
+                running.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = _new_pool(args.workers, args.db)
+
+            if running and time.time() >= next_heartbeat:
+                extend_leases(conn, worker, [j["id"] for j in running.values()], args.lease)
+                next_heartbeat = time.time() + args.lease / 3
+    except KeyboardInterrupt:
+        interrupted = True
+        print("\n  ⚠ Întrerupt — joburile în curs revin în coadă")
+    finally:
+        release(conn, worker, [j["id"] for j in running.values()])
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+        if importer is not None:
+            importer.close()
+        conn.close()
+
+    print(f"\n  {counts['done']} terminate, {counts['retry']} reprogramate, "
+          f"{counts['failed']} eșuate în {time.perf_counter() - start:.1f} s\n")
+    return 130 if interrupted else 0
+
+
+# ──────────────────────────────────────────────────────────────
+# Comenzi
+# ──────────────────────────────────────────────────────────────
+
+def _read_text(path: str) -> str:
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def cmd_enqueue(args) -> int:
+    urls = list(args.url)
+    for path in args.urls_file:
+        urls += [line.strip() for line in _read_text(path).splitlines()
+                 if line.strip().startswith(("http://", "https://"))]
+    texts = [_read_text(path) for path in args.text_file]
+
+    if args.kind == "import-url":
+        payloads = [{"url": url} for url in dict.fromkeys(urls)]
+    elif args.kind == "parse-urls":
+        # Ca un request din webapp: toate URL-urile într-un singur job
+        payloads = [{"urls": urls}] if urls else []
+    elif args.kind == "import-text":
+        from scrape_recipes import split_local_blocks
+
+        # Un job per bloc de rețetă → reîncercări și paralelism per rețetă
+        payloads = [{"text": block} for text in texts for block in split_local_blocks(text)]
+    else:
+        payloads = [{"text": text} for text in texts if text.strip()]
+
+    if not payloads:
+        source = "--url / --urls-file" if args.kind.endswith(("-url", "-urls")) else "--text-file"
+        print(f"  ✗ Nimic de adăugat pentru {args.kind} (folosește {source})")
+        return 1
+    conn = connect(args.queue)
+    try:
+        ids = enqueue(conn, args.kind, payloads, args.interactive, args.max_attempts)
+    finally:
+        conn.close()
+    kind = "interactive" if args.interactive else "batch"
+    print(f"  ✓ {len(ids)} joburi {args.kind} adăugate ({kind})")
+    if len(ids) == 1:
+        print(f"    {ids[0]}")
+    return 0
+
+
+def cmd_status(args) -> int:
+    conn = connect(args.queue)
+    rows = conn.execute(
+        'SELECT kind, status, COUNT(*) FROM "RecipeJob" GROUP BY kind, status').fetchall()
+    ready = conn.execute(
+        'SELECT COUNT(*) FROM "RecipeJob" WHERE status = \'queued\' AND "runAfter" <= ?',
+        (time.time(),)).fetchone()[0]
+    failures = conn.execute(
+        'SELECT id, kind, status, attempts, "maxAttempts", error, "updatedAt" FROM "RecipeJob" '
+        'WHERE error IS NOT NULL AND status IN (\'failed\', \'queued\') '
+        'ORDER BY "updatedAt" DESC LIMIT ?', (args.limit,)).fetchall()
+    conn.close()
+
+    statuses = ("queued", "running", "done", "failed")
+    table: dict = {}
+    for kind, status, count in rows:
+        table.setdefault(kind, dict.fromkeys(statuses, 0))[status] = count
+
+    print(f"\n{'═'*62}")
+    print(f"  Joburi: {args.queue}")
+    print(f"{'═'*62}")
+    print(f"  {'kind':<16}" + "".join(f"{s:>10}" for s in statuses))
+    for kind in sorted(table):
+        print(f"  {kind:<16}" + "".join(f"{table[kind][s]:>10}" for s in statuses))
+    queued = sum(t["queued"] for t in table.values())
+    print(f"\n  {ready} din {queued} joburi în coadă sunt gata de rulare")
+    if failures:
+        print(f"\n  Erori recente:")
+        for job_id, kind, status, attempts, max_attempts, error, updated in failures:
+            first_line = error.splitlines()[0] if error else ""
+            print(f"    {job_id[:8]} {kind:<14} {status:<7} {attempts}/{max_attempts}  "
+                  f"{updated}  {first_line}")
+    print()
+    return 0
+
+
+def cmd_show(args) -> int:
+    conn = connect(args.queue)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('SELECT * FROM "RecipeJob" WHERE id LIKE ? LIMIT 2',
+                        (args.id + "%",)).fetchall()
+    conn.close()
+    if len(rows) != 1:
+        print(f"  ✗ {'Niciun job' if not rows else 'Mai multe joburi'} cu ID-ul '{args.id}'")
+        return 1
+    job = dict(rows[0])
+    for field in ("payload", "result"):
+        if job[field]:
+            job[field] = json.loads(job[field])
+    print(json.dumps(job, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_requeue(args) -> int:
+    sql = ('UPDATE "RecipeJob" SET status = \'queued\', attempts = 0, error = NULL, '
+           '"runAfter" = ?, "updatedAt" = datetime(\'now\') WHERE status = \'failed\'')
+    params: list = [time.time()]
+    if args.id:
+        sql += ' AND id LIKE ?'
+        params.append(args.id + "%")
+    if args.kind:
+        sql += ' AND kind = ?'
+        params.append(args.kind)
+    conn = connect(args.queue)
+    count = conn.execute(sql, params).rowcount
+    conn.close()
+    print(f"  ✓ {count} joburi eșuate readăugate în coadă")
+    return 0
+
+
+def main():
+    from normalize_units import CHOICES_FILE
+    from recipe_dedup import DEFAULT_THRESHOLD
+
+    parser = argparse.ArgumentParser(description="Coada de joburi scrape / import (RecipeJob)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", "-d", default=DEFAULT_DB, help=f"DB-ul importurilor (default: {DEFAULT_DB})")
+    common.add_argument("--queue", "-q",
+                        help=f"Fișierul cozii (default: ${QUEUE_ENV}, altfel "
+                             "data/cache/<db>-<hash>.jobs.sqlite3)")
+
+    p = sub.add_parser("enqueue", parents=[common], help="Adaugă joburi în coadă")
+    p.add_argument("kind", choices=JOB_KINDS)
+    p.add_argument("--url", action="append", default=[], help="URL (se poate repeta)")
+    p.add_argument("--urls-file", action="append", default=[],
+                   help="Fișier cu URL-uri, unul per linie")
+    p.add_argument("--text-file", action="append", default=[],
+                   help="Fișier text (- pentru stdin); la import-text, un job per rețetă")
+    p.add_argument("--interactive", action="store_true",
+                   help="Prioritate interactivă (trece înaintea joburilor batch)")
+    p.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                   help=f"Încercări înainte de failed (default: {DEFAULT_MAX_ATTEMPTS})")
+
+    p = sub.add_parser("worker", parents=[common], help="Rulează joburile din coadă cu un pool de procese")
+    p.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 2,
+                   help="Procese în pool (default: numărul de CPU-uri)")
+    p.add_argument("--interactive-slots", type=int, default=1,
+                   help="Procese rezervate pentru joburile interactive (default: 1)")
+    p.add_argument("--lease", type=float, default=DEFAULT_LEASE,
+                   help=f"Durata lease-ului în secunde (default: {DEFAULT_LEASE:.0f})")
+    p.add_argument("--poll", type=float, default=1.0,
+                   help="Intervalul de verificare a cozii în secunde (default: 1)")
+    p.add_argument("--drain", action="store_true",
+                   help="Se oprește când nu mai sunt joburi în coadă")
+    p.add_argument("--choices", "-c", default=CHOICES_FILE,
+                   help=f"Unit choices (default: {CHOICES_FILE})")
+    p.add_argument("--force", action="store_true", help="Rescrie în loc rețetele existente")
+    p.add_argument("--skip-near-duplicates", action="store_true",
+                   help="Sare peste rețetele noi care seamănă cu una existentă")
+    p.add_argument("--near-threshold", type=float, default=DEFAULT_THRESHOLD,
+                   help=f"Similaritatea minimă pentru aproape-duplicate (default: {DEFAULT_THRESHOLD})")
+    p.add_argument("--verbose", "-v", action="store_true")
+
+    p = sub.add_parser("status", parents=[common], help="Joburi per tip și status + erorile recente")
+    p.add_argument("--limit", type=int, default=10, help="Câte erori recente (default: 10)")
+
+    p = sub.add_parser("show", parents=[common], help="Detaliile unui job (payload, result, error)")
+    p.add_argument("id", help="ID-ul jobului (sau un prefix)")
+
+    p = sub.add_parser("requeue", parents=[common], help="Readaugă în coadă joburile eșuate")
+    p.add_argument("--id", help="Doar jobul cu acest ID (sau prefix)")
+    p.add_argument("--kind", choices=JOB_KINDS, help="Doar joburile de acest tip")
+
+    args = parser.parse_args()
+    if not os.path.isfile(args.db):
+        print(f"  ✗ DB-ul '{args.db}' nu există.")
+        sys.exit(1)
+    args.queue = args.queue or os.environ.get(QUEUE_ENV) or queue_path(args.db)
+    if args.command == "worker" and args.workers < 1:
+        parser.error("--workers trebuie să fie cel puțin 1")
+
+    commands = {"enqueue": cmd_enqueue, "worker": run_worker, "status": cmd_status,
+                "show": cmd_show, "requeue": cmd_requeue}
+    sys.exit(commands[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
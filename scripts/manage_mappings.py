@@ -2,30 +2,18 @@
 """
 Script helper pentru gestionarea mapărilor de ingrediente
 """
-import json
 import sys
 import os
 
+from mapping_store import DEFAULT_MAPPINGS_PATH, MappingStore
+
 # Path relativ la locația scriptului
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-MAPPINGS_FILE = os.path.join(PROJECT_ROOT, 'data', 'ingredient_mappings.json')
-
-def load_mappings():
-    try:
-        with open(MAPPINGS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"grocery_mappings": {}, "unit_conversions": {}, "auto_create": {"enabled": False}}
-
-def save_mappings(mappings):
-    with open(MAPPINGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(mappings, f, indent=2, ensure_ascii=False)
-    print(f"✓ Mapări salvate în {MAPPINGS_FILE}")
+MAPPINGS_FILE = DEFAULT_MAPPINGS_PATH
 
 def list_mappings():
-    mappings = load_mappings()
-    grocery_maps = mappings.get('grocery_mappings', {})
+    grocery_maps = MappingStore(MAPPINGS_FILE).grocery_mappings
     
     if not grocery_maps:
         print("Nu există mapări salvate.")
@@ -40,19 +28,18 @@ def list_mappings():
     print()
 
 def add_mapping(from_name, to_name):
-    mappings = load_mappings()
-    mappings['grocery_mappings'][from_name.lower()] = to_name
-    save_mappings(mappings)
+    with MappingStore(MAPPINGS_FILE) as store:
+        store.set(from_name.lower(), to_name)
     print(f"✓ Adăugat: '{from_name}' → '{to_name}'")
+    print(f"✓ Mapări salvate în {MAPPINGS_FILE}")
 
 def remove_mapping(from_name):
-    mappings = load_mappings()
-    if from_name.lower() in mappings['grocery_mappings']:
-        del mappings['grocery_mappings'][from_name.lower()]
-        save_mappings(mappings)
-        print(f"✓ Șters: '{from_name}'")
-    else:
-        print(f"⚠ Nu există mapare pentru '{from_name}'")
+    with MappingStore(MAPPINGS_FILE) as store:
+        if store.delete(from_name.lower()):
+            print(f"✓ Șters: '{from_name}'")
+            print(f"✓ Mapări salvate în {MAPPINGS_FILE}")
+        else:
+            print(f"⚠ Nu există mapare pentru '{from_name}'")
 
 def main():
     if len(sys.argv) < 2:
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+mapping_store.py — Stocare tranzacțională pentru data/ingredient_mappings.json.
+
+Înainte, fiecare decizie (auto-resolve, răspuns la prompt, add/remove) recitea și
+rescria tot JSON-ul: O(mappings) I/O per ingredient, iar o întrerupere în timpul
+scrierii putea lăsa fișierul corupt.
+
+Acum:
+  - JSON-ul rămâne snapshot-ul (editabil manual cu notion-map-edit)
+  - fiecare decizie e o linie adăugată în ingredient_mappings.log.jsonl
+    (append + fsync — o singură scriere mică)
+  - la citire: snapshot + replay log; o ultimă linie trunchiată e ignorată
+  - compactarea rescrie JSON-ul atomic (tmp + rename) și golește log-ul:
+    la close() și când log-ul depășește `compact_every` intrări
+  - append și compactarea țin un flock pe ingredient_mappings.json.lock; compactarea
+    recitește snapshot + log sub lock, ca intrările scrise între timp de alt proces
+    (ex: alt scraper rulând în paralel) să nu se piardă
+
+Folosit de manage_mappings.py, normalize_units.py și scrape_recipes.py.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:     # Windows: fără lock între procese
+    fcntl = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_MAPPINGS_PATH = os.path.join(PROJECT_ROOT, "data", "ingredient_mappings.json")
+
+GROCERY = "grocery_mappings"
+OBS = "obs_mappings"
+
+
+def _empty_mappings() -> dict:
+    return {GROCERY: {}, "unit_conversions": {"custom_rules": []}, "auto_create": {}}
+
+
+class MappingStore:
+    """Mappings încărcate o dată; fiecare modificare e persistată imediat în log."""
+
+    def __init__(self, path: str = DEFAULT_MAPPINGS_PATH, compact_every: int = 200):
+        self.path = path
+        self.log_path = os.path.splitext(path)[0] + ".log.jsonl"
+        self.lock_path = f"{path}.lock"
+        self.compact_every = compact_every
+        self.data = self._read_snapshot()
+        self._log_entries = self._replay_log(self.data)
+
+    # ── Citire ────────────────────────────────────────────────
+
+    def _read_snapshot(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return _empty_mappings()
+        data.setdefault(GROCERY, {})
+        return data
+
+    def _replay_log(self, data: dict) -> int:
+        """Aplică log-ul peste snapshot-ul `data`; returnează nr. de intrări valide."""
+        try:
+            with open(self.log_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+        count = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Scriere întreruptă — doar ultima linie poate fi incompletă
+                continue
+            self._apply(data, entry)
+            count += 1
+        return count
+
+    @staticmethod
+    def _apply(data: dict, entry: dict):
+        section = data.setdefault(entry.get("section", GROCERY), {})
+        if entry.get("op") == "del":
+            section.pop(entry["key"], None)
+        else:
+            section[entry["key"]] = entry["value"]
+
+    @property
+    def grocery_mappings(self) -> dict:
+        return self.data[GROCERY]
+
+    @property
+    def obs_mappings(self) -> dict:
+        return self.data.setdefault(OBS, {})
+
+    def get(self, key: str, section: str = GROCERY) -> Optional[str]:
+        return self.data.get(section, {}).get(key)
+
+    # ── Scriere ───────────────────────────────────────────────
+
+    @contextmanager
+    def _locked(self):
+        """Lock exclusiv între procese pe snapshot + log (no-op fără fcntl)."""
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _append(self, entry: dict):
+        self._apply(self.data, entry)
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._locked(), open(self.log_path, "a+b") as f:
+            # Ultima linie fără '\n' (scriere întreruptă) → intrarea începe pe linie nouă
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_entries += 1
+        if self._log_entries >= self.compact_every:
+            self.compact()
+
+    def set(self, key: str, value: str, section: str = GROCERY):
+        if self.data.get(section, {}).get(key) == value:
+            return
+        self._append({"op": "set", "section": section, "key": key, "value": value})
+
+    def delete(self, key: str, section: str = GROCERY) -> bool:
+        if key not in self.data.get(section, {}):
+            return False
+        self._append({"op": "del", "section": section, "key": key})
+        return True
+
+    def compact(self):
+        """
+        Rescrie JSON-ul atomic și golește log-ul. Starea scrisă e recitită sub lock
+        (snapshot + log), deci include și intrările altor procese; propriile intrări
+        sunt deja în log.
+        """
+        with self._locked():
+            fresh = self._read_snapshot()
+            self._replay_log(fresh)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(fresh, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            # Log-ul se golește doar după ce snapshot-ul nou e pe disc
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+        # Secțiunile sunt actualizate pe loc: apelanții țin referințe la ele
+        # (ex: grocery_mappings = store.grocery_mappings)
+        for section, values in fresh.items():
+            current = self.data.get(section)
+            if isinstance(current, dict) and isinstance(values, dict):
+                current.clear()
+                current.update(values)
+            else:
+                self.data[section] = values
+        self._log_entries = 0
+
+    def close(self):
+        if self._log_entries:
+            self.compact()
+
+    def __enter__(self) -> "MappingStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
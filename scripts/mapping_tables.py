@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+mapping_tables.py — Citire din tabelele IngredientNameMapping și UnitRule (dev.db).
+
+Schema Prisma are cele două tabele care înlocuiesc data/ingredient_name_mappings.json
+și data/unit_choices.json. Webapp-ul le are în Postgres (create cu `db push`, populate
+de webapp/scripts/seed-import-mappings.ts); pipeline-ul Python citește însă copia
+SQLite webapp/dev.db, care nu le are, și parsa de fiecare dată JSON-urile întregi. Acum:
+  - `--import-json` creează cele două tabele în dev.db (aceleași coloane ca modelele
+    Prisma) și copiază JSON-urile în ele — o singură dată, idempotent
+  - citirile sunt lookup-uri indexate (rawName / key sunt UNIQUE), cu cache în proces
+    (inclusiv rezultatele negative)
+  - cheile sunt mereu lowercase (ca în api/import/confirm din webapp), atât la import
+    cât și la lookup; connect() nu creează nimic, iar fără tabele apelanții revin la
+    JSON-uri
+
+Deciziile care nu sunt reguli de conversie (skip, new, set_unit2, use_unit fără rată)
+nu au loc în UnitRule — webapp-ul le-ar citi ca reguli — și rămân în unit_choices.json,
+încărcat doar la primul lookup care nu găsește regulă (tot atunci devin vizibile și
+regulile din alte fișiere de choices, nemigrate, ex: data/local/unit_choices.json).
+
+Utilizare:
+  python scripts/mapping_tables.py              # statistici
+  python scripts/mapping_tables.py --import-json  # JSON-uri → tabele în dev.db
+"""
+
+import argparse
+import json
+import os
+import secrets
+import sqlite3
+import string
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "webapp", "dev.db")
+CHOICES_PATH = os.path.join(PROJECT_ROOT, "data", "unit_choices.json")
+NAME_MAPPINGS_PATH = os.path.join(PROJECT_ROOT, "data", "ingredient_name_mappings.json")
+SEED_HINT = "python scripts/mapping_tables.py --import-json"
+
+_MISSING = object()
+_TABLES = ("GroceryItem", "IngredientNameMapping", "UnitRule")
+
+# Modelele Prisma IngredientNameMapping / UnitRule, în dialectul SQLite al dev.db
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS "IngredientNameMapping" (
+    "id" TEXT NOT NULL PRIMARY KEY,
+    "rawName" TEXT NOT NULL,
+    "groceryItemId" TEXT NOT NULL,
+    "groceryItemName" TEXT NOT NULL,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" DATETIME NOT NULL,
+    CONSTRAINT "IngredientNameMapping_groceryItemId_fkey" FOREIGN KEY ("groceryItemId")
+        REFERENCES "GroceryItem" ("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
+CREATE UNIQUE INDEX IF NOT EXISTS "IngredientNameMapping_rawName_key"
+    ON "IngredientNameMapping"("rawName");
+CREATE TABLE IF NOT EXISTS "UnitRule" (
+    "id" TEXT NOT NULL PRIMARY KEY,
+    "key" TEXT NOT NULL,
+    "targetUnit" TEXT NOT NULL,
+    "rate" REAL NOT NULL,
+    "foreignUnit" TEXT,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" DATETIME NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS "UnitRule_key_key" ON "UnitRule"("key");
+"""
+
+
+# ──────────────────────────────────────────────────────────────
+# Conexiune
+# ──────────────────────────────────────────────────────────────
+
+def _new_id() -> str:
+    alphabet = string.ascii_lowercase + string.digits
+    return "c" + "".join(secrets.choice(alphabet) for _ in range(24))
+
+
+def _norm(key: str) -> str:
+    """Forma cheilor în tabele: lowercase, fără spații la capete."""
+    return key.lower().strip()
+
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _is_rule(choice: Any) -> bool:
+    return (isinstance(choice, dict) and choice.get("action", "use_unit") == "use_unit"
+            and bool(choice.get("unit")) and choice.get("rate") is not None)
+
+
+def _upsert_rule(conn: sqlite3.Connection, key: str, choice: dict):
+    conn.execute(
+        """
+        INSERT INTO "UnitRule" (id, key, "targetUnit", rate, "foreignUnit", "createdAt", "updatedAt")
+        VALUES (?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+        ON CONFLICT(key) DO UPDATE SET
+          "targetUnit" = excluded."targetUnit", rate = excluded.rate,
+          "foreignUnit" = excluded."foreignUnit", "updatedAt" = excluded."updatedAt"
+        """,
+        (_new_id(), key, choice["unit"], float(choice["rate"]), choice.get("from_unit")),
+    )
+
+
+def connect(db_path: str = DEFAULT_DB_PATH, readonly: bool = True) -> Optional[sqlite3.Connection]:
+    """
+    Deschide dev.db fără să-l modifice; None dacă DB-ul nu există sau îi lipsește
+    una dintre tabele (GroceryItem, IngredientNameMapping, UnitRule).
+    readonly=False doar pentru UnitChoices, care salvează regulile noi în UnitRule.
+    """
+    if not db_path or not os.path.isfile(db_path):
+        return None
+    try:
+        if readonly:
+            conn = sqlite3.connect(f"{Path(os.path.abspath(db_path)).as_uri()}?mode=ro", uri=True)
+        else:
+            conn = sqlite3.connect(db_path)
+        found = {row[0] for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' "
+            f"AND name IN ({', '.join('?' * len(_TABLES))})", _TABLES)}
+        if found != set(_TABLES):
+            conn.close()
+            return None
+        return conn
+    except sqlite3.Error as e:
+        print(f"  ⚠ Nu pot deschide tabelele de mapping din {db_path}: {e}", file=sys.stderr)
+        return None
+
+
+# ──────────────────────────────────────────────────────────────
+# Cache-uri read-through
+# ──────────────────────────────────────────────────────────────
+
+class NameMappings:
+    """rawName (lowercase) → {"groceryItemId", "groceryItemName"}, cu cache în proces."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._cache: Dict[str, Any] = {}
+
+    def get(self, raw_name: str, default: Any = None) -> Any:
+        key = _norm(raw_name)
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            row = self.conn.execute(
+                'SELECT "groceryItemId", "groceryItemName" FROM "IngredientNameMapping" '
+                'WHERE "rawName" = ?', (key,)).fetchone()
+            value = {"groceryItemId": row[0], "groceryItemName": row[1]} if row else None
+            self._cache[key] = value
+        return default if value is None else value
+
+    def __contains__(self, raw_name: str) -> bool:
+        return self.get(raw_name) is not None
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        """Toate mapările (scan complet — doar pentru matching pe substring)."""
+        for raw, gid, gname in self.conn.execute(
+                'SELECT "rawName", "groceryItemId", "groceryItemName" FROM "IngredientNameMapping"'):
+            yield raw, {"groceryItemId": gid, "groceryItemName": gname}
+
+
+class UnitChoices:
+    """
+    Interfață de dict peste unit choices (`ingredient|unitate` → decizie):
+      - regulile de conversie vin din UnitRule, prin lookup pe cheia indexată
+      - restul deciziilor vin din JSON, încărcat leneș la primul lookup fără regulă
+    Regulile noi merg direct în UnitRule (commit imediat); JSON-ul e rescris doar de
+    save() și doar dacă s-a schimbat o decizie non-regulă sau o intrare deja existentă în el.
+    Cheile sunt comparate lowercase, în tabelă ca și în JSON.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, choices_path: str = CHOICES_PATH):
+        self.conn = conn
+        self.choices_path = choices_path
+        self._cache: Dict[str, Any] = {}
+        self._decisions: Optional[dict] = None
+        self._dirty = False
+
+    def _load_decisions(self) -> dict:
+        if self._decisions is None:
+            self._decisions = {_norm(k): v for k, v in _read_json(self.choices_path).items()}
+        return self._decisions
+
+    def get(self, key: str, default: Any = None) -> Any:
+        key = _norm(key)
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            row = self.conn.execute(
+                'SELECT "targetUnit", rate, "foreignUnit" FROM "UnitRule" WHERE key = ?',
+                (key,)).fetchone()
+            if row:
+                value = {"action": "use_unit", "unit": row[0], "rate": row[1], "from_unit": row[2]}
+            else:
+                value = self._load_decisions().get(key)
+            self._cache[key] = value
+        return default if value is None else value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, choice: Any):
+        key = _norm(key)
+        decisions = self._load_decisions()
+        if _is_rule(choice):
+            _upsert_rule(self.conn, key, choice)
+            # JSON-ul rămâne consistent pentru intrările pe care le are deja
+            if key in decisions and decisions[key] != choice:
+                decisions[key] = choice
+                self._dirty = True
+        else:
+            # O decizie nouă non-regulă anulează regula veche pentru aceeași cheie
+            self.conn.execute('DELETE FROM "UnitRule" WHERE key = ?', (key,))
+            decisions[key] = choice
+            self._dirty = True
+        self.conn.commit()
+        self._cache[key] = choice
+
+    def __len__(self) -> int:
+        rules = {row[0] for row in self.conn.execute('SELECT key FROM "UnitRule"')}
+        return len(rules | set(self._load_decisions()))
+
+    def save(self):
+        """Rescrie JSON-ul dacă s-a schimbat o intrare din el."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.choices_path) or ".", exist_ok=True)
+        tmp = f"{self.choices_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._decisions, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.choices_path)
+        self._dirty = False
+
+
+# ──────────────────────────────────────────────────────────────
+# Import one-time din JSON
+# ──────────────────────────────────────────────────────────────
+
+def import_json(db_path: str, mappings_path: str = NAME_MAPPINGS_PATH,
+                choices_path: str = CHOICES_PATH) -> Tuple[int, int, int, int]:
+    """
+    Creează tabelele în dev.db (dacă lipsesc) și copiază JSON-urile în ele, cu
+    cheile lowercase. Idempotent (upsert pe rawName / key), ca seed-ul din webapp.
+    Id-urile din JSON sunt cele din Postgres; o mapare al cărei id nu există în dev.db
+    e legată de grocery item-ul local cu același groceryItemName, altfel e sărită.
+    Din choices intră doar regulile de conversie. Returnează (mapări, mapări sărite, reguli, decizii rămase
+    în JSON).
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(_SCHEMA)
+        items = conn.execute('SELECT id, name FROM "GroceryItem"').fetchall()
+        ids = {gid for gid, _ in items}
+        by_name = {_norm(name): (gid, name) for gid, name in items}
+        mapped = skipped = 0
+        for raw_name, value in _read_json(mappings_path).items():
+            if not isinstance(value, dict):
+                skipped += 1
+                continue
+            gid, gname = value.get("groceryItemId"), value.get("groceryItemName") or ""
+            if gid not in ids:
+                gid, gname = by_name.get(_norm(gname), (None, gname))
+            if not _norm(raw_name) or gid is None:
+                skipped += 1
+                continue
+            conn.execute(
+                """
+                INSERT INTO "IngredientNameMapping"
+                    (id, "rawName", "groceryItemId", "groceryItemName", "createdAt", "updatedAt")
+                VALUES (?, ?, ?, ?, datetime('now'), datetime('now'))
+                ON CONFLICT("rawName") DO UPDATE SET
+                  "groceryItemId" = excluded."groceryItemId",
+                  "groceryItemName" = excluded."groceryItemName", "updatedAt" = excluded."updatedAt"
+                """,
+                (_new_id(), _norm(raw_name), gid, gname),
+            )
+            mapped += 1
+        rules = kept = 0
+        for key, choice in _read_json(choices_path).items():
+            if _is_rule(choice):
+                _upsert_rule(conn, _norm(key), choice)
+                rules += 1
+            else:
+                kept += 1
+        conn.commit()
+    finally:
+        conn.close()
+    return mapped, skipped, rules, kept
+
+
+# ──────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Tabelele IngredientNameMapping / UnitRule din dev.db")
+    parser.add_argument("--db", "-d", default=DEFAULT_DB_PATH)
+    parser.add_argument("--import-json", action="store_true",
+                        help="Creează tabelele și copiază în ele ingredient_name_mappings.json "
+                             "și unit_choices.json")
+    args = parser.parse_args()
+
+    if args.import_json:
+        if not os.path.isfile(args.db):
+            print(f"✗ '{args.db}' nu există")
+            sys.exit(1)
+        try:
+            mapped, skipped, rules, kept = import_json(args.db)
+        except sqlite3.Error as e:
+            print(f"✗ Importul în '{args.db}' a eșuat: {e}")
+            sys.exit(1)
+        print(f"  ✓ IngredientNameMapping : {mapped} copiate"
+              + (f", {skipped} sărite (grocery item inexistent)" if skipped else ""))
+        print(f"  ✓ UnitRule              : {rules} copiate"
+              + (f", {kept} decizii rămân în {os.path.basename(CHOICES_PATH)}" if kept else ""))
+
+    conn = connect(args.db)
+    if conn is None:
+        print(f"✗ '{args.db}' nu există sau nu are tabelele de mapping")
+        print(f"  Creează-le și copiază JSON-urile în ele: {SEED_HINT}")
+        sys.exit(1)
+
+    try:
+        print(f"\n{'═'*62}")
+        print(f"  Tabele de mapping ({os.path.relpath(args.db, PROJECT_ROOT)})")
+        print(f"{'═'*62}")
+        n_map = conn.execute('SELECT COUNT(*) FROM "IngredientNameMapping"').fetchone()[0]
+        n_rules = conn.execute('SELECT COUNT(*) FROM "UnitRule"').fetchone()[0]
+        print(f"  IngredientNameMapping : {n_map}")
+        print(f"  UnitRule              : {n_rules}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
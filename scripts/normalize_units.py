@@ -19,13 +19,21 @@ Auto-detectează formatul:
 import re
 import os
 import json
+import functools
+import importlib.util
 import secrets
 import sqlite3
 import string
 import argparse
+from collections import Counter, deque
 from typing import Optional
 from difflib import SequenceMatcher
 
+from grocery_catalog import FoldedIndex, fold_key
+from ingredient_grammar import BRACKET_RE, split_bracket, tokenize
+from mapping_store import MappingStore
+from mapping_tables import NameMappings, UnitChoices, connect as connect_mapping_tables
+
 
 def _new_id() -> str:
     alphabet = string.ascii_lowercase + string.digits
@@ -74,7 +82,7 @@ UNITLESS_MARKERS = {"to taste", "as needed", "optional", "pinch of", "dash of"}
 def normalize_unit(raw: str) -> str:
     """Normalizează o unitate la forma canonică."""
     key = raw.strip().lower()
-    return UNIT_NORMALIZE.get(key, key)
+    return UNIT_NORMALIZE.get(key) or UNIT_NORMALIZE.get(key.rstrip("."), key)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -90,14 +98,15 @@ _PINT_ALIAS: dict[str, str] = {
     "fl oz": "fluid_ounce",
 }
 
-try:
-    from pint import UnitRegistry as _UnitRegistry, errors as _pint_errors
-    _ureg = _UnitRegistry()
-    _PINT_AVAILABLE = True
-except ImportError:
-    _PINT_AVAILABLE = False
-    _pint_errors = None
-    _ureg = None  # type: ignore
+# pint se importă (și registry-ul se construiește) abia la prima conversie:
+# UnitRegistry() parsează toate definițiile de unități — sute de ms la pornire
+_PINT_AVAILABLE = importlib.util.find_spec("pint") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _unit_registry():
+    from pint import UnitRegistry
+    return UnitRegistry()
 
 
 def pint_convert(qty: float, from_unit: str, to_unit: str) -> Optional[float]:
@@ -121,7 +130,7 @@ def pint_convert(qty: float, from_unit: str, to_unit: str) -> Optional[float]:
     to_pint = _PINT_ALIAS.get(to_unit, to_unit)
 
     try:
-        result = (_ureg.Quantity(qty, from_pint)).to(to_pint)
+        result = (_unit_registry().Quantity(qty, from_pint)).to(to_pint)
         return round(float(result.magnitude), 6)
     except Exception:
         # Dimensiuni incompatibile sau unitate necunoscută
@@ -132,24 +141,6 @@ def pint_convert(qty: float, from_unit: str, to_unit: str) -> Optional[float]:
 # Parsare ingredient line
 # ──────────────────────────────────────────────────────────────
 
-# Unități recunoscute (pentru a le separa de numele ingredientului)
-KNOWN_UNITS_RE = re.compile(
-    r'^(cup|cups|tbsp|tbsp\.|tablespoon|tablespoons|tsp|tsp\.|teaspoon|teaspoons'
-    r'|oz|oz\.|ounce|ounces|lb|lb\.|lbs|pound|pounds'
-    r'|g|gram|grams|kg|kilogram|kilograms'
-    r'|ml|milliliter|milliliters|l|liter|liters'
-    r'|pint|pints|handful|handfuls|pinch|pinches|piece|pieces'
-    r'|clove|cloves|slice|slices|can|cans|jar|jars|bunch|bunches'
-    r'|lingur[iăa]|lingurit[ăae]|can[ăi]|buc[aăt]?|bucat[ăi]|buc)\b',
-    re.I
-)
-
-# Cantitate: fracții, numere, range-uri
-QTY_RE = re.compile(
-    r'^(\d+\s*[/⁄]\s*\d+|\d+\.\d+|\d+\s+\d+\s*[/⁄]\s*\d+|\d+(?:\s*-\s*\d+)?)'
-)
-
-
 def parse_ingredient_line(line: str) -> Optional[tuple[str, Optional[str], str]]:
     """
     Extrage (quantity_str, unit_str, ingredient_name) dintr-o linie de ingredient.
@@ -164,35 +155,16 @@ def parse_ingredient_line(line: str) -> Optional[tuple[str, Optional[str], str]]
         if marker in line.lower():
             return None
 
-    # Încearcă să extragă cantitate
-    qty_match = QTY_RE.match(line)
-    if not qty_match:
-        # Fără cantitate numerică — poate fi "1 banana" fără unitate sau "Pinch of salt"
-        # Dacă nu începe cu cifră, nu e ingredient standard
-        if not line[0].isdigit():
-            return None
+    # Cantitate + unitate opțională (gramatica comună din ingredient_grammar)
+    tokens = tokenize(line)
+    if tokens is None or tokens.bracketed:
+        # Fără cantitate numerică — "Pinch of salt" etc. nu e ingredient standard
         return None
 
-    qty_str = qty_match.group(1)
-    rest = line[qty_match.end():].strip()
-
-    if not rest:
-        return None
-
-    # Încearcă să identifice unitatea
-    unit_str = None
-    unit_match = KNOWN_UNITS_RE.match(rest)
-    if unit_match:
-        unit_str = unit_match.group(0).strip()
-        ingredient_name = rest[unit_match.end():].strip()
-        # Elimină "of" după unitate (ex: "cloves of garlic" → garlic)
-        if ingredient_name.lower().startswith("of "):
-            ingredient_name = ingredient_name[3:].strip()
-    else:
-        ingredient_name = rest
-
-    if not ingredient_name:
-        return None
+    qty_str = tokens.qty
+    unit_str = tokens.unit
+    # "of" după unitate e deja eliminat (ex: "cloves of garlic" → garlic)
+    ingredient_name = tokens.name
 
     # Curăță descrieri după virgulă (ex: "garlic, minced" → "garlic")
     ingredient_name = ingredient_name.split(",")[0].strip()
@@ -208,21 +180,6 @@ def parse_ingredient_line(line: str) -> Optional[tuple[str, Optional[str], str]]
 # Parsare format scraped (output scrape_recipes.py)
 # ──────────────────────────────────────────────────────────────
 
-# Linie de ingredient scraped: [qty] name sau [qty unit] name
-BRACKET_LINE_RE = re.compile(r'^\[([^\]]+)\]\s*(.+)$')
-
-
-def _parse_bracket_qty_unit(bracket: str) -> tuple[str, Optional[str]]:
-    """Extrage (qty, unit) din conținutul unui bracket: '0.5 cup' → ('0.5', 'cup')."""
-    bracket = bracket.strip()
-    # Încearcă qty + unit
-    m = re.match(r'^([0-9./\s]+)\s+(.+)$', bracket)
-    if m:
-        return m.group(1).strip(), m.group(2).strip()
-    # Doar qty
-    return bracket, None
-
-
 def extract_ingredients_scraped(content: str) -> list[dict]:
     """
     Parsează format scrape_recipes.py:
@@ -259,11 +216,11 @@ def extract_ingredients_scraped(content: str) -> list[dict]:
 
         # Linie ingredient: începe cu [
         if line.startswith('['):
-            m = BRACKET_LINE_RE.match(line)
+            m = BRACKET_RE.match(line)
             if not m:
                 continue
             bracket, rest = m.group(1), m.group(2).strip()
-            qty, unit = _parse_bracket_qty_unit(bracket)
+            qty, unit = split_bracket(bracket)
 
             # Elimină tot ce vine după virgulă (adjective mutate acolo de scraper)
             name = rest.split(",")[0].strip()
@@ -376,7 +333,7 @@ def update_grocery_item_unit2(db_path: str, db_name: str, unit2: str, rate: Opti
 
 def load_grocery_items(db_path: str) -> dict[str, dict]:
     """
-    Returnează dict: name_lower → { name, unit, unit2 }
+    Returnează dict: name_lower → { id, name, unit, unit2, conversion }
     """
     if not os.path.isfile(db_path):
         print(f"  ⚠  DB nu a fost găsit: {db_path}")
@@ -384,13 +341,14 @@ def load_grocery_items(db_path: str) -> dict[str, dict]:
 
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
-    cur.execute('SELECT name, unit, unit2, conversion FROM "GroceryItem"')
+    cur.execute('SELECT id, name, unit, unit2, conversion FROM "GroceryItem"')
     rows = cur.fetchall()
     conn.close()
 
     items = {}
-    for name, unit, unit2, conversion in rows:
+    for item_id, name, unit, unit2, conversion in rows:
         items[name.lower().strip()] = {
+            "id": item_id,
             "name": name,
             "unit": unit or "",
             "unit2": unit2 or "",
@@ -453,22 +411,104 @@ def _strip_adjectives(name: str) -> str:
     return result if result else name.lower()
 
 
-def load_ingredient_mappings(mappings_path: str = "data/ingredient_mappings.json") -> dict[str, str]:
-    """Încarcă grocery_mappings din ingredient_mappings.json (raw_name → canonical_name)."""
-    if not os.path.isfile(mappings_path):
-        return {}
-    with open(mappings_path, encoding="utf-8") as f:
-        data = json.load(f)
+def load_ingredient_mappings(mappings_path: str = "data/ingredient_mappings.json",
+                             db_path: Optional[str] = None,
+                             conn: Optional[sqlite3.Connection] = None) -> dict[str, str]:
+    """
+    Încarcă grocery_mappings din ingredient_mappings.json (raw_name → canonical_name).
+    Cu db_path (sau o conexiune deja deschisă, lăsată deschisă), adaugă și
+    IngredientNameMapping din dev.db (rawName → groceryItemName);
+    deciziile locale din ingredient_mappings.json au prioritate.
+    """
+    mappings: dict[str, str] = {}
+    owned = conn is None
+    if owned:
+        conn = connect_mapping_tables(db_path) if db_path else None
+    if conn is not None:
+        try:
+            # Matching-ul pe substring are nevoie de toate cheile → un singur SELECT
+            mappings = {raw: m["groceryItemName"].strip()
+                        for raw, m in NameMappings(conn).items() if m["groceryItemName"]}
+        finally:
+            if owned:
+                conn.close()
+    # Snapshot JSON + log-ul de decizii încă necompactat
+    grocery_mappings = MappingStore(mappings_path).grocery_mappings
     # Normalizează cheile la lowercase pentru matching ușor
-    return {k.lower().strip(): v.strip() for k, v in data.get("grocery_mappings", {}).items()}
+    mappings.update({k.lower().strip(): v.strip() for k, v in grocery_mappings.items()})
+    return mappings
+
+
+class MappingMatcher:
+    """
+    Automat Aho-Corasick peste cheile din mappings (doar cele cu len >= min_len),
+    construit o dată per rulare. first_match(text) dă aceeași valoare ca bucla
+
+        for key, val in mappings.items():
+            if key in text and len(key) >= 4: return val
+
+    adică prima cheie în ordinea din dict, nu prima poziție din text: fiecare nod
+    ține indexul minim al unei chei care se termină în el (inclusiv pe lanțul de
+    fail), deci o singură trecere prin text, liniară în lungimea lui.
+    """
 
+    _NONE = float("inf")
 
-def normalize_ingredient_name(raw: str, mappings: dict[str, str], grocery_items: dict[str, dict]) -> str:
+    def __init__(self, mappings: dict[str, str], min_len: int = 4):
+        self.values = list(mappings.values())
+        self.goto: list[dict[str, int]] = [{}]
+        self.best: list[float] = [self._NONE]
+        for idx, key in enumerate(mappings):
+            if len(key) < min_len:
+                continue
+            node = 0
+            for ch in key:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto.append({})
+                    self.best.append(self._NONE)
+                    self.goto[node][ch] = nxt
+                node = nxt
+            self.best[node] = min(self.best[node], idx)
+
+        # Legături de fail (BFS); best[] moștenește minimul de pe sufixe
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.best[child] = min(self.best[child], self.best[self.fail[child]])
+                queue.append(child)
+
+    def first_match(self, text: str) -> Optional[str]:
+        goto, fail, best = self.goto, self.fail, self.best
+        node = 0
+        found = self._NONE
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best[node] < found:
+                found = best[node]
+        return None if found == self._NONE else self.values[int(found)]
+
+
+def normalize_ingredient_name(raw: str, mappings: dict[str, str], grocery_items: dict[str, dict],
+                              matcher: Optional[MappingMatcher] = None) -> str:
     """
     Normalizează un nume de ingredient:
     1. Strippuiește adjectivele (ex: 'ripe banana' → 'banana')
     2. Aplică grocery_mappings (ex: 'cilantro' → 'Fresh Coriander')
     3. Returnează lowercase canonical name
+
+    `matcher` (MappingMatcher peste aceleași mappings) înlocuiește scanarea
+    tuturor cheilor la potrivirea parțială.
     """
     # Pas 1: strip adjective
     stripped = _strip_adjectives(raw)
@@ -478,6 +518,11 @@ def normalize_ingredient_name(raw: str, mappings: dict[str, str], grocery_items:
         if candidate in mappings:
             return mappings[candidate].lower()
         # Încearcă potrivire parțială: orice cheie din mappings e substring al candidat-ului
+        if matcher is not None:
+            val = matcher.first_match(candidate)
+            if val is not None:
+                return val.lower()
+            continue
         for key, val in mappings.items():
             if key in candidate and len(key) >= 4:
                 return val.lower()
@@ -493,8 +538,119 @@ def normalize_ingredient_name(raw: str, mappings: dict[str, str], grocery_items:
 # Fuzzy match ingredient name → GroceryItem
 # ──────────────────────────────────────────────────────────────
 
-def fuzzy_match(name: str, grocery_items: dict[str, dict], threshold: float = 0.80) -> Optional[dict]:
-    """Încearcă exact match, apoi prefix match, apoi fuzzy."""
+def _trigrams(s: str) -> set[str]:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Index peste cheile din grocery_items pentru fuzzy_match, cu aceleași rezultate
+    ca scanarea liniară (inclusiv ordinea de departajare = ordinea din dict):
+
+      - substring: index invers trigramă → chei; o cheie poate fi conținută în nume
+        doar dacă toate trigramele ei apar în nume. Cheile < 3 caractere se verifică
+        direct (sunt puține).
+      - SequenceMatcher: primele `shortlist` chei după trigrame comune dau un prag
+        inițial; restul sunt sărite pe baza limitelor superioare ale lui ratio()
+        (lungime — real_quick_ratio, multiset de caractere — quick_ratio), deci
+        ratio() exact rulează doar pe câțiva candidați.
+    """
+
+    def __init__(self, grocery_items: dict[str, dict], shortlist: int = 20):
+        self.grocery_items = grocery_items
+        self.shortlist = shortlist
+        self.keys = list(grocery_items)
+        self.folded = FoldedIndex(self.keys)         # cheie fără diacritice/plural → cheie
+        self.short_keys: list[int] = []              # poziții chei < 3 caractere
+        self.required: list[int] = []                # nr. trigrame distincte per cheie
+        self.postings: dict[str, list[int]] = {}     # trigramă → poziții chei
+        self.by_length: dict[int, list[int]] = {}    # lungime → poziții chei
+        self.char_counts: list[Counter] = []
+        for pos, key in enumerate(self.keys):
+            grams = _trigrams(key)
+            self.required.append(len(grams))
+            if not grams:
+                self.short_keys.append(pos)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(pos)
+            self.by_length.setdefault(len(key), []).append(pos)
+            self.char_counts.append(Counter(key))
+
+    def substring_match(self, name: str) -> Optional[int]:
+        """Poziția primei chei (în ordinea din dict) conținute în name."""
+        hits: dict[int, int] = {}
+        for gram in _trigrams(name):
+            for pos in self.postings.get(gram, ()):
+                hits[pos] = hits.get(pos, 0) + 1
+        best = None
+        for pos, count in hits.items():
+            if count == self.required[pos] and (best is None or pos < best) and self.keys[pos] in name:
+                best = pos
+        for pos in self.short_keys:
+            if best is not None and pos > best:
+                break
+            if self.keys[pos] in name:
+                best = pos
+                break
+        return best
+
+    def best_ratio(self, name: str, floor: float = 0.0) -> tuple[float, Optional[int]]:
+        """
+        (ratio maxim, poziția primei chei care îl atinge), ca bucla liniară.
+        Cheile care nu pot atinge `floor` (pragul de acceptare) nu sunt evaluate.
+        """
+        best_ratio, best_pos = 0.0, None
+        evaluated: set[int] = set()
+
+        def consider(pos: int):
+            nonlocal best_ratio, best_pos
+            evaluated.add(pos)
+            ratio = SequenceMatcher(None, name, self.keys[pos]).ratio()
+            if ratio > best_ratio or (ratio == best_ratio and best_pos is not None and pos < best_pos):
+                best_ratio, best_pos = ratio, pos
+
+        # Prag inițial: cheile cu cele mai multe trigrame comune
+        overlap: dict[int, int] = {}
+        for gram in _trigrams(name):
+            for pos in self.postings.get(gram, ()):
+                overlap[pos] = overlap.get(pos, 0) + 1
+        for pos in sorted(overlap, key=lambda p: (-overlap[p], p))[:self.shortlist]:
+            consider(pos)
+
+        name_len = len(name)
+        name_counts = Counter(name)
+        for length, positions in self.by_length.items():
+            total = name_len + length
+            if not total:
+                for pos in positions:
+                    if pos not in evaluated:
+                        consider(pos)
+                continue
+            # Aceeași formulă ca SequenceMatcher (2.0 * M / T), deci comparabilă exact
+            if 2.0 * min(name_len, length) / total < max(floor, best_ratio):
+                continue
+            for pos in positions:
+                if pos in evaluated:
+                    continue
+                key_counts = self.char_counts[pos]
+                bound = 2.0 * sum(min(c, key_counts[ch]) for ch, c in name_counts.items()) / total
+                if bound < max(floor, best_ratio):
+                    continue
+                # La egalitate câștigă cheia mai din față — una de după nu poate depăși
+                if bound == best_ratio and best_pos is not None and pos > best_pos:
+                    continue
+                consider(pos)
+        return best_ratio, best_pos
+
+
+def fuzzy_match(name: str, grocery_items: dict[str, dict], threshold: float = 0.80,
+                index: Optional[FuzzyIndex] = None) -> Optional[dict]:
+    """
+    Încearcă exact match, apoi cheia normalizată (diacritice/plural), apoi prefix
+    match, apoi fuzzy.
+    Cu `index` (FuzzyIndex construit o dată peste grocery_items) evită scanarea
+    completă a catalogului; rezultatul e identic.
+    """
     # Exact
     if name in grocery_items:
         return grocery_items[name]
@@ -503,6 +659,24 @@ def fuzzy_match(name: str, grocery_items: dict[str, dict], threshold: float = 0.
     if name.endswith("s") and name[:-1] in grocery_items:
         return grocery_items[name[:-1]]
 
+    # Cheie normalizată (ex: "ceapa" → "ceapă", "jalapeños" → "jalapeño")
+    if index is not None:
+        key = index.folded.get(name)
+    else:
+        folded = fold_key(name)
+        key = next((k for k in grocery_items if fold_key(k) == folded), None)
+    if key is not None:
+        return grocery_items[key]
+
+    if index is not None:
+        pos = index.substring_match(name)
+        if pos is not None:
+            return grocery_items[index.keys[pos]]
+        best_ratio, pos = index.best_ratio(name, threshold)
+        if pos is not None and best_ratio >= threshold:
+            return grocery_items[index.keys[pos]]
+        return None
+
     # Prefix: DB key e conținut în numele din rețetă (ex: "spinach" în "baby spinach")
     # Nu invers — "cheese" NU trebuie să match-uieze "ricotta cheese"
     for key, item in grocery_items.items():
@@ -530,16 +704,28 @@ def fuzzy_match(name: str, grocery_items: dict[str, dict], threshold: float = 0.
 CHOICES_FILE = "data/unit_choices.json"
 
 
-def load_choices() -> dict:
-    if os.path.isfile(CHOICES_FILE):
-        with open(CHOICES_FILE, encoding="utf-8") as f:
+def load_choices(db_path: Optional[str] = None, path: str = CHOICES_FILE):
+    """
+    Cu dev.db disponibil: UnitChoices (lookup-uri indexate în UnitRule + deciziile
+    non-regulă din JSON). Fără DB: tot JSON-ul, ca dict.
+    """
+    conn = connect_mapping_tables(db_path, readonly=False) if db_path else None
+    if conn is not None:
+        return UnitChoices(conn, path)
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
             return json.load(f)
     return {}
 
 
-def save_choices(choices: dict):
-    os.makedirs(os.path.dirname(CHOICES_FILE), exist_ok=True)
-    with open(CHOICES_FILE, "w", encoding="utf-8") as f:
+def save_choices(choices, path: str = CHOICES_FILE):
+    """Salvează choices în fișierul din care au fost încărcate (UnitChoices îl știe singur)."""
+    if isinstance(choices, UnitChoices):
+        # Regulile sunt deja în UnitRule; JSON-ul se rescrie doar pentru restul deciziilor
+        choices.save()
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
         json.dump(choices, f, ensure_ascii=False, indent=2)
 
 
@@ -689,61 +875,39 @@ def prompt_user(name: str, raw_name: str, used_unit: Optional[str], db_item: dic
 
 
 # ──────────────────────────────────────────────────────────────
-# Main
+# Etape (refolosite de recipes.py, fără I/O de fișiere)
 # ──────────────────────────────────────────────────────────────
 
-def main():
-    parser = argparse.ArgumentParser(description="Detectează conflicte de unități în rețete locale")
-    parser.add_argument(
-        "--input", "-i",
-        default="data/local/scraped_local_recipes.txt",
-        help="Fișier cu rețete scraped sau raw (default: data/local/scraped_local_recipes.txt)",
-    )
-    parser.add_argument(
-        "--db", "-d",
-        default="webapp/dev.db",
-        help="Calea SQLite dev.db (default: webapp/dev.db)",
-    )
-    parser.add_argument(
-        "--threshold", "-t",
-        type=float,
-        default=0.80,
-        help="Prag similaritate fuzzy (default: 0.80)",
-    )
-    parser.add_argument(
-        "--report", "-r",
-        metavar="OUTPUT.json",
-        help="Exportă un raport JSON cu conflictele detectate (fără modul interactiv)",
-    )
-    args = parser.parse_args()
-
-    # ── Încarcă date ──────────────────────────────────────────
-    print(f"\n{'═'*62}")
-    print(f"  normalize_units.py")
-    print(f"{'═'*62}")
-    print(f"  Input  : {args.input}")
-    print(f"  DB     : {args.db}")
-    print()
-
-    print("Încărc grocery items din DB...")
-    grocery_items = load_grocery_items(args.db)
-    print(f"  {len(grocery_items)} ingrediente găsite în DB")
+def extract_ingredients_from_recipes(recipes) -> list[dict]:
+    """
+    Ingredientele din rețete deja parsate (dict-uri import_recipes.parse_recipe_block),
+    în aceeași formă ca extract_ingredients_scraped — fără re-citirea fișierului.
+    """
+    results = []
+    for recipe in recipes:
+        for ing in recipe["ingredients"]:
+            if not ing["name"]:
+                continue
+            results.append({
+                "recipe": recipe["name"],
+                "raw_line": None,
+                "qty": ing["qty"],
+                "unit": ing["unit"],
+                "name": ing["name"],
+            })
+    return results
 
-    print("Încărc ingredient mappings...")
-    mappings = load_ingredient_mappings()
-    print(f"  {len(mappings)} mappings de ingrediente\n")
-
-    print(f"Parsez rețete din '{args.input}'...")
-    all_ingredients, fmt = extract_ingredients_from_file(args.input)
-    print(f"  Format detectat: {fmt}")
-    print(f"  {len(all_ingredients)} linii de ingrediente extrase\n")
 
+def collect_unit_conflicts(all_ingredients: list[dict], grocery_items: dict[str, dict],
+                           mappings: dict[str, str], threshold: float = 0.80) -> list[dict]:
+    """Perechile (ingredient, unitate) incompatibile cu unit/unit2 din DB, sortate alfabetic."""
     # ── Grupează pe (normalized_name, unit) unice ─────────────
     # name_raw → normalized name (pentru afișare transparentă)
     seen: dict[tuple, dict] = {}  # (norm_name, unit) → { recipes, raw_name, db_item }
+    matcher = MappingMatcher(mappings)
     for item in all_ingredients:
         unit_norm = normalize_unit(item["unit"]) if item["unit"] else None
-        norm_name = normalize_ingredient_name(item["name"], mappings, grocery_items)
+        norm_name = normalize_ingredient_name(item["name"], mappings, grocery_items, matcher=matcher)
         key = (norm_name, unit_norm)
         if key not in seen:
             seen[key] = {"recipes": [], "raw_name": item["name"]}
@@ -751,11 +915,11 @@ def main():
             seen[key]["recipes"].append(item["recipe"])
 
     # ── Detectează conflicte ──────────────────────────────────
-    choices = load_choices()
     conflicts: list[dict] = []
 
+    fuzzy_index = FuzzyIndex(grocery_items)
     for (name, unit_norm), meta in seen.items():
-        db_item = fuzzy_match(name, grocery_items, args.threshold)
+        db_item = fuzzy_match(name, grocery_items, threshold, index=fuzzy_index)
         if not db_item:
             continue  # Nu există în DB — nu putem compara
 
@@ -782,48 +946,48 @@ def main():
 
     # ── Sortează conflictele alfabetic după ingredient ─────────
     conflicts.sort(key=lambda c: (c["name"], c["unit"] or ""))
-
-    print(f"{'─'*62}")
-    print(f"  {len(conflicts)} conflicte de unități detectate")
-    print(f"{'─'*62}\n")
-
-    if not conflicts:
-        print("  ✓ Niciun conflict — toate unitățile sunt compatibile cu DB!\n")
-        return
-
-    # ── Modul raport: exportă JSON și iese ────────────────────
-    if args.report:
-        pint_status = "disponibil" if _PINT_AVAILABLE else "indisponibil (pip install pint)"
-        report = {
-            "pint_available": _PINT_AVAILABLE,
-            "pint_status": pint_status,
-            "total_conflicts": len(conflicts),
-            "conflicts": [
-                {
-                    "ingredient": c["name"],
-                    "raw_name": c.get("raw_name", c["name"]),
-                    "unit_in_recipe": c["unit"],
-                    "db_name": c["db_item"]["name"],
-                    "db_unit1": c["db_item"]["unit"],
-                    "db_unit2": c["db_item"]["unit2"],
-                    "recipes": c["recipes"],
-                    "pint_auto_convert": (
-                        pint_convert(1.0, normalize_unit(c["unit"]), normalize_unit(c["db_item"]["unit"]))
-                        if c["unit"] and c["db_item"]["unit"] else None
-                    ),
-                }
-                for c in conflicts
-            ],
-        }
-        out_path = args.report
-        os.makedirs(os.path.dirname(out_path) if os.path.dirname(out_path) else ".", exist_ok=True)
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
-        print(f"\n  ✓ Raport exportat în: {out_path}")
-        print(f"  Pint: {pint_status}")
-        return
-
-    # ── Interactiv ────────────────────────────────────────────
+    return conflicts
+
+
+def write_conflict_report(conflicts: list[dict], out_path: str):
+    """Exportă conflictele ca JSON (modul --report, fără interacțiune)."""
+    pint_status = "disponibil" if _PINT_AVAILABLE else "indisponibil (pip install pint)"
+    report = {
+        "pint_available": _PINT_AVAILABLE,
+        "pint_status": pint_status,
+        "total_conflicts": len(conflicts),
+        "conflicts": [
+            {
+                "ingredient": c["name"],
+                "raw_name": c.get("raw_name", c["name"]),
+                "unit_in_recipe": c["unit"],
+                "db_name": c["db_item"]["name"],
+                "db_unit1": c["db_item"]["unit"],
+                "db_unit2": c["db_item"]["unit2"],
+                "recipes": c["recipes"],
+                "pint_auto_convert": (
+                    pint_convert(1.0, normalize_unit(c["unit"]), normalize_unit(c["db_item"]["unit"]))
+                    if c["unit"] and c["db_item"]["unit"] else None
+                ),
+            }
+            for c in conflicts
+        ],
+    }
+    os.makedirs(os.path.dirname(out_path) if os.path.dirname(out_path) else ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n  ✓ Raport exportat în: {out_path}")
+    print(f"  Pint: {pint_status}")
+
+
+def resolve_conflicts_interactive(conflicts: list[dict], choices, db_path: str,
+                                  grocery_items: dict[str, dict],
+                                  choices_path: str = CHOICES_FILE) -> tuple[list[dict], list[dict]]:
+    """
+    Întreabă pentru fiecare conflict (sau refolosește alegerea din cache); fiecare
+    alegere e salvată imediat în choices_path.
+    Returnează (resolved, new_ingredients).
+    """
     new_ingredients: list[dict] = []
     resolved: list[dict] = []
 
@@ -851,7 +1015,7 @@ def main():
                 elif action == "set_unit2":
                     cached_unit = cached.get("unit", "")
                     rate = cached.get("rate")
-                    rate_str = f", conversie: 1 {cached.get('from_unit', unit1 or '?')} = {rate} {cached_unit}" if rate else ""
+                    rate_str = f", conversie: 1 {cached.get('from_unit', unit or '?')} = {rate} {cached_unit}" if rate else ""
                     print(f"  [{i}/{len(conflicts)}] {name} → unit2={cached_unit}{rate_str} (din cache)")
                     continue
                 else:
@@ -885,7 +1049,7 @@ def main():
         elif result["action"] == "set_unit2":
             new_unit2 = result["unit"]
             rate = result["rate"]
-            update_grocery_item_unit2(args.db, db_item["name"], new_unit2, rate)
+            update_grocery_item_unit2(db_path, db_item["name"], new_unit2, rate)
             # Actualizează și cache-ul local ca să nu mai fie conflict la rerulare
             grocery_items[name]["unit2"] = new_unit2
             choices[cache_key] = {"action": "set_unit2", "unit": new_unit2, "rate": rate}
@@ -900,9 +1064,12 @@ def main():
             print(f"  ✓ Ales: {chosen_unit}{rate_str}")
 
         # Salvează imediat după fiecare alegere (rezistență la întreruperi)
-        save_choices(choices)
+        save_choices(choices, choices_path)
 
-    # ── Sumar ─────────────────────────────────────────────────
+    return resolved, new_ingredients
+
+
+def print_normalize_summary(conflicts: list[dict], resolved: list[dict], new_ingredients: list[dict]):
     print(f"\n{'═'*62}")
     print(f"  SUMAR")
     print(f"{'═'*62}")
@@ -920,6 +1087,84 @@ def main():
 
     print()
 
+
+def print_conflict_count(conflicts: list[dict]):
+    print(f"{'─'*62}")
+    print(f"  {len(conflicts)} conflicte de unități detectate")
+    print(f"{'─'*62}\n")
+
+    if not conflicts:
+        print("  ✓ Niciun conflict — toate unitățile sunt compatibile cu DB!\n")
+
+
+# ──────────────────────────────────────────────────────────────
+# Main
+# ──────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Detectează conflicte de unități în rețete locale")
+    parser.add_argument(
+        "--input", "-i",
+        default="data/local/scraped_local_recipes.txt",
+        help="Fișier cu rețete scraped sau raw (default: data/local/scraped_local_recipes.txt)",
+    )
+    parser.add_argument(
+        "--db", "-d",
+        default="webapp/dev.db",
+        help="Calea SQLite dev.db (default: webapp/dev.db)",
+    )
+    parser.add_argument(
+        "--threshold", "-t",
+        type=float,
+        default=0.80,
+        help="Prag similaritate fuzzy (default: 0.80)",
+    )
+    parser.add_argument(
+        "--report", "-r",
+        metavar="OUTPUT.json",
+        help="Exportă un raport JSON cu conflictele detectate (fără modul interactiv)",
+    )
+    args = parser.parse_args()
+
+    # ── Încarcă date ──────────────────────────────────────────
+    print(f"\n{'═'*62}")
+    print(f"  normalize_units.py")
+    print(f"{'═'*62}")
+    print(f"  Input  : {args.input}")
+    print(f"  DB     : {args.db}")
+    print()
+
+    print("Încărc grocery items din DB...")
+    grocery_items = load_grocery_items(args.db)
+    print(f"  {len(grocery_items)} ingrediente găsite în DB")
+
+    print("Încărc ingredient mappings...")
+    mappings = load_ingredient_mappings(db_path=args.db)
+    print(f"  {len(mappings)} mappings de ingrediente\n")
+
+    print(f"Parsez rețete din '{args.input}'...")
+    all_ingredients, fmt = extract_ingredients_from_file(args.input)
+    print(f"  Format detectat: {fmt}")
+    print(f"  {len(all_ingredients)} linii de ingrediente extrase\n")
+
+    choices = load_choices(args.db)
+    conflicts = collect_unit_conflicts(all_ingredients, grocery_items, mappings, args.threshold)
+
+    print_conflict_count(conflicts)
+    if not conflicts:
+        return
+
+    # ── Modul raport: exportă JSON și iese ────────────────────
+    if args.report:
+        write_conflict_report(conflicts, args.report)
+        return
+
+    # ── Interactiv ────────────────────────────────────────────
+    resolved, new_ingredients = resolve_conflicts_interactive(conflicts, choices, args.db, grocery_items)
+
+    # ── Sumar ─────────────────────────────────────────────────
+    print_normalize_summary(conflicts, resolved, new_ingredients)
+
     # Creează interactiv ingredientele marcate __new__ în ingredient_mappings.json
     prompt_new_grocery_items(args.db)
 
@@ -936,22 +1181,18 @@ def _read_optional_float(prompt: str) -> Optional[float]:
         return None
 
 
-def prompt_new_grocery_items(db_path: str, mappings_path: str = "data/ingredient_mappings.json"):
+def prompt_new_grocery_items(db_path: str, mappings_path: str = "data/ingredient_mappings.json") -> int:
     """
     Găsește toate ingredientele marcate __new__ în ingredient_mappings.json,
     le interoghează câmp cu câmp și le inserează în GroceryItem.
+    Returnează numărul de ingrediente create.
     """
-    if not os.path.isfile(mappings_path):
-        return
-
-    with open(mappings_path, encoding="utf-8") as f:
-        data = json.load(f)
-
-    grocery_mappings = data.get("grocery_mappings", {})
+    store = MappingStore(mappings_path)
+    grocery_mappings = store.grocery_mappings
     new_names = sorted(k for k, v in grocery_mappings.items() if v == "__new__")
 
     if not new_names:
-        return
+        return 0
 
     print(f"\n{'═'*62}")
     print(f"  INGREDIENTE NOI  ({len(new_names)} de creat)")
@@ -990,7 +1231,8 @@ def prompt_new_grocery_items(db_path: str, mappings_path: str = "data/ingredient
                 (item_id, name, unit1, unit2, conv, kcal, carbs, fat, protein),
             )
             conn.commit()
-            grocery_mappings[raw_name] = name
+            # __new__ → nume real, persistat imediat
+            store.set(raw_name, name)
             print(f"  ✓ Creat: '{name}'  [id: {item_id}]")
             created += 1
         except Exception as e:
@@ -998,13 +1240,11 @@ def prompt_new_grocery_items(db_path: str, mappings_path: str = "data/ingredient
 
     conn.close()
 
-    # Salvează mappings actualizate (__new__ → nume real)
+    store.close()
     if created:
-        data["grocery_mappings"] = grocery_mappings
-        with open(mappings_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
         print(f"\n  {created} ingrediente create în DB.")
         print(f"  ingredient_mappings.json actualizat.\n")
+    return created
 
 
 if __name__ == "__main__":
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+parse_cache.py — Cache persistent de rezultate pentru parse-text / normalize-text.
+
+Același bloc de rețetă lipit (sau editat puțin) de mai multe ori era re-normalizat și
+re-parsat de la zero la fiecare apel. Cache-ul din data/cache/parse_cache.sqlite3
+păstrează rezultatul JSON per cheie:
+
+  blake2b(tip + versiunea parserului + text)
+
+  - apelantul decide forma textului: canonical_text() (fără CRLF / spații la
+    capăt de linie) acolo unde diferențele astea nu schimbă rezultatul
+  - versiunea parserului e dată de apelant (ex: hash-ul surselor parserului) →
+    orice modificare a parserului invalidează automat intrările vechi
+  - dimensiunea totală e mărginită (max_bytes); la depășire se șterg intrările
+    folosite cel mai demult (LRU după lastUsed, actualizat cel mult o dată la
+    TOUCH_INTERVAL secunde per intrare, ca hit-urile să nu ceară lock de scriere)
+
+Erorile de I/O nu sunt fatale: fără cache, parsarea merge ca înainte. Un get care
+eșuează (ex: "database is locked" cu mai multe procese) e un miss, un put e ignorat.
+
+Utilizare:
+  python scripts/parse_cache.py              # statistici
+  python scripts/parse_cache.py --clear      # golește cache-ul
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "cache", "parse_cache.sqlite3")
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+TOUCH_INTERVAL = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+  key       TEXT NOT NULL PRIMARY KEY,
+  kind      TEXT NOT NULL,
+  value     TEXT NOT NULL,
+  size      INTEGER NOT NULL,
+  lastUsed  REAL NOT NULL
+)
+"""
+
+
+def canonical_text(text: str) -> str:
+    """Forma folosită la hash: fără CRLF și fără spații la capăt de linie."""
+    return "\n".join(line.rstrip() for line in text.splitlines()).strip("\n")
+
+
+class ParseCache:
+    """Rezultate JSON indexate după conținut; sigur între thread-uri (un lock)."""
+
+    def __init__(self, path: str = CACHE_PATH, version: str = "",
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA busy_timeout = 2000")
+        self.conn.execute(_SCHEMA)
+        self._total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def key(self, kind: str, text: str) -> str:
+        payload = f"{kind}\0{self.version}\0{text}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, kind: str, text: str) -> Optional[Any]:
+        key = self.key(kind, text)
+        with self._lock:
+            try:
+                row = self.conn.execute(
+                    "SELECT value, lastUsed FROM entries WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] >= TOUCH_INTERVAL:
+                try:
+                    self.conn.execute("UPDATE entries SET lastUsed = ? WHERE key = ?", (now, key))
+                except sqlite3.Error:
+                    pass    # doar ordinea LRU rămâne mai veche
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, kind: str, text: str, value: Any):
+        key = self.key(kind, text)
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes // 4:
+            return  # un singur rezultat uriaș nu golește tot cache-ul
+        with self._lock:
+            try:
+                old = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, kind, value, size, lastUsed) VALUES (?, ?, ?, ?, ?)",
+                    (key, kind, encoded, size, time.time()))
+                self._total += size - (old[0] if old else 0)
+                if self._total > self.max_bytes:
+                    self._evict()
+            except sqlite3.Error:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+
+    def _evict(self):
+        """Șterge intrările cele mai vechi până la 90% din limită (cu lock-ul ținut)."""
+        target = self.max_bytes * 9 // 10
+        self.conn.execute("BEGIN IMMEDIATE")
+        freed = 0
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM entries ORDER BY lastUsed"):
+            if self._total - freed <= target:
+                break
+            doomed.append((key,))
+            freed += size
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.conn.execute("COMMIT")
+        self._total -= freed
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM entries")
+            self._total = 0
+
+    def stats(self) -> dict:
+        count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def open_cache(version: str = "", path: str = CACHE_PATH,
+               max_bytes: int = DEFAULT_MAX_BYTES) -> Optional[ParseCache]:
+    """Cache-ul sau None dacă nu poate fi deschis (ex: director read-only)."""
+    try:
+        return ParseCache(path, version, max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        print(f"  ⚠ Cache-ul de parsare nu e disponibil: {e}", file=sys.stderr)
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache-ul de rezultate parse-text / normalize-text")
+    parser.add_argument("--clear", action="store_true", help="Golește cache-ul")
+    parser.add_argument("--path", default=CACHE_PATH)
+    args = parser.parse_args()
+
+    cache = open_cache(path=args.path)
+    if cache is None:
+        sys.exit(1)
+    if args.clear:
+        cache.clear()
+        print("  ✓ Cache golit")
+    by_kind = cache.conn.execute(
+        "SELECT kind, COUNT(*), SUM(size) FROM entries GROUP BY kind ORDER BY kind").fetchall()
+    stats = cache.stats()
+    print(f"\n{'═'*62}")
+    print(f"  Cache parsare: {os.path.relpath(args.path, PROJECT_ROOT)}")
+    print(f"{'═'*62}")
+    print(f"  Intrări       : {stats['entries']}")
+    print(f"  Dimensiune    : {stats['bytes'] / 1024:.1f} KB din {stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    for kind, count, size in by_kind:
+        print(f"    {kind:<18} {count:6d}  {size / 1024:8.1f} KB")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
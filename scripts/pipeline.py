@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+pipeline.py — URL → rând în DB, cu etapele rulate concurent și legate prin cozi mărginite.
+
+Fluxul pe fișiere (recipe_urls.txt → scraped_recipe_urls.txt → normalize → import)
+așteaptă ca fiecare pas să termine tot lotul. Aici fiecare rețetă trece prin etape
+imediat ce e gata, deci primele rețete ajung în DB în timp ce restul URL-urilor
+încă se descarcă:
+
+  fetch      (N thread-uri)  descarcă pagina
+  extract    (1)             JSON-LD / HTML → rețetă, fără traducere
+  translate  (N)             traduce ingredientele (apeluri de rețea)
+  image      (N)             descarcă imaginea
+  normalize  (1)             formatul scraped (cantități / unități) → rețeta importerului
+  resolve    (1)             fingerprint, grocery items, aproape-duplicate (ImportPlanner)
+  insert     (1)             RecipeBatchWriter, loturi mici + flush când coada e goală
+
+Cozile au capacitate fixă (--queue-size): o etapă lentă blochează etapele dinainte
+(backpressure) în loc să adune tot lotul în memorie. La final se afișează, per etapă,
+timpul de lucru, timpul blocat pe coada următoare și numărul de elemente.
+
+Rezolvarea interactivă a numelor (scrape_recipes) și normalize_units nu rulează aici;
+ingredientele nemapate apar în sumar, ca la import_recipes.py.
+
+Utilizare:
+  python scripts/pipeline.py
+  python scripts/pipeline.py -i data/urls/recipe_urls.txt --fetch-workers 16
+  python scripts/pipeline.py -o                      # scrie și scraped_recipe_urls.txt (debug)
+  python scripts/pipeline.py -o /tmp/scraped.txt --skip-near-duplicates
+"""
+
+import argparse
+import io
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from grocery_catalog import FoldedIndex
+from import_recipes import (ImportPlanner, ImportTally, RecipeBatchWriter, iter_scraped_recipes,
+                            load_choices, load_grocery_items, print_import_summary, tune_session)
+from mapping_tables import NameMappings, connect as connect_mapping_tables
+from normalize_units import CHOICES_FILE
+from recipe_dedup import DEFAULT_THRESHOLD, NearDuplicateIndex
+
+DEFAULT_INPUT = "data/urls/recipe_urls.txt"
+DEFAULT_OUTPUT = "data/urls/scraped_recipe_urls.txt"
+IMAGE_DIR = "data/urls/img"
+
+IDLE_SECONDS = 0.5          # coada goală atât timp → etapa cu on_idle golește lotul
+_DONE = object()            # sfârșitul fluxului, propagat din etapă în etapă
+
+
+# ──────────────────────────────────────────────────────────────
+# Etape și cozi
+# ──────────────────────────────────────────────────────────────
+
+class Stage:
+    """
+    O etapă: `func(item, state)` → element pentru etapa următoare sau None (eliminat).
+    `setup()` rulează în fiecare thread al etapei și dă starea locală (conexiuni SQLite,
+    scraper); `on_idle(state)` / `on_close(state)` pot emite elemente acumulate (loturi).
+    """
+
+    def __init__(self, name: str, func: Callable[[Any, Any], Any], workers: int = 1,
+                 setup: Optional[Callable[[], Any]] = None,
+                 on_idle: Optional[Callable[[Any], list]] = None,
+                 on_close: Optional[Callable[[Any], list]] = None,
+                 quiet: bool = True):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.setup = setup
+        self.on_idle = on_idle
+        self.on_close = on_close
+        self.quiet = quiet          # mesajele thread-urilor ei apar doar cu --verbose
+        self.lock = threading.Lock()
+        self.active = 0
+        self.items_in = self.items_out = self.errors = 0
+        self.busy = 0.0             # timp în func / on_idle / on_close, însumat pe thread-uri
+        self.blocked = 0.0          # timp așteptat pe coada plină a etapei următoare
+
+
+class Pipeline:
+    """Rulează etapele în thread-uri, legate prin cozi cu capacitate `queue_size`."""
+
+    def __init__(self, stages: list[Stage], queue_size: int = 16):
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+        self.abort = threading.Event()
+        self.interrupted = False
+        self.seconds = 0.0
+
+    def _put(self, stage: Optional[Stage], q: queue.Queue, item) -> bool:
+        start = time.perf_counter()
+        while not self.abort.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                break
+            except queue.Full:
+                continue
+        if stage is not None:
+            with stage.lock:
+                stage.blocked += time.perf_counter() - start
+        return not self.abort.is_set()
+
+    def _emit(self, stage: Stage, out: Optional[queue.Queue], items: Iterable):
+        for item in items or ():
+            with stage.lock:
+                stage.items_out += 1
+            if out is not None:
+                self._put(stage, out, item)
+
+    def _call(self, stage: Stage, fn: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception as e:
+            with stage.lock:
+                stage.errors += 1
+            label = _label(args[0]) if len(args) > 1 else ""
+            print(f"  ✗ [{stage.name}] {label}: {e}", file=sys.stderr)
+            return None
+        finally:
+            with stage.lock:
+                stage.busy += time.perf_counter() - start
+
+    def _worker(self, index: int, stage: Stage):
+        inq = self.queues[index]
+        out = self.queues[index + 1] if index + 1 < len(self.stages) else None
+        try:
+            state = stage.setup() if stage.setup else None
+        except Exception as e:
+            print(f"  ✗ [{stage.name}] inițializare: {e}", file=sys.stderr)
+            self.abort.set()
+            state = None
+        try:
+            while not self.abort.is_set():
+                try:
+                    item = inq.get(timeout=IDLE_SECONDS if stage.on_idle else 0.2)
+                except queue.Empty:
+                    if stage.on_idle:
+                        self._emit(stage, out, self._call(stage, stage.on_idle, state))
+                    continue
+                if item is _DONE:
+                    inq.put(_DONE)  # și pentru celelalte thread-uri ale etapei
+                    break
+                with stage.lock:
+                    stage.items_in += 1
+                result = self._call(stage, stage.func, item, state)
+                if result is not None:
+                    self._emit(stage, out, [result])
+            if stage.on_close and not self.abort.is_set():
+                self._emit(stage, out, self._call(stage, stage.on_close, state))
+        finally:
+            with stage.lock:
+                stage.active -= 1
+                last = stage.active == 0
+            if last and out is not None:
+                self._put(None, out, _DONE)
+
+    def run(self, source: Iterable):
+        threads = []
+        for index, stage in enumerate(self.stages):
+            stage.active = stage.workers
+            for n in range(stage.workers):
+                t = threading.Thread(target=self._worker, args=(index, stage),
+                                     name=f"{stage.name}-{n}", daemon=True)
+                threads.append(t)
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        try:
+            for item in source:
+                if not self._put(None, self.queues[0], item):
+                    break
+            self._put(None, self.queues[0], _DONE)
+            for t in threads:
+                while t.is_alive():
+                    t.join(timeout=0.2)
+        except KeyboardInterrupt:
+            # Loturile deja scrise rămân în DB; cel în curs se pierde
+            self.abort.set()
+            self.interrupted = True
+            print("\n  ✗ Întrerupt — se opresc etapele...", file=sys.stderr)
+            for t in threads:
+                t.join(timeout=5)
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    def report(self):
+        wall = self.seconds or 1e-9
+        print(f"\n{'═'*62}")
+        print(f"  ETAPE  ({self.seconds:.2f} s total)")
+        print(f"{'═'*62}")
+        print(f"  {'etapă':<10} {'thr':>3} {'intrări':>8} {'ieșiri':>7} {'lucru s':>8} "
+              f"{'util.':>6} {'blocat s':>9} {'erori':>6}")
+        for stage in self.stages:
+            util = stage.busy / (wall * stage.workers)
+            print(f"  {stage.name:<10} {stage.workers:>3} {stage.items_in:>8} {stage.items_out:>7} "
+                  f"{stage.busy:>8.2f} {util:>6.0%} {stage.blocked:>9.2f} {stage.errors:>6}")
+        print()
+
+
+def _label(item) -> str:
+    """Ce identifică elementul în mesajele de eroare: URL-ul sau numele rețetei."""
+    if isinstance(item, tuple):
+        item = item[0]
+    if isinstance(item, dict):
+        return item.get("name") or item.get("source_url") or "?"
+    return str(item)
+
+
+class _StageOutput(io.TextIOBase):
+    """
+    sys.stdout cât rulează pipeline-ul: mesajele thread-urilor din etapele `quiet`
+    (scraper-ul e foarte vorbăreț) se pierd, cu excepția --verbose.
+    """
+
+    def __init__(self, target, quiet_prefixes: tuple):
+        self.target = target
+        self.quiet_prefixes = quiet_prefixes
+
+    def write(self, s: str) -> int:
+        if not threading.current_thread().name.startswith(self.quiet_prefixes):
+            self.target.write(s)
+        return len(s)
+
+    def flush(self):
+        self.target.flush()
+
+
+# ──────────────────────────────────────────────────────────────
+# Etapele fluxului URL → DB
+# ──────────────────────────────────────────────────────────────
+
+def _new_scraper():
+    # Import leneș: scrape_recipes (bs4, requests, traducere) doar când pipeline-ul rulează
+    from scrape_recipes import RecipeScraper
+
+    scraper = RecipeScraper()
+    scraper.image_dir = IMAGE_DIR
+    return scraper
+
+
+def build_stages(args, grocery_items: dict, folded: FoldedIndex, tally: ImportTally,
+                 planners: list, timeline: dict) -> list[Stage]:
+    """Etapele fluxului; planner-ul etapei resolve ajunge în `planners` (pentru sumar)."""
+
+    def fetch(url, scraper):
+        return url, scraper.fetch_page(url)
+
+    def extract(page, scraper):
+        url, content = page
+        recipe = scraper.extract_page(url, content, translate=False)
+        if not recipe:
+            print(f"  ✗ [extract] {url}: nu s-a putut extrage rețeta", file=sys.stderr)
+        return recipe
+
+    def translate(recipe, scraper):
+        return scraper.translate_recipe(recipe)
+
+    def image(recipe, scraper):
+        scraper.attach_image(recipe)
+        return recipe
+
+    # ── normalize: formatul scraped, scris opțional și în fișierul de debug ──
+    def normalize_setup():
+        scraper = _new_scraper()
+        sink = open(args.output, "w", encoding="utf-8") if args.output else None
+        return {"scraper": scraper, "sink": sink, "first": True}
+
+    def normalize(recipe, state):
+        text = state["scraper"].convert_to_txt_format(recipe)
+        if state["sink"]:
+            # Același conținut ca scrape_recipes.py (rețete separate prin linie nouă)
+            state["sink"].write(text if state["first"] else "\n" + text)
+            state["sink"].flush()
+            state["first"] = False
+        parsed = list(iter_scraped_recipes(text.splitlines()))
+        return parsed[0] if parsed else None
+
+    def normalize_close(state):
+        if state["sink"]:
+            state["sink"].close()
+        return []
+
+    # ── resolve: decizia de import, pe conexiunile proprii ale thread-ului ──
+    def resolve_setup():
+        mapping_conn = connect_mapping_tables(args.db)
+        dedup_conn = sqlite3.connect(args.db, timeout=30)
+        dedup = NearDuplicateIndex(dedup_conn, args.near_threshold)
+        planner = ImportPlanner(args.db, grocery_items,
+                                NameMappings(mapping_conn) if mapping_conn else None, folded,
+                                dedup, force=args.force, verbose=args.verbose,
+                                skip_near_duplicates=args.skip_near_duplicates)
+        planners.append(planner)
+        return {"planner": planner, "conns": [c for c in (mapping_conn, dedup_conn) if c]}
+
+    def resolve(recipe, state):
+        plan = state["planner"].plan(recipe)
+        return (recipe, plan) if plan else None
+
+    def resolve_close(state):
+        for conn in state["conns"]:
+            conn.close()
+        return []
+
+    # ── insert: loturi mici, golite și când nu mai vine nimic ──
+    def insert_setup():
+        conn = sqlite3.connect(args.db, timeout=30)
+        tune_session(conn)
+        mapping_conn = connect_mapping_tables(args.db, readonly=False)
+        choices = load_choices(args.choices, mapping_conn)
+        writer = RecipeBatchWriter(conn, grocery_items, choices,
+                                   NameMappings(mapping_conn) if mapping_conn else None, folded,
+                                   batch_size=args.batch_size, verbose=args.verbose)
+        return {"writer": writer, "conns": [c for c in (conn, mapping_conn) if c]}
+
+    def record(results):
+        if results and "first_row" not in timeline:
+            timeline["first_row"] = time.perf_counter()
+        tally.record(results)
+        return results
+
+    def insert(planned, state):
+        recipe, (fingerprint, recipe_id, changed, signature) = planned
+        record(state["writer"].add(recipe, fingerprint, recipe_id, changed, signature))
+
+    def insert_idle(state):
+        record(state["writer"].flush())
+        return []
+
+    def insert_close(state):
+        try:
+            record(state["writer"].flush())
+        finally:
+            for conn in state["conns"]:
+                conn.close()
+        return []
+
+    return [
+        Stage("fetch", fetch, args.fetch_workers, setup=_new_scraper),
+        Stage("extract", extract, 1, setup=_new_scraper),
+        Stage("translate", translate, args.translate_workers, setup=_new_scraper),
+        Stage("image", image, args.fetch_workers, setup=_new_scraper),
+        Stage("normalize", normalize, 1, setup=normalize_setup, on_close=normalize_close),
+        Stage("resolve", resolve, 1, setup=resolve_setup, on_close=resolve_close, quiet=False),
+        Stage("insert", insert, 1, setup=insert_setup, on_idle=insert_idle,
+              on_close=insert_close, quiet=False),
+    ]
+
+
+def read_urls(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines
+            if line and not line.startswith('#') and line.startswith(('http://', 'https://'))]
+
+
+# ──────────────────────────────────────────────────────────────
+# Main
+# ──────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline concurent URL → DB (scrape + import)")
+    parser.add_argument("--input", "-i", default=DEFAULT_INPUT,
+                        help=f"Fișier cu URL-uri (default: {DEFAULT_INPUT})")
+    parser.add_argument("--output", "-o", nargs="?", const=DEFAULT_OUTPUT,
+                        help=f"Scrie și rețetele scraped (debug; fără cale: {DEFAULT_OUTPUT})")
+    parser.add_argument("--db", "-d", default="webapp/dev.db")
+    parser.add_argument("--choices", "-c", default=CHOICES_FILE,
+                        help=f"Unit choices (default: {CHOICES_FILE})")
+    parser.add_argument("--fetch-workers", type=int, default=8,
+                        help="Thread-uri pentru descărcarea paginilor și imaginilor (default: 8)")
+    parser.add_argument("--translate-workers", type=int, default=4,
+                        help="Thread-uri pentru traducere (default: 4)")
+    parser.add_argument("--queue-size", type=int, default=16,
+                        help="Capacitatea fiecărei cozi dintre etape (default: 16)")
+    parser.add_argument("--batch-size", type=int, default=20,
+                        help="Rețete per tranzacție la insert (default: 20)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rescrie în loc rețetele existente")
+    parser.add_argument("--skip-near-duplicates", action="store_true",
+                        help="Sare peste rețetele noi care seamănă cu una existentă")
+    parser.add_argument("--near-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similaritatea minimă pentru aproape-duplicate (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Afișează și mesajele scraper-ului din etapele de scrape")
+    args = parser.parse_args()
+
+    print(f"\n{'═'*62}")
+    print(f"  pipeline.py")
+    print(f"{'═'*62}")
+    print(f"  Input   : {args.input}")
+    if args.output:
+        print(f"  Output  : {args.output}  (debug)")
+    print(f"  DB      : {args.db}")
+    print()
+
+    if not os.path.isfile(args.input):
+        print(f"  ✗ '{args.input}' nu există.")
+        sys.exit(1)
+    if not os.path.isfile(args.db):
+        print(f"  ✗ DB-ul '{args.db}' nu există.")
+        sys.exit(1)
+    urls = read_urls(args.input)
+    if not urls:
+        print(f"  ✗ Nu s-au găsit URL-uri în '{args.input}'")
+        sys.exit(1)
+
+    grocery_items = load_grocery_items(args.db)
+    folded = FoldedIndex(grocery_items)
+    print(f"  {len(urls)} URL-uri, {len(grocery_items)} ingrediente în DB\n")
+
+    # Singleton-ul IngredientProcessor (și importurile scraper-ului) înainte de thread-uri
+    _new_scraper()
+
+    tally = ImportTally()
+    planners: list[ImportPlanner] = []
+    timeline: dict = {}
+    stages = build_stages(args, grocery_items, folded, tally, planners, timeline)
+    pipeline = Pipeline(stages, args.queue_size)
+
+    quiet = () if args.verbose else tuple(f"{s.name}-" for s in stages if s.quiet)
+    stdout = sys.stdout
+    sys.stdout = _StageOutput(stdout, quiet)
+    start = time.perf_counter()
+    try:
+        pipeline.run(urls)
+    finally:
+        sys.stdout = stdout
+
+    if planners:
+        parsed = next(s.items_out for s in stages if s.name == "normalize")
+        stats = tally.stats(parsed, planners[0], pipeline.seconds)
+        print_import_summary(stats, args.skip_near_duplicates)
+    pipeline.report()
+    if "first_row" in timeline:
+        print(f"  Prima rețetă în DB după {timeline['first_row'] - start:.2f} s "
+              f"(din {pipeline.seconds:.2f} s)\n")
+    if pipeline.interrupted:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+recipe_dedup.py — Detectare rețete aproape duplicate (MinHash + LSH, stocat în SQLite).
+
+existing_recipe_names prindea doar titluri identice; aceeași rețetă de pe două site-uri
+sau cu titlul tradus ajungea de două ori în DB. Acum fiecare rețetă are o semnătură
+MinHash peste:
+  - setul de ingrediente (numele grocery item, normalizate cu fold_key)
+  - cuvintele din titlu (fold_key, fără cuvinte scurte)
+
+Semnăturile (RecipeMinHash) și benzile LSH (RecipeMinHashBand, indexat pe
+(band, bucket)) stau în DB-ul derivat al dev.db (derived_store.py). O interogare citește doar rețetele care împart cel
+puțin o bandă cu semnătura căutată — timp sublinear față de numărul de rețete —
+iar similaritatea Jaccard e estimată apoi din semnături.
+
+Folosit de import_recipes.py (la inserare) și scrape_recipes.py (înainte de rezolvarea
+interactivă a ingredientelor). Rețetele existente fără semnătură sunt indexate automat
+la deschiderea indexului.
+
+Utilizare:
+  python scripts/recipe_dedup.py                 # perechile de aproape-duplicate din DB
+  python scripts/recipe_dedup.py --threshold 0.5
+"""
+
+import argparse
+import functools
+import hashlib
+import importlib.util
+import itertools
+import os
+import random
+import sqlite3
+import sys
+from array import array
+from typing import Iterable, Optional
+
+from derived_store import SCHEMA as DERIVED, attach as attach_derived
+from grocery_catalog import fold_key
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+NUM_PERM = 64
+BANDS = 16                      # 16 benzi × 4 rânduri → prag LSH ≈ 0.5
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.6
+BUCKET_CAP = 100                # candidați citiți per bucket la o interogare
+
+# Hash-uri multiply-shift pe 64 biți: h(x) = ((a·x + b) mod 2^64) >> 32, cu a impar.
+# Aceeași aritmetică (wrap-around uint64) în Python și numpy → semnături identice.
+_MASK64 = (1 << 64) - 1
+_rng = random.Random(0x5EED)    # parametri ficși — semnăturile stocate rămân comparabile
+_PERMS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+
+# numpy (opțional) se importă la prima semnătură, nu la importul modulului
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy_perms():
+    import numpy as np
+    return (np,
+            np.array([a for a, _ in _PERMS], dtype=np.uint64)[:, None],
+            np.array([b for _, b in _PERMS], dtype=np.uint64)[:, None])
+
+# În DB-ul derivat: fără FOREIGN KEY spre Recipe → interogările fac JOIN cu Recipe,
+# iar backfill() curăță semnăturile rețetelor șterse
+_SCHEMA = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {DERIVED}."RecipeMinHash" (
+      "recipeId"  TEXT NOT NULL PRIMARY KEY,
+      "name"      TEXT NOT NULL,
+      "signature" BLOB NOT NULL
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {DERIVED}."RecipeMinHashBand" (
+      "band"     INTEGER NOT NULL,
+      "bucket"   INTEGER NOT NULL,
+      "recipeId" TEXT NOT NULL,
+      PRIMARY KEY ("band", "bucket", "recipeId")
+    ) WITHOUT ROWID
+    """,
+    f'CREATE INDEX IF NOT EXISTS {DERIVED}."RecipeMinHashBand_recipeId_idx" '
+    'ON "RecipeMinHashBand"("recipeId")',
+]
+
+
+# ──────────────────────────────────────────────────────────────
+# Semnături
+# ──────────────────────────────────────────────────────────────
+
+def recipe_features(title: str, ingredient_names: Iterable[str]) -> set[str]:
+    """Setul comparat: ingredientele normalizate + cuvintele semnificative din titlu."""
+    features = {f"i:{fold_key(name)}" for name in ingredient_names if name and name.strip()}
+    features.update(f"t:{word}" for word in fold_key(title or "").split() if len(word) > 2)
+    return features
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(features: Iterable[str]) -> Optional[array]:
+    """Semnătura MinHash (NUM_PERM valori); None pentru un set gol."""
+    hashes = [_hash64(f) for f in set(features)]
+    if not hashes:
+        return None
+    if _NUMPY_AVAILABLE:
+        np, perm_a, perm_b = _numpy_perms()
+        values = (perm_a * np.array(hashes, dtype=np.uint64) + perm_b) >> np.uint64(32)
+        return array("Q", values.min(axis=1).tolist())
+    return array("Q", (min(((a * x + b) & _MASK64) >> 32 for x in hashes) for a, b in _PERMS))
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimarea Jaccard: fracția pozițiilor egale."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def _bands(signature: array) -> tuple[tuple[int, int], ...]:
+    return _bands_of(signature.tobytes())
+
+
+@functools.lru_cache(maxsize=4096)
+def _bands_of(raw: bytes) -> tuple[tuple[int, int], ...]:
+    # Aceeași semnătură e folosită la query, remember și write → benzile o singură dată
+    width = ROWS * 8
+    return tuple(
+        (band, int.from_bytes(hashlib.blake2b(raw[band * width:(band + 1) * width],
+                                              digest_size=8).digest(), "little", signed=True))
+        for band in range(BANDS))
+
+
+def _from_blob(blob: bytes) -> array:
+    signature = array("Q")
+    signature.frombytes(blob)
+    return signature
+
+
+def ensure_tables(conn: sqlite3.Connection):
+    """Atașează DB-ul derivat și creează tabelele indexului dacă lipsesc."""
+    if not attach_derived(conn):
+        raise sqlite3.OperationalError("DB-ul derivat (semnături MinHash) nu poate fi deschis")
+    for stmt in _SCHEMA:
+        conn.execute(stmt)
+
+
+def write_signatures(conn: sqlite3.Connection, entries: Iterable[tuple[str, str, array]]):
+    """
+    Salvează (recipeId, nume, semnătură) + benzile LSH; înlocuiește semnăturile vechi.
+    Rulează în tranzacția apelantului (ex: lotul din RecipeBatchWriter).
+    """
+    entries = list(entries)
+    conn.executemany(f'DELETE FROM {DERIVED}."RecipeMinHashBand" WHERE "recipeId" = ?',
+                     [(recipe_id,) for recipe_id, _, _ in entries])
+    conn.executemany(
+        f'INSERT OR REPLACE INTO {DERIVED}."RecipeMinHash" ("recipeId", name, signature) '
+        'VALUES (?, ?, ?)',
+        [(recipe_id, name, signature.tobytes()) for recipe_id, name, signature in entries])
+    conn.executemany(
+        f'INSERT OR IGNORE INTO {DERIVED}."RecipeMinHashBand" (band, bucket, "recipeId") '
+        'VALUES (?, ?, ?)',
+        [(band, bucket, recipe_id) for recipe_id, _, signature in entries
+         for band, bucket in _bands(signature)])
+
+
+# ──────────────────────────────────────────────────────────────
+# Index
+# ──────────────────────────────────────────────────────────────
+
+_QUERY_SQL = " UNION ALL ".join([f"""
+    SELECT * FROM (
+        SELECT m."recipeId", m.name, m.signature
+        FROM {DERIVED}."RecipeMinHashBand" b
+        JOIN {DERIVED}."RecipeMinHash" m ON m."recipeId" = b."recipeId"
+        JOIN "Recipe" r ON r.id = m."recipeId"
+        WHERE b.band = ? AND b.bucket = ?
+        LIMIT ?)"""] * BANDS)
+
+
+class NearDuplicateIndex:
+    """
+    Index LSH peste rețetele din DB, plus un strat în memorie pentru rețetele
+    văzute în rularea curentă (încă neimportate — ex: în scraper).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, threshold: float = DEFAULT_THRESHOLD,
+                 backfill: bool = True):
+        self.conn = conn
+        self.threshold = threshold
+        self._mem_buckets: dict[tuple[int, int], list[str]] = {}
+        self._mem_sigs: dict[str, tuple[str, array]] = {}
+        ensure_tables(conn)
+        if backfill:
+            self.backfill()
+
+    def backfill(self) -> int:
+        """
+        Indexează rețetele din DB care nu au încă semnătură și șterge semnăturile
+        rețetelor care nu mai există (ștergerile din webapp nu trec pe aici).
+        """
+        self.prune()
+        rows = self.conn.execute(
+            f"""
+            SELECT r.id, r.name, group_concat(g.name, char(31))
+            FROM "Recipe" r
+            LEFT JOIN "Ingredient" i ON i."recipeId" = r.id
+            LEFT JOIN "GroceryItem" g ON g.id = i."groceryItemId"
+            WHERE r.id NOT IN (SELECT "recipeId" FROM {DERIVED}."RecipeMinHash")
+            GROUP BY r.id
+            """).fetchall()
+        entries = []
+        for recipe_id, name, ingredients in rows:
+            signature = minhash(recipe_features(name, (ingredients or "").split("\x1f")))
+            if signature is not None:
+                entries.append((recipe_id, name, signature))
+        if entries:
+            self.write(entries)
+        return len(entries)
+
+    def prune(self) -> int:
+        """Șterge semnăturile + benzile rețetelor care nu mai sunt în Recipe."""
+        orphans = [(row[0],) for row in self.conn.execute(
+            f'SELECT "recipeId" FROM {DERIVED}."RecipeMinHash" '
+            'WHERE "recipeId" NOT IN (SELECT id FROM "Recipe")')]
+        if orphans:
+            own_txn = not self.conn.in_transaction
+            if own_txn:
+                self.conn.execute("BEGIN")
+            self.conn.executemany(f'DELETE FROM {DERIVED}."RecipeMinHashBand" WHERE "recipeId" = ?',
+                                  orphans)
+            self.conn.executemany(f'DELETE FROM {DERIVED}."RecipeMinHash" WHERE "recipeId" = ?',
+                                  orphans)
+            if own_txn:
+                self.conn.execute("COMMIT")
+        return len(orphans)
+
+    def write(self, entries: Iterable[tuple[str, str, array]]):
+        """Salvează (recipeId, nume, semnătură) într-o tranzacție proprie, dacă nu e una deschisă."""
+        own_txn = not self.conn.in_transaction
+        if own_txn:
+            self.conn.execute("BEGIN")
+        write_signatures(self.conn, entries)
+        if own_txn:
+            self.conn.execute("COMMIT")
+
+    def remember(self, ref: str, name: str, signature: array):
+        """Adaugă în stratul din memorie (rețete din rularea curentă)."""
+        self._mem_sigs[ref] = (name, signature)
+        for key in _bands(signature):
+            self._mem_buckets.setdefault(key, []).append(ref)
+
+    def query(self, signature: array, exclude: Optional[str] = None,
+              limit: Optional[int] = None) -> list[tuple[float, str, str]]:
+        """
+        Rețetele cu similaritate estimată >= threshold, ca (similaritate, ref, nume),
+        descrescător. ref = recipeId pentru DB, cheia dată la remember() pentru memorie.
+
+        Din fiecare bucket se citesc cel mult BUCKET_CAP candidați, ca o familie mare
+        de rețete aproape identice să nu facă interogarea liniară; toți candidații
+        citiți sunt evaluați, iar cu `limit` se returnează doar cele mai bune potriviri.
+        """
+        seen = {exclude}
+        matches = []
+        bands = _bands(signature)
+        mem = ((ref, *self._mem_sigs[ref]) for key in bands
+               for ref in self._mem_buckets.get(key, ())[-BUCKET_CAP:])
+        # O singură interogare pentru toate benzile (≤ BANDS × BUCKET_CAP rânduri)
+        rows = self.conn.execute(_QUERY_SQL, [v for key in bands for v in (*key, BUCKET_CAP)])
+        for ref, name, other in itertools.chain(mem, rows):
+            if ref in seen:
+                continue
+            seen.add(ref)
+            if isinstance(other, bytes):
+                other = _from_blob(other)
+            score = similarity(signature, other)
+            if score >= self.threshold:
+                matches.append((score, ref, name))
+        matches.sort(key=lambda m: (-m[0], m[2]))
+        return matches[:limit] if limit else matches
+
+
+def open_index(db_path: str, threshold: float = DEFAULT_THRESHOLD,
+               backfill: bool = True) -> Optional[NearDuplicateIndex]:
+    """Indexul din dev.db; None dacă DB-ul lipsește sau nu are tabela Recipe."""
+    if not db_path or not os.path.isfile(db_path):
+        return None
+    try:
+        conn = sqlite3.connect(db_path)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Recipe'").fetchone() is None:
+            conn.close()
+            return None
+        return NearDuplicateIndex(conn, threshold, backfill)
+    except sqlite3.Error as e:
+        print(f"  ⚠ Indexul de duplicate nu e disponibil: {e}", file=sys.stderr)
+        return None
+
+
+# ──────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Rețete aproape duplicate din dev.db")
+    parser.add_argument("--db", "-d", default=os.path.join(PROJECT_ROOT, "webapp", "dev.db"))
+    parser.add_argument("--threshold", "-t", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similaritate minimă (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    index = open_index(args.db, args.threshold)
+    if index is None:
+        print(f"✗ '{args.db}' nu există sau nu are tabela Recipe")
+        sys.exit(1)
+
+    print(f"\n{'═'*62}")
+    print(f"  Rețete aproape duplicate (prag {args.threshold:.0%})")
+    print(f"{'═'*62}")
+    pairs = 0
+    for recipe_id, name, blob in index.conn.execute(
+            f'SELECT "recipeId", name, signature FROM {DERIVED}."RecipeMinHash" ORDER BY name'):
+        for score, other_id, other_name in index.query(_from_blob(blob), exclude=recipe_id):
+            # Fiecare pereche o singură dată
+            if (name, recipe_id) < (other_name, other_id):
+                print(f"  {score:4.0%}  {name}  ≈  {other_name}")
+                pairs += 1
+    print(f"\n  {pairs} perechi găsite")
+    index.conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+recipes.py — Un singur CLI pentru fluxul de rețete, cu etapele înlănțuite în același proces.
+
+Aliasurile notion-* pornesc câte un proces Python per pas (scrape, normalize, import),
+fiecare reîncărcând catalogul, mappings și unit choices de pe disc și recitind
+fișierul scris de pasul anterior. Aici datele comune se încarcă o singură dată
+(Session), iar rețetele trec de la o etapă la alta în memorie:
+
+  scrape     →  rețete (dict-uri iter_scraped_recipes, fără fișier intermediar)
+  normalize  →  conflictele de unități rezolvate direct în UnitRule / choices
+  import     →  aceleași rețete, cu choices / grocery items deja încărcate
+
+La final se afișează timpul pe fiecare etapă.
+
+Utilizare:
+  python scripts/recipes.py run -m local                     # scrape + normalize + import
+  python scripts/recipes.py run -m url --stages scrape,import
+  python scripts/recipes.py run -m local -o data/local/scraped_local_recipes.txt
+  python scripts/recipes.py scrape -m url                    # doar scrape (scrie output-ul)
+  python scripts/recipes.py normalize -i data/local/scraped_local_recipes.txt
+  python scripts/recipes.py import -i data/urls/scraped_recipe_urls.txt --dry-run
+  python scripts/recipes.py steps data/urls/scraped_recipe_urls.txt
+  python scripts/recipes.py cleanup
+  python scripts/recipes.py mappings list
+  python scripts/recipes.py pipeline -i data/urls/recipe_urls.txt
+
+Fără etapa scrape, input-ul e un fișier scraped (default: output-ul modului ales).
+"""
+
+import argparse
+import os
+import runpy
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from grocery_catalog import FoldedIndex
+from import_recipes import (iter_scraped_recipes, load_choices, print_import_summary,
+                            run_import)
+from mapping_tables import NameMappings, connect as connect_mapping_tables
+from normalize_units import (CHOICES_FILE, collect_unit_conflicts,
+                             extract_ingredients_from_recipes, load_grocery_items,
+                             load_ingredient_mappings, print_conflict_count,
+                             print_normalize_summary, prompt_new_grocery_items,
+                             resolve_conflicts_interactive, write_conflict_report)
+from recipe_dedup import DEFAULT_THRESHOLD
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STAGES = ("scrape", "normalize", "import")
+
+# Mod → (output scraped implicit) — aceleași căi ca scrape_recipes.SCRAPE_MODES
+SCRAPED_FILES = {
+    "url":   "data/urls/scraped_recipe_urls.txt",
+    "local": "data/local/scraped_local_recipes.txt",
+}
+
+# Scripturi rulate ca atare (în același proces, cu argv-ul rămas)
+PASSTHROUGH = {
+    "steps":    ("add_recipe_steps.py", "Adaugă Steps în Notion (add_recipe_steps.py)"),
+    "cleanup":  ("cleanup_duplicate_ingredients.py", "Curăță ingredientele duplicate din Notion"),
+    "mappings": ("manage_mappings.py", "Gestionează ingredient_mappings.json"),
+    "pipeline": ("pipeline.py", "URL-uri → DB cu etape concurente (pipeline.py)"),
+    "jobs":     ("job_queue.py", "Coada de joburi scrape / import + worker (job_queue.py)"),
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# Stare comună
+# ──────────────────────────────────────────────────────────────
+
+class Session:
+    """
+    Datele folosite de mai multe etape, încărcate leneș și o singură dată:
+    conexiunea la tabelele de mapping, grocery items (+ FoldedIndex), name mappings,
+    unit choices și ingredient mappings. O singură instanță UnitChoices → deciziile
+    luate la normalize sunt văzute imediat de import; choices_path e și fișierul în
+    care se salvează deciziile.
+
+    Etapa scrape nu trece prin Session: RecipeScraper își ia catalogul din snapshot-ul
+    grocery_catalog (pentru același --db), iar rezolvarea numelor citește
+    ingredient_mappings.json prin MappingStore.
+    """
+
+    def __init__(self, db_path: str, choices_path: str = CHOICES_FILE):
+        self.db_path = db_path
+        self.choices_path = choices_path
+        self._mapping_conn: Optional[sqlite3.Connection] = None
+        self._mapping_conn_loaded = False
+        self._name_mappings: Optional[NameMappings] = None
+        self._choices = None
+        self._grocery_items: Optional[dict] = None
+        self._folded: Optional[FoldedIndex] = None
+        self._mappings: Optional[dict] = None
+
+    @property
+    def mapping_conn(self) -> Optional[sqlite3.Connection]:
+        if not self._mapping_conn_loaded:
+            self._mapping_conn = connect_mapping_tables(self.db_path, readonly=False)
+            self._mapping_conn_loaded = True
+        return self._mapping_conn
+
+    @property
+    def name_mappings(self) -> Optional[NameMappings]:
+        if self._name_mappings is None and self.mapping_conn is not None:
+            self._name_mappings = NameMappings(self.mapping_conn)
+        return self._name_mappings
+
+    @property
+    def choices(self):
+        if self._choices is None:
+            self._choices = load_choices(self.choices_path, self.mapping_conn)
+        return self._choices
+
+    @property
+    def grocery_items(self) -> dict:
+        # Superset: id (pentru import) + unit / unit2 / conversion (pentru normalize)
+        if self._grocery_items is None:
+            self._grocery_items = load_grocery_items(self.db_path)
+        return self._grocery_items
+
+    @property
+    def folded(self) -> FoldedIndex:
+        if self._folded is None:
+            self._folded = FoldedIndex(self.grocery_items)
+        return self._folded
+
+    @property
+    def mappings(self) -> dict:
+        if self._mappings is None:
+            self._mappings = load_ingredient_mappings(db_path=self.db_path, conn=self.mapping_conn)
+        return self._mappings
+
+    def reload_catalog(self):
+        """După ce normalize a creat GroceryItem-uri noi."""
+        self._grocery_items = self._folded = self._mappings = None
+
+    def warm(self, stages):
+        """Încarcă de la început tot ce vor folosi etapele alese."""
+        if "normalize" in stages or "import" in stages:
+            self.grocery_items
+            self.choices
+        if "normalize" in stages:
+            self.mappings
+        if "import" in stages:
+            self.folded
+            self.name_mappings
+
+    def close(self):
+        # Choices sunt salvate de normalize după fiecare decizie; aici doar conexiunea
+        if self._mapping_conn is not None:
+            self._mapping_conn.close()
+
+
+class StageTimer:
+    """Timpul pe etape, afișat la final."""
+
+    def __init__(self):
+        self.timings: list[tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def report(self):
+        if not self.timings:
+            return
+        total = sum(seconds for _, seconds in self.timings)
+        print(f"\n{'═'*62}")
+        print(f"  TIMP PE ETAPE")
+        print(f"{'═'*62}")
+        for name, seconds in self.timings:
+            share = seconds / total if total else 0.0
+            print(f"  {name:<16}: {seconds:8.2f} s  ({share:4.0%})")
+        print(f"  {'Total':<16}: {total:8.2f} s")
+        print()
+
+
+# ──────────────────────────────────────────────────────────────
+# Etape
+# ──────────────────────────────────────────────────────────────
+
+def stage_scrape(args) -> Optional[list]:
+    """Scrape / parsare locală → rețete în formatul importerului, în memorie."""
+    # Import leneș: scrape_recipes e cel mai greu modul și nu e necesar pentru normalize/import
+    from scrape_recipes import recipes_to_txt, scrape_recipes
+
+    result = scrape_recipes(f"-{args.mode}", args.input, args.skip_near_duplicates, args.jobs,
+                            db_path=args.db)
+    if result is None:
+        return None
+    scraper, scraped = result
+    if not scraped:
+        print(f"\n✗ Nu s-au putut extrage rețete")
+        return None
+
+    # Formatul txt rămâne reprezentarea canonică între scraper și importer; aici nu mai
+    # trece prin disc (fișierul se scrie doar la cerere sau când scrape e ultima etapă)
+    text = recipes_to_txt(scraper, scraped)
+    output = args.output or (SCRAPED_FILES[args.mode] if args.stages == ["scrape"] else None)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"  ✓ {len(scraped)} rețete salvate în '{output}'")
+    return list(iter_scraped_recipes(text.splitlines()))
+
+
+def stage_normalize(session: Session, recipes: list, args) -> bool:
+    """Conflictele de unități, rezolvate în choices-ul sesiunii. False → opriți lanțul."""
+    ingredients = extract_ingredients_from_recipes(recipes)
+    print(f"  {len(ingredients)} linii de ingrediente din {len(recipes)} rețete\n")
+    conflicts = collect_unit_conflicts(ingredients, session.grocery_items, session.mappings,
+                                       args.threshold)
+    print_conflict_count(conflicts)
+    if conflicts:
+        if args.report:
+            # Raport fără interacțiune: etapele următoare nu rulează (conflicte nerezolvate)
+            write_conflict_report(conflicts, args.report)
+            return False
+        resolved, new_ingredients = resolve_conflicts_interactive(
+            conflicts, session.choices, args.db, session.grocery_items, session.choices_path)
+        print_normalize_summary(conflicts, resolved, new_ingredients)
+    if prompt_new_grocery_items(args.db):
+        session.reload_catalog()
+    return True
+
+
+def stage_import(session: Session, recipes, args) -> dict:
+    return run_import(recipes, args.db, session.grocery_items, session.choices,
+                      session.name_mappings, session.folded,
+                      dry_run=args.dry_run, force=args.force, verbose=args.verbose,
+                      batch_size=args.batch_size,
+                      skip_near_duplicates=args.skip_near_duplicates,
+                      near_threshold=args.near_threshold)
+
+
+def run_stages(args) -> int:
+    stages = args.stages
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown or not stages:
+        print(f"  ✗ Etape necunoscute: {', '.join(unknown) or '(niciuna)'} "
+              f"(disponibile: {', '.join(STAGES)})")
+        return 2
+    # Ordinea e fixă, indiferent de ordinea din --stages
+    stages = args.stages = [s for s in STAGES if s in stages]
+    input_path = args.input or (None if "scrape" in stages else SCRAPED_FILES[args.mode])
+
+    print(f"\n{'═'*62}")
+    print(f"  recipes.py  —  {' → '.join(stages)}")
+    print(f"{'═'*62}")
+    print(f"  Mod     : {args.mode}")
+    if input_path:
+        print(f"  Input   : {input_path}")
+    print(f"  DB      : {args.db}")
+    if args.dry_run and "import" in stages:
+        print(f"  Mode    : DRY RUN")
+    print()
+
+    if "scrape" not in stages and not os.path.isfile(input_path):
+        print(f"  ✗ '{input_path}' nu există.")
+        return 1
+
+    timer = StageTimer()
+    session = Session(args.db, args.choices)
+    try:
+        if stages != ["scrape"]:
+            with timer.stage("date comune"):
+                session.warm(stages)
+            print(f"  {len(session.grocery_items)} ingrediente în DB")
+            print(f"  {len(session.choices)} unit choices\n")
+
+        recipes = None
+        if "scrape" in stages:
+            with timer.stage("scrape"):
+                recipes = stage_scrape(args)
+            if recipes is None:
+                return 1
+        elif "normalize" in stages:
+            # Normalize + import pe aceeași listă: fișierul e citit o singură dată
+            with timer.stage("citire"):
+                with open(input_path, encoding="utf-8") as f:
+                    recipes = list(iter_scraped_recipes(f))
+
+        if "normalize" in stages:
+            print(f"\n{'─'*62}\n  normalize\n{'─'*62}")
+            with timer.stage("normalize"):
+                proceed = stage_normalize(session, recipes, args)
+            if not proceed:
+                return 0
+
+        if "import" in stages:
+            print(f"\n{'─'*62}\n  import\n{'─'*62}")
+            with timer.stage("import"):
+                if recipes is not None:
+                    stats = stage_import(session, recipes, args)
+                else:
+                    # Doar import: streaming direct din fișier, ca import_recipes.py
+                    with open(input_path, encoding="utf-8") as f:
+                        stats = stage_import(session, iter_scraped_recipes(f), args)
+            print_import_summary(stats, args.skip_near_duplicates)
+    finally:
+        session.close()
+        timer.report()
+    return 0
+
+
+def run_passthrough(script: str, argv: list) -> int:
+    """Rulează un script existent ca __main__, cu argv-ul rămas."""
+    path = os.path.join(SCRIPT_DIR, script)
+    saved = sys.argv
+    sys.argv = [path, *argv]
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        sys.argv = saved
+    return 0
+
+
+# ──────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────
+
+def _stage_options() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--mode", "-m", choices=sorted(SCRAPED_FILES), default="local",
+                        help="Sursa: url (data/urls) sau local (data/local) (default: local)")
+    common.add_argument("--input", "-i",
+                        help="Cu scrape: fișierul de URL-uri / text; altfel: fișierul scraped")
+    common.add_argument("--output", "-o",
+                        help="Scrie și rețetele scraped în acest fișier (debug / compatibilitate)")
+    common.add_argument("--db", "-d", default="webapp/dev.db")
+    common.add_argument("--choices", "-c", default=CHOICES_FILE,
+                        help=f"Unit choices comune pentru normalize și import (default: {CHOICES_FILE})")
+    common.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Scrape -m local: parsează blocurile pe N procese")
+    common.add_argument("--threshold", "-t", type=float, default=0.80,
+                        help="Normalize: prag similaritate fuzzy (default: 0.80)")
+    common.add_argument("--report", "-r", metavar="OUTPUT.json",
+                        help="Normalize: exportă conflictele în JSON și oprește lanțul")
+    common.add_argument("--dry-run", action="store_true", help="Import: simulează fără a scrie în DB")
+    common.add_argument("--force", action="store_true", help="Import: rescrie rețetele existente")
+    common.add_argument("--verbose", "-v", action="store_true")
+    common.add_argument("--batch-size", type=int, default=500,
+                        help="Import: rețete per tranzacție (default: 500)")
+    common.add_argument("--skip-near-duplicates", action="store_true",
+                        help="Scrape / import: sare peste rețetele aproape duplicate")
+    common.add_argument("--near-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Import: similaritatea minimă pentru aproape-duplicate (default: {DEFAULT_THRESHOLD})")
+    return common
+
+
+def main():
+    # Scripturile existente primesc argv-ul neatins (inclusiv opțiuni ca --help)
+    if len(sys.argv) > 1 and sys.argv[1] in PASSTHROUGH:
+        sys.exit(run_passthrough(PASSTHROUGH[sys.argv[1]][0], sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="Fluxul de rețete: scrape → normalize → import")
+    sub = parser.add_subparsers(dest="command", required=True)
+    common = _stage_options()
+
+    p = sub.add_parser("run", parents=[common], help="Rulează etapele înlănțuit (default: toate)")
+    p.add_argument("--stages", default=",".join(STAGES),
+                   type=lambda v: [s.strip() for s in v.split(",") if s.strip()],
+                   help=f"Etape separate prin virgulă (default: {','.join(STAGES)})")
+    for stage in STAGES:
+        p = sub.add_parser(stage, parents=[common], help=f"Doar etapa {stage}")
+        p.set_defaults(stages=[stage])
+    for name, (_, help_text) in PASSTHROUGH.items():
+        sub.add_parser(name, help=help_text)  # doar pentru --help; rulate mai sus
+
+    args = parser.parse_args()
+    sys.exit(run_stages(args))
+
+
+if __name__ == "__main__":
+    main()
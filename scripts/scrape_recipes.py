@@ -9,30 +9,49 @@ Suportă:
 - Traducere automată din română în engleză
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import re
 import sqlite3
 from difflib import SequenceMatcher
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from fractions import Fraction
 import sys
 import os
-from urllib.parse import urlparse
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 import hashlib
+import importlib.util
+import io
+from contextlib import redirect_stdout
+from grocery_catalog import FoldedIndex
 from ingredient_processor import get_ingredient_processor
-from deep_translator import GoogleTranslator
+from mapping_store import OBS, MappingStore
+from recipe_dedup import minhash, open_index, recipe_features
+
+# requests / bs4 / deep_translator se importă la prima folosire: modurile care nu
+# fac scraping web (ex: -local, parse-text) nu plătesc importul lor la pornire
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 
 class RecipeScraper:
-    def __init__(self):
+    def __init__(self, db_path: str = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
-        self.ingredient_processor = get_ingredient_processor(use_notion=True)
-        self.translator = GoogleTranslator(source='ro', target='en')
+        # Catalogul de grocery items al DB-ului în care se importă (None: webapp/dev.db)
+        self.db_path = db_path
+        self.ingredient_processor = get_ingredient_processor(use_notion=True, db_path=db_path)
+        self._translator = None
         self.image_dir = 'img'  # Default, poate fi suprascris
+
+    @property
+    def translator(self):
+        """GoogleTranslator creat la prima traducere."""
+        if self._translator is None:
+            from deep_translator import GoogleTranslator
+            self._translator = GoogleTranslator(source='ro', target='en')
+        return self._translator
     
     def _translate_text(self, text: str) -> str:
         """Traduce text din română în engleză"""
@@ -152,7 +171,15 @@ class RecipeScraper:
             print(f"  ✗ Eroare la citire fișier: {e}")
             return None
         
-        lines = [l.strip() for l in content.split('\n')]
+        return self.parse_local_text(content)
+
+    def parse_local_text(self, text) -> Optional[Dict]:
+        """
+        Parsează o rețetă text direct din memorie — string sau iterabil de linii
+        (ex: un bloc din fișierul -local sau textul primit de web_import_handler).
+        """
+        raw_lines = text.split('\n') if isinstance(text, str) else text
+        lines = [l.strip() for l in raw_lines]
         
         # Prima linie non-goală = titlu
         title = None
@@ -406,36 +433,9 @@ class RecipeScraper:
             print(f"Procesez: {url_or_file}")
             print(f"{'='*60}\n")
             
-            response = requests.get(url_or_file, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Încearcă mai întâi să găsească JSON-LD cu schema.org Recipe
-            recipe = self._extract_from_jsonld(soup)
-            
-            if not recipe:
-                # Fallback la parsare HTML generică
-                print("  ⚠ Nu s-a găsit JSON-LD, încerc parsare HTML generică...")
-                recipe = self._extract_from_html(soup)
-            
+            recipe = self.extract_page(url_or_file, self.fetch_page(url_or_file))
             if recipe:
-                recipe['source_url'] = url_or_file
-                
-                # Normalizează toate unitățile în toate ingredientele
-                if 'ingredient_groups' in recipe:
-                    for group in recipe['ingredient_groups']:
-                        if 'items' in group:
-                            group['items'] = [self._normalize_units_in_text(item) for item in group['items']]
-                if 'ingredients' in recipe:
-                    recipe['ingredients'] = [self._normalize_units_in_text(item) for item in recipe['ingredients']]
-                
-                # Descarcă imaginea local dacă există URL
-                if recipe.get('image_url'):
-                    local_path = self._download_image(recipe['image_url'], recipe['name'])
-                    if local_path:
-                        recipe['image_path'] = local_path
-                
+                self.attach_image(recipe)
                 return recipe
             
             print("  ✗ Nu s-a putut extrage rețeta")
@@ -444,8 +444,74 @@ class RecipeScraper:
         except Exception as e:
             print(f"  ✗ Eroare la procesarea URL-ului: {e}")
             return None
+
+    # Pașii lui scrape_recipe, separați pentru pipeline.py (etape concurente):
+    # fetch_page → extract_page(translate=False) → translate_recipe → attach_image
+
+    def fetch_page(self, url: str) -> bytes:
+        """Descarcă pagina; ridică excepție la eroare HTTP / rețea."""
+        import requests
+
+        response = requests.get(url, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        return response.content
+
+    def extract_page(self, url: str, content: bytes, translate: bool = True) -> Optional[Dict]:
+        """
+        JSON-LD (sau HTML generic) → rețetă. Cu translate=False, ingredientele din
+        JSON-LD rămân netraduse până la translate_recipe().
+        """
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'lxml')
+        
+        # Încearcă mai întâi să găsească JSON-LD cu schema.org Recipe
+        recipe = self._extract_from_jsonld(soup, translate)
+        
+        if not recipe:
+            # Fallback la parsare HTML generică
+            print("  ⚠ Nu s-a găsit JSON-LD, încerc parsare HTML generică...")
+            recipe = self._extract_from_html(soup)
+        
+        if recipe:
+            recipe['source_url'] = url
+            if not recipe.get('_untranslated'):
+                self._normalize_recipe_units(recipe)
+        return recipe
+
+    def translate_recipe(self, recipe: Dict) -> Dict:
+        """Traduce ingredientele amânate de extract_page(translate=False)."""
+        if not recipe.pop('_untranslated', False):
+            return recipe
+        # Traduce doar numele ingredientului, păstrează unitățile în engleză
+        for group in recipe['ingredient_groups']:
+            group['items'] = [self._translate_ingredient_line(item) for item in group['items']]
+        # Normalizează unitățile și refă lista plată
+        for group in recipe['ingredient_groups']:
+            group['items'] = [self._normalize_units_in_text(item) for item in group['items']]
+        recipe['ingredients'] = []
+        for group in recipe['ingredient_groups']:
+            recipe['ingredients'].extend(group['items'])
+        self._normalize_recipe_units(recipe)
+        return recipe
+
+    def attach_image(self, recipe: Dict):
+        """Descarcă imaginea local dacă există URL."""
+        if recipe.get('image_url'):
+            local_path = self._download_image(recipe['image_url'], recipe['name'])
+            if local_path:
+                recipe['image_path'] = local_path
+
+    def _normalize_recipe_units(self, recipe: Dict):
+        """Normalizează toate unitățile în toate ingredientele."""
+        if 'ingredient_groups' in recipe:
+            for group in recipe['ingredient_groups']:
+                if 'items' in group:
+                    group['items'] = [self._normalize_units_in_text(item) for item in group['items']]
+        if 'ingredients' in recipe:
+            recipe['ingredients'] = [self._normalize_units_in_text(item) for item in recipe['ingredients']]
     
-    def _extract_from_jsonld(self, soup: BeautifulSoup) -> Optional[Dict]:
+    def _extract_from_jsonld(self, soup: 'BeautifulSoup', translate: bool = True) -> Optional[Dict]:
         """Extrage rețeta din JSON-LD (schema.org/Recipe)"""
         # Caută toate script-urile de tip application/ld+json
         scripts = soup.find_all('script', type='application/ld+json')
@@ -458,9 +524,9 @@ class RecipeScraper:
                 if isinstance(data, list):
                     for item in data:
                         if self._is_recipe_schema(item):
-                            return self._parse_recipe_schema(item, soup)
+                            return self._parse_recipe_schema(item, soup, translate)
                 elif self._is_recipe_schema(data):
-                    return self._parse_recipe_schema(data, soup)
+                    return self._parse_recipe_schema(data, soup, translate)
                     
             except json.JSONDecodeError:
                 continue
@@ -477,7 +543,8 @@ class RecipeScraper:
             return 'Recipe' in schema_type
         return schema_type == 'Recipe'
     
-    def _parse_recipe_schema(self, data: Dict, soup: BeautifulSoup = None) -> Dict:
+    def _parse_recipe_schema(self, data: Dict, soup: 'BeautifulSoup' = None,
+                             translate: bool = True) -> Dict:
         """Parsează datele din schema.org Recipe"""
         print("  ✓ Găsit JSON-LD Recipe schema")
         
@@ -517,22 +584,12 @@ class RecipeScraper:
         # Nu traduce titlul - păstrează-l în limba originală
         # recipe['name'] = self._translate_text(recipe['name'])
         
-        # Traduce DOAR ingredientele din fiecare grup (pentru matching cu Notion)
-        for group in recipe['ingredient_groups']:
-            # Nu traduce numele grupului - păstrează-l în limba originală
-            # if group['name']:
-            #     group['name'] = self._translate_text(group['name'])
-            # Traduce doar numele ingredientului, păstrează unitățile în engleză
-            group['items'] = [self._translate_ingredient_line(item) for item in group['items']]
-        
-        # Normalizează toate unitățile în ingrediente (pentru cazurile când vin direct din HTML fără traducere)
-        for group in recipe['ingredient_groups']:
-            group['items'] = [self._normalize_units_in_text(item) for item in group['items']]
-        
-        # Actualizează lista plată de ingrediente
-        recipe['ingredients'] = []
-        for group in recipe['ingredient_groups']:
-            recipe['ingredients'].extend(group['items'])
+        # Traduce DOAR ingredientele din fiecare grup (pentru matching cu Notion).
+        # Nu traduce numele grupului - păstrează-l în limba originală.
+        # translate=False: traducerea (apeluri de rețea) rămâne pentru translate_recipe()
+        recipe['_untranslated'] = True
+        if translate:
+            self.translate_recipe(recipe)
         
         # NU traduce instrucțiunile - păstrează-le în limba originală
         # Instrucțiunile rămân așa cum sunt din JSON-LD
@@ -603,6 +660,7 @@ class RecipeScraper:
             
             # Descarcă imaginea
             print(f"  📥 Descarc imaginea...")
+            import requests
             response = requests.get(image_url, headers=self.headers, timeout=10, stream=True)
             response.raise_for_status()
             
@@ -811,7 +869,7 @@ class RecipeScraper:
         
         return steps
     
-    def _extract_from_html(self, soup: BeautifulSoup) -> Optional[Dict]:
+    def _extract_from_html(self, soup: 'BeautifulSoup') -> Optional[Dict]:
         """Parsare HTML generică când nu există JSON-LD"""
         # Încearcă să găsească titlul
         title = None
@@ -1779,37 +1837,6 @@ def _load_scraper_db_items(db_path: str) -> dict:
     return result
 
 
-def _load_scraper_mappings(path: str) -> tuple[dict, dict]:
-    """Încarcă grocery_mappings și obs_mappings din ingredient_mappings.json."""
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data.get('grocery_mappings', {}), data.get('obs_mappings', {})
-    except FileNotFoundError:
-        return {}, {}
-    except Exception as e:
-        print(f"  ⚠ Eroare la încărcarea mappings: {e}")
-        return {}, {}
-
-
-def _save_scraper_mappings(path: str, grocery_mappings: dict, obs_mappings: dict = None):
-    """Actualizează grocery_mappings (și obs_mappings) în fișierul JSON."""
-    try:
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = {'grocery_mappings': {}, 'unit_conversions': {'custom_rules': []}, 'auto_create': {}}
-        data['grocery_mappings'] = grocery_mappings
-        if obs_mappings is not None:
-            data['obs_mappings'] = obs_mappings
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"  ⚠ Eroare la salvarea mappings: {e}")
-
-
-
 def _fuzzy_score(a: str, b: str) -> float:
     """Calculează scorul de similaritate între două șiruri."""
     ratio = SequenceMatcher(None, a, b).ratio()
@@ -1830,10 +1857,198 @@ def _find_top_db_matches(name: str, db_items: dict, n: int = 5) -> list:
     return scores[:n]
 
 
+# numpy se importă la primul _DbMatchRanker (doar rezolvarea interactivă îl folosește)
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+_np = None
+
+
+def _load_numpy():
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+
+class _DbMatchRanker:
+    """
+    Top N potriviri din db_items, cu același rezultat ca _find_top_db_matches.
+
+    Precalculează o dată pentru tot catalogul:
+      - trigramele distincte ale fiecărei chei (listă de postări trigramă → chei)
+      - numărul de caractere per cheie (matrice chei × alfabet)
+    Pentru un nume, un singur bincount peste postări dă suprapunerea de trigrame
+    cu toate cheile: de aici ies candidații de tip substring (scor ≥ 0.75) și un
+    shortlist după cosinus. Restul cheilor sunt evaluate exact (_fuzzy_score) doar
+    dacă limita superioară vectorizată a lui ratio() (caractere comune) poate
+    intra în top N.
+
+    Rezultatele sunt memorate per nume — verificarea "known?" și promptul
+    folosesc același calcul. Fără numpy, cade pe scanarea completă.
+    """
+
+    SHORTLIST = 32
+
+    def __init__(self, db_items: dict):
+        self.db_items = db_items
+        self.keys = list(db_items)
+        self.displays = list(db_items.values())
+        self._cache: dict = {}
+        self._vectorized = _NUMPY_AVAILABLE and bool(self.keys)
+        if not self._vectorized:
+            return
+        _load_numpy()
+
+        alphabet = sorted(set(''.join(self.keys)))
+        self._char_index = {ch: i for i, ch in enumerate(alphabet)}
+        self._char_counts = _np.zeros((len(self.keys), len(alphabet)), dtype=_np.int32)
+        self._lengths = _np.array([len(k) for k in self.keys], dtype=_np.float64)
+
+        postings: dict[str, list[int]] = {}
+        gram_counts = []
+        self._short = []  # chei < 3 caractere (fără trigrame)
+        for pos, key in enumerate(self.keys):
+            for ch in key:
+                self._char_counts[pos, self._char_index[ch]] += 1
+            grams = {key[i:i + 3] for i in range(len(key) - 2)}
+            gram_counts.append(len(grams))
+            if not grams:
+                self._short.append(pos)
+            for gram in grams:
+                postings.setdefault(gram, []).append(pos)
+        self._postings = {g: _np.array(p, dtype=_np.int64) for g, p in postings.items()}
+        self._gram_counts = _np.array(gram_counts, dtype=_np.int64)
+        # SequenceMatcher indexează b (cheia) la construcție — o singură dată per cheie
+        self._matchers = [SequenceMatcher(None, '', key) for key in self.keys]
+
+    def top(self, name: str, n: int = 5) -> list:
+        cache_key = (name, n)
+        if cache_key not in self._cache:
+            if self._vectorized:
+                self._cache[cache_key] = self._top_vectorized(name.lower(), n)
+            else:
+                self._cache[cache_key] = _find_top_db_matches(name, self.db_items, n)
+        return self._cache[cache_key]
+
+    def _top_vectorized(self, name: str, n: int) -> list:
+        keys = self.keys
+        total_keys = len(keys)
+        scores: dict[int, float] = {}
+
+        def evaluate(pos: int):
+            if pos not in scores:
+                # Ca _fuzzy_score, dar cu matcher-ul precalculat al cheii (b fix)
+                matcher = self._matchers[pos]
+                matcher.set_seq1(name)
+                ratio = matcher.ratio()
+                key = keys[pos]
+                scores[pos] = max(ratio, 0.75) if (name in key or key in name) else ratio
+
+        # Suprapunerea de trigrame cu toate cheile, într-un singur bincount
+        grams = {name[i:i + 3] for i in range(len(name) - 2)}
+        hit_lists = [self._postings[g] for g in grams if g in self._postings]
+        if hit_lists:
+            overlap = _np.bincount(_np.concatenate(hit_lists), minlength=total_keys)
+        else:
+            overlap = _np.zeros(total_keys, dtype=_np.int64)
+
+        # Substring (key în nume / nume în key): toate trigramele uneia apar în cealaltă
+        contained = (overlap == self._gram_counts) & (self._gram_counts > 0)
+        if grams:
+            contained |= overlap == len(grams)
+        else:
+            contained[:] = True  # nume < 3 caractere — verificare directă
+        for pos in self._short:
+            contained[pos] = True
+        for pos in _np.flatnonzero(contained):
+            if keys[pos] in name or name in keys[pos]:
+                evaluate(int(pos))
+
+        # Shortlist după cosinusul vectorilor binari de trigrame
+        if grams:
+            cosine = overlap / _np.sqrt(_np.maximum(self._gram_counts, 1) * len(grams))
+            k = min(self.SHORTLIST, total_keys)
+            for pos in _np.argpartition(-cosine, k - 1)[:k]:
+                if cosine[pos] > 0:
+                    evaluate(int(pos))
+
+        # Limita superioară a lui ratio(): 2 * caractere comune / lungimea totală
+        query = _np.zeros(self._char_counts.shape[1], dtype=_np.int32)
+        for ch in name:
+            idx = self._char_index.get(ch)
+            if idx is not None:
+                query[idx] += 1
+        total = len(name) + self._lengths
+        common = _np.minimum(self._char_counts, query).sum(axis=1)
+        bound = _np.divide(2.0 * common, total, out=_np.ones_like(total), where=total > 0)
+
+        def floor() -> float:
+            ranked = sorted((s for s in scores.values() if s > 0.4), reverse=True)
+            return ranked[n - 1] if len(ranked) >= n else 0.4
+
+        for pos in _np.argsort(-bound, kind='stable'):
+            b = bound[pos]
+            current = floor()
+            # Doar scoruri > 0.4 contează; la egalitate cu al N-lea poate câștiga ordinea din dict
+            if b <= 0.4 or b < current:
+                break
+            evaluate(int(pos))
+
+        ranked = sorted((pos for pos, s in scores.items() if s > 0.4), key=lambda p: (-scores[p], p))
+        return [(scores[pos], self.displays[pos]) for pos in ranked[:n]]
+
+
+def _flag_near_duplicates(recipes: list, db_path: str, mappings_path: str, skip: bool = False) -> list:
+    """
+    Marchează (sau elimină, cu skip=True) rețetele aproape duplicate față de DB
+    și față de rețetele deja văzute în rularea curentă — înainte de rezolvarea
+    interactivă, ca să nu se pună întrebări pentru rețete care vor fi ignorate.
+    """
+    index = open_index(db_path)
+    if index is None:
+        return recipes
+    grocery_mappings = MappingStore(mappings_path).grocery_mappings
+    bracket_re = re.compile(r'^\[[^\]]*\]\s*')
+    kept = []
+    try:
+        for num, recipe in enumerate(recipes):
+            # Numele de bază, mapat ca în DB dacă există deja o decizie
+            names = []
+            for group in recipe.get('ingredient_groups', []):
+                for item in group.get('items', []):
+                    base = bracket_re.sub('', item.strip()).split(',')[0].strip().lower()
+                    names.append(grocery_mappings.get(base) or base)
+            signature = minhash(recipe_features(recipe.get('name', ''), names))
+            if signature is None:
+                kept.append(recipe)
+                continue
+            matches = index.query(signature, limit=1)
+            if matches:
+                score, _, other = matches[0]
+                action = "ignorată" if skip else "păstrată"
+                print(f"  ≈  '{recipe.get('name', '?')}' seamănă {score:.0%} cu '{other}' ({action})")
+                if skip:
+                    continue
+            index.remember(f"run:{num}", recipe.get('name', '?'), signature)
+            kept.append(recipe)
+    finally:
+        index.conn.close()
+    return kept
+
+
 def _resolve_ingredient_names_interactive(recipes: list, db_path: str, mappings_path: str) -> list:
-    """Rezolvă interactiv numele de ingrediente necunoscute față de DB, rețetă cu rețetă."""
+    """
+    Rezolvă numele de ingrediente necunoscute față de DB, în loturi:
+      1. extrage numele de bază din toate rețetele și le deduplică
+      2. rezolvă automat tot ce e deja mapat / exact în DB / potrivire >= 92%
+      3. întreabă o singură dată per nume rămas, în ordinea frecvenței
+      4. aplică deciziile pe toate rețetele într-o singură trecere
+    """
     db_items = _load_scraper_db_items(db_path)
-    grocery_mappings, obs_mappings = _load_scraper_mappings(mappings_path)
+    folded = FoldedIndex(db_items)
+    ranker = _DbMatchRanker(db_items)
+    store = MappingStore(mappings_path)
+    grocery_mappings = store.grocery_mappings
 
     _bracket_re2 = re.compile(r'^\[([^\]]*)\]\s*', re.IGNORECASE)
     _qty_unit_re = re.compile(
@@ -1848,31 +2063,59 @@ def _resolve_ingredient_names_interactive(recipes: list, db_path: str, mappings_
         s = re.sub(r'\(.*?\)', '', s).strip()
         return s.lower()
 
-    def _resolve_name(name: str, recipe_title: str, item_str: str) -> str | None:
-        """Returnează canonical name sau None (sare peste). Folosește cache grocery_mappings."""
-        # Deja mapat
-        if name in grocery_mappings:
-            return grocery_mappings[name]
+    # ── 1. Extrage + deduplică ────────────────────────────────
+    # base → [(recipe_title, item_str), ...] în ordinea apariției
+    occurrences: dict[str, list] = {}
+    for recipe in recipes:
+        recipe_title = recipe.get('name', '?')
+        for group in recipe.get('ingredient_groups', []):
+            for item in group.get('items', []):
+                base = _extract_base_name(item)
+                if base:
+                    occurrences.setdefault(base, []).append((recipe_title, item))
 
-        # Potrivire exactă în DB (case-insensitive)
-        if name in db_items:
-            return db_items[name]
+    # ── 2. Rezolvare automată în bloc ─────────────────────────
+    decisions: dict[str, str | None] = {}
+    unknown: list[str] = []
+    auto_resolved = 0
+    for base in occurrences:
+        if base in grocery_mappings:
+            decisions[base] = grocery_mappings[base]
+        elif base in db_items:
+            decisions[base] = db_items[base]
+        elif (folded_key := folded.get(base)) is not None:
+            # Diferă doar prin diacritice / plural / spații → fără scor fuzzy
+            decisions[base] = db_items[folded_key]
+        else:
+            top = ranker.top(base)
+            if top and top[0][0] >= 0.92:
+                canonical = top[0][1]
+                decisions[base] = canonical
+                store.set(base, canonical)
+                auto_resolved += 1
+                print(f"    ✓ auto: '{base}' → '{canonical}'")
+            else:
+                unknown.append(base)
 
-        top_matches = _find_top_db_matches(name, db_items)
+    # ── 3. Prompt o dată per nume, cele mai frecvente primele ──
+    unknown.sort(key=lambda b: -len(occurrences[b]))  # sort stabil → ordinea apariției la egalitate
+    if unknown:
+        print(f"\n{'═' * 58}")
+        print(f"  {len(occurrences)} ingrediente unice: {len(occurrences) - len(unknown)} rezolvate, "
+              f"{len(unknown)} necunoscute")
+        print(f"{'═' * 58}")
 
-        # Auto-resolve dacă scor >= 0.92
-        if top_matches and top_matches[0][0] >= 0.92:
-            canonical = top_matches[0][1]
-            grocery_mappings[name] = canonical
-            _save_scraper_mappings(mappings_path, grocery_mappings, obs_mappings)
-            print(f"    ✓ auto: '{name}' → '{canonical}'")
-            return canonical
+    def _prompt(name: str, position: int) -> tuple[str | None, bool]:
+        """Returnează (canonical sau None, continuă?) — False la EOF/Ctrl+C."""
+        uses = occurrences[name]
+        recipe_titles = list(dict.fromkeys(title for title, _ in uses))
+        top_matches = ranker.top(name)
 
-        # Prompt interactiv
         print(f"\n  ┌─────────────────────────────────────────────────────")
-        print(f"  │  Rețetă     : {recipe_title}")
-        print(f"  │  Ingredient : {item_str.strip()}")
-        print(f"  │  Bază       : {name}")
+        print(f"  │  [{position}/{len(unknown)}] {name}")
+        print(f"  │  Ingredient : {uses[0][1].strip()}")
+        print(f"  │  Apariții   : {len(uses)} în {len(recipe_titles)} rețete "
+              f"({', '.join(recipe_titles[:3])}{', …' if len(recipe_titles) > 3 else ''})")
         print(f"  └─────────────────────────────────────────────────────")
 
         if top_matches:
@@ -1891,108 +2134,401 @@ def _resolve_ingredient_names_interactive(recipes: list, db_path: str, mappings_
                 choice = input("  Alegere: ").strip()
             except (EOFError, KeyboardInterrupt):
                 print()
-                return None
+                return None, False
 
             choice_lower = choice.lower()
 
             if choice_lower == 's':
-                return None
+                return None, True
             elif choice_lower == 'n':
-                grocery_mappings[name] = '__new__'
-                _save_scraper_mappings(mappings_path, grocery_mappings, obs_mappings)
-                return None
+                store.set(name, '__new__')
+                return None, True
             elif choice_lower == 'm':
                 try:
                     manual = input("  Nume DB: ").strip()
                     obs = input("  Obs: ").strip()
                 except (EOFError, KeyboardInterrupt):
                     print()
-                    return None
+                    return None, False
                 if manual:
-                    grocery_mappings[name] = manual
+                    store.set(name, manual)
                     if obs:
-                        obs_mappings[name] = obs
-                    _save_scraper_mappings(mappings_path, grocery_mappings, obs_mappings)
-                    return manual
+                        store.set(name, obs, section=OBS)
+                    return manual, True
             elif choice.isdigit():
                 idx = int(choice)
                 if 1 <= idx <= len(top_matches):
                     canonical = top_matches[idx - 1][1]
-                    grocery_mappings[name] = canonical
-                    _save_scraper_mappings(mappings_path, grocery_mappings, obs_mappings)
-                    return canonical
+                    store.set(name, canonical)
+                    return canonical, True
                 else:
                     print(f"    Alegere invalidă. Introduceți 1-{len(top_matches)}, m, n sau s.")
             else:
                 print("    Alegere invalidă. Introduceți un număr, m, n sau s.")
 
-    # Procesează rețetă cu rețetă
-    for recipe in recipes:
-        recipe_title = recipe.get('name', '?')
-        recipe_printed = False
+    for position, name in enumerate(unknown, 1):
+        canonical, keep_going = _prompt(name, position)
+        decisions[name] = canonical
+        if not keep_going:
+            # Fără input (EOF / Ctrl+C) — restul rămân nerezolvate
+            break
+    store.close()
 
+    # ── 4. Aplică deciziile pe toate rețetele ─────────────────
+    patterns = {
+        base: re.compile(r'(?i)\b' + re.escape(base) + r'\b')
+        for base, canonical in decisions.items()
+        if canonical and canonical != '__new__'
+    }
+    for recipe in recipes:
         for group in recipe.get('ingredient_groups', []):
             new_items = []
             for item in group.get('items', []):
                 base = _extract_base_name(item)
-                if not base:
-                    new_items.append(item)
-                    continue
-
-                # Verifică rapid dacă e deja cunoscut (fără prompt)
-                known = (base in grocery_mappings) or (base in db_items)
-                if not known:
-                    top = _find_top_db_matches(base, db_items)
-                    known = bool(top and top[0][0] >= 0.92)
-
-                if not known and not recipe_printed:
-                    print(f"\n{'═' * 58}")
-                    print(f"  {recipe_title}")
-                    print(f"{'═' * 58}")
-                    recipe_printed = True
-
-                canonical = _resolve_name(base, recipe_title, item)
-                if canonical and canonical != '__new__':
-                    item = re.sub(
-                        r'(?i)\b' + re.escape(base) + r'\b',
-                        canonical,
-                        item,
-                        count=1
-                    )
+                pattern = patterns.get(base)
+                if pattern is not None:
+                    canonical = decisions[base]
+                    item = pattern.sub(lambda _m: canonical, item, count=1)
                 new_items.append(item)
             group['items'] = new_items
 
     return recipes
 
 
-def scrape_recipes_from_file(mode: str, input_file: str = None, output_file: str = None):
-    """Citește URL-uri sau rețete text și scrie în formatul txt
+# ──────────────────────────────────────────────────────────────
+# Blocuri -local: parsare în memorie, opțional în paralel
+# ──────────────────────────────────────────────────────────────
 
-    Args:
-        mode: '-url' pentru web scraping sau '-local' pentru fișiere locale
-        input_file: cale custom pentru fișierul de input (opțional)
-        output_file: cale custom pentru fișierul de output (opțional)
+_block_scraper = None
+
+
+def _init_block_worker(image_dir: str, db_path: str = None):
+    """Un RecipeScraper per proces worker (catalog + cache-uri proprii)."""
+    global _block_scraper
+    with redirect_stdout(io.StringIO()):
+        _block_scraper = RecipeScraper(db_path)
+    _block_scraper.image_dir = image_dir
+
+
+def _parse_block_captured(block: str) -> tuple:
+    """Rulează în worker; log-ul e capturat și afișat de părinte, în ordinea blocurilor."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        recipe = _block_scraper.parse_local_text(block)
+    return recipe, buf.getvalue()
+
+
+def _print_block_header(block_num: int):
+    print(f"\n{'─'*60}")
+    print(f"Procesez blocul {block_num}")
+    print(f"{'─'*60}")
+
+
+def parse_local_blocks(scraper: RecipeScraper, blocks: list, jobs: int = 1):
     """
-    scraper = RecipeScraper()
-
-    # Configurare paths în funcție de mod
-    if mode == '-url':
-        input_file = input_file or 'data/urls/recipe_urls.txt'
-        output_file = output_file or 'data/urls/scraped_recipe_urls.txt'
-        img_dir = 'data/urls/img'
-        mode_name = 'Web URLs'
-        is_local = False
-    elif mode == '-local':
-        input_file = input_file or 'data/local/local_recipes.txt'
-        output_file = output_file or 'data/local/scraped_local_recipes.txt'
-        img_dir = 'data/local/img'
-        mode_name = 'Local Text'
-        is_local = True
-    else:
+    Parsează blocurile (block_num, text) și le returnează în ordine, ca
+    (block_num, rețetă sau None). Cu jobs > 1, blocurile sunt împărțite pe un
+    pool de procese — traducerea și procesarea ingredientelor rulează în paralel.
+    """
+    if jobs <= 1 or len(blocks) <= 1:
+        for block_num, block in blocks:
+            _print_block_header(block_num)
+            yield block_num, scraper.parse_local_text(block)
+        return
+
+    # Importat doar aici: costă ~20 ms la pornire și e nevoie de el doar cu -j > 1
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_block_worker,
+                             initargs=(scraper.image_dir, scraper.db_path)) as pool:
+        results = pool.map(_parse_block_captured, [block for _, block in blocks])
+        for (block_num, _), (recipe, log) in zip(blocks, results):
+            _print_block_header(block_num)
+            print(log, end='')
+            yield block_num, recipe
+
+
+# Împarte textul local după separator: ---- (4+ liniuțe) sau === sau 3+ linii goale
+_LOCAL_BLOCK_SEPARATOR = re.compile(r'(?:^|\n)\s*-{4,}\s*\n|\n\s*={3,}\s*\n|\n(?:\s*\n){5,}')
+
+
+def split_local_blocks(content: str) -> list:
+    """Blocurile nevide de rețete dintr-un text local (ca în modul -local)."""
+    return [block.strip() for block in _LOCAL_BLOCK_SEPARATOR.split(content) if block.strip()]
+
+
+# ──────────────────────────────────────────────────────────────
+# Shard-uri: lista de URL-uri împărțită pe mai multe mașini
+# ──────────────────────────────────────────────────────────────
+
+# Parametri care nu schimbă pagina (tracking) — ignorați în URL-ul canonic
+_TRACKING_PARAM_RE = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid)$', re.IGNORECASE)
+_SCRAPED_TITLE_RE = re.compile(r'^===\s*(.+?)\s*===$', re.MULTILINE)
+_SCRAPED_LINK_RE = re.compile(r'^Link:\s*(\S+)', re.MULTILINE)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Forma URL-ului folosită pentru shard și deduplicare: http/https, www., fragmentul,
+    parametrii de tracking, ordinea parametrilor și / final nu contează.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _TRACKING_PARAM_RE.match(k)))
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    return urlunsplit((scheme, host, parts.path.rstrip('/') or '/', query, ''))
+
+
+def parse_shard(spec: str) -> tuple:
+    """'i/N' → (i, N), cu 1 ≤ i ≤ N; ValueError altfel."""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', spec or '')
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"Shard invalid: {spec!r} (așteptat i/N, cu 1 ≤ i ≤ N, ex: 2/4)")
+    return int(match.group(1)), int(match.group(2))
+
+
+def shard_of(url: str, count: int) -> int:
+    """Shard-ul (1..count) unui URL — același pe orice mașină, pentru orice ordine a listei."""
+    digest = hashlib.blake2b(canonical_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count + 1
+
+
+def select_shard(urls: list, shard: tuple) -> list:
+    """(poziția în listă, URL) pentru URL-urile shard-ului, fără duplicate canonice."""
+    index, count = shard
+    seen = set()
+    selected = []
+    for position, url in enumerate(urls):
+        key = canonical_url(url)
+        if key in seen:
+            continue
+        seen.add(key)
+        if shard_of(url, count) == index:
+            selected.append((position, url))
+    return selected
+
+
+def shard_output_path(output_file: str, shard: tuple) -> str:
+    """data/urls/scraped_recipe_urls.txt → data/urls/scraped_recipe_urls.shard-2-of-4.txt"""
+    root, ext = os.path.splitext(output_file)
+    return f"{root}.shard-{shard[0]}-of-{shard[1]}{ext}"
+
+
+def journal_path(output_file: str) -> str:
+    return os.path.splitext(output_file)[0] + '.journal.jsonl'
+
+
+class ShardJournal:
+    """
+    Jurnalul unui shard (JSONL, o linie per URL încheiat): poziția în lista de
+    intrare, URL-ul canonic și rezultatul:
+      scraped — rețeta e deja în output-ul shard-ului, cu numele încă nerezolvate
+      ok      — numele ingredientelor rezolvate
+      failed  — reîncercat la următoarea rulare
+    Fiecare rețetă e notată imediat după descărcare, așa că o rulare întreruptă
+    (Ctrl+C, crash) nu mai descarcă la reluare ce a apucat să scrie; merge folosește
+    pozițiile ca ordinea finală să fie cea din lista originală.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue    # linie scrisă pe jumătate (rulare întreruptă)
+                    self.entries[entry['canonical']] = entry
+
+    def completed(self) -> set:
+        return {key for key, entry in self.entries.items() if entry['status'] != 'failed'}
+
+    def positions(self) -> Dict[str, int]:
+        return {key: entry['position'] for key, entry in self.entries.items()}
+
+    def record(self, position: int, url: str, status: str, name: str = None):
+        entry = {'position': position, 'url': url, 'canonical': canonical_url(url),
+                 'status': status, 'name': name}
+        self.entries[entry['canonical']] = entry
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def split_scraped_blocks(content: str) -> list:
+    """Textul fiecărei rețete dintr-un fișier scraped — inversul lui recipes_to_txt."""
+    starts = [m.start() for m in _SCRAPED_TITLE_RE.finditer(content)]
+    blocks = [content[start:end] for start, end in zip(starts, starts[1:] + [len(content)])]
+    # Fără '\n'-ul de separare adăugat de recipes_to_txt între rețete
+    return [block[:-1] if block.endswith('\n') else block for block in blocks[:-1]] + blocks[-1:]
+
+
+_SCRAPED_QUANTITY_RE = re.compile(r'^\[([^\]]*)\]\s*')
+
+
+def _scraped_ingredient_lines(lines: list) -> list:
+    """Indicii liniilor de ingrediente dintr-un bloc scraped (grupurile '# ', până la '## ')."""
+    indexes = []
+    in_ingredients = False
+    for num, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('## '):
+            break
+        if stripped.startswith('# '):
+            in_ingredients = True
+        elif in_ingredients and stripped:
+            indexes.append(num)
+    return indexes
+
+
+def _scraped_block_recipe(block: str) -> dict:
+    """
+    Titlul + liniile de ingrediente ale unui bloc scraped (cât cere _flag_near_duplicates).
+    "[200 g] Chicken breast" devine "200 g Chicken breast", forma de dinainte de rezolvare.
+    """
+    lines = block.splitlines()
+    items = [_SCRAPED_QUANTITY_RE.sub(r'\1 ', lines[num].strip()).strip()
+             for num in _scraped_ingredient_lines(lines)]
+    title = _SCRAPED_TITLE_RE.match(block)
+    return {'name': title.group(1) if title else '', 'ingredient_groups': [{'items': items}]}
+
+
+def resolve_shard_output(output_file: str, journal: 'ShardJournal', db_path: str = None) -> int:
+    """
+    Rezolvarea interactivă a numelor pentru rețetele shard-ului încă 'scraped' (din
+    rularea curentă sau dintr-una întreruptă), direct pe liniile din output; rescrie
+    fișierul și le notează 'ok'. Returnează câte rețete au fost rezolvate.
+    """
+    if not os.path.isfile(output_file):
+        return 0
+    with open(output_file, encoding='utf-8') as f:
+        blocks = split_scraped_blocks(f.read())
+
+    pending = []    # (index bloc, liniile blocului, indicii ingredientelor, rețeta, intrarea din jurnal)
+    for num, block in enumerate(blocks):
+        link = _SCRAPED_LINK_RE.search(block)
+        entry = journal.entries.get(canonical_url(link.group(1))) if link else None
+        if not entry or entry['status'] != 'scraped':
+            continue
+        lines = block.split('\n')
+        indexes = _scraped_ingredient_lines(lines)
+        recipe = {'name': entry.get('name') or '?',
+                  'ingredient_groups': [{'items': [lines[i].strip() for i in indexes]}]}
+        pending.append((num, lines, indexes, recipe, entry))
+    if not pending:
+        return 0
+
+    _resolve_ingredient_names_interactive([recipe for *_, recipe, _ in pending],
+                                          _resolver_db_path(db_path), MAPPINGS_PATH)
+    for num, lines, indexes, recipe, _ in pending:
+        for i, item in zip(indexes, recipe['ingredient_groups'][0]['items']):
+            lines[i] = item
+        blocks[num] = '\n'.join(lines)
+
+    tmp = f"{output_file}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(blocks))
+    os.replace(tmp, output_file)
+    for *_, entry in pending:
+        journal.record(entry['position'], entry['url'], 'ok', entry.get('name'))
+    return len(pending)
+
+
+def merge_shard_outputs(paths: list, output_file: str, db_path: str = None,
+                        skip_near_duplicates: bool = False) -> tuple:
+    """
+    Combină output-urile shard-urilor într-un singur fișier scraped, în ordinea
+    URL-urilor din lista originală (pozițiile din jurnale). O rețetă apărută în mai
+    multe shard-uri (același URL canonic sau același nume) e păstrată o singură dată.
+
+    Aproape-duplicatele sunt căutate aici, o singură dată peste lista combinată (un
+    shard își vede doar propriile URL-uri). Spre deosebire de o rulare fără shard-uri,
+    semnăturile folosesc numele de ingrediente deja rezolvate în fiecare shard, deci
+    scorurile (și, cu skip_near_duplicates, rețetele eliminate) pot diferi puțin.
+    Returnează (rețete scrise, duplicate eliminate, aproape-duplicate eliminate).
+    """
+    entries = []
+    for path_num, path in enumerate(paths):
+        positions = ShardJournal(journal_path(path)).positions()
+        with open(path, encoding='utf-8') as f:
+            blocks = split_scraped_blocks(f.read())
+        for block_num, block in enumerate(blocks):
+            link = _SCRAPED_LINK_RE.search(block)
+            key = canonical_url(link.group(1)) if link else None
+            position = positions.get(key)
+            # Fără poziție în jurnal: la final, în ordinea fișierelor
+            order = (position is None, position or 0, path_num, block_num)
+            name = _SCRAPED_TITLE_RE.match(block).group(1).lower().strip()
+            entries.append((order, key, name, block))
+
+    seen_urls, seen_names = set(), set()
+    merged = []
+    duplicates = 0
+    for _, key, name, block in sorted(entries, key=lambda e: e[0]):
+        if (key and key in seen_urls) or name in seen_names:
+            duplicates += 1
+            continue
+        if key:
+            seen_urls.add(key)
+        seen_names.add(name)
+        merged.append(block)
+
+    near_dupes = 0
+    if merged:
+        recipes = [_scraped_block_recipe(block) for block in merged]
+        kept = {id(recipe) for recipe in _flag_near_duplicates(
+            recipes, _resolver_db_path(db_path), MAPPINGS_PATH, skip=skip_near_duplicates)}
+        near_dupes = len(merged) - len(kept)
+        merged = [block for block, recipe in zip(merged, recipes) if id(recipe) in kept]
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(merged))
+    return len(merged), duplicates, near_dupes
+
+
+def extract_urls(content: str) -> list:
+    """URL-urile dintr-un fișier de input (un URL per linie, # = comentariu)."""
+    lines = [line.strip() for line in content.split('\n')]
+    return [line for line in lines if line and not line.startswith('#') and (line.startswith('http://') or line.startswith('https://'))]
+
+
+# Mod → (input implicit, output implicit, director imagini, nume afișat)
+SCRAPE_MODES = {
+    '-url':   ('data/urls/recipe_urls.txt', 'data/urls/scraped_recipe_urls.txt', 'data/urls/img', 'Web URLs'),
+    '-local': ('data/local/local_recipes.txt', 'data/local/scraped_local_recipes.txt', 'data/local/img', 'Local Text'),
+}
+
+
+def scrape_recipes(mode: str, input_file: str = None, skip_near_duplicates: bool = False,
+                   jobs: int = 1, db_path: str = None, shard: tuple = None,
+                   journal: 'ShardJournal' = None, on_scraped=None) -> Optional[tuple]:
+    """Citește URL-uri sau rețete text și returnează (scraper, rețete) — fără să scrie fișierul.
+
+    Folosit de scrape_recipes_from_file și de recipes.py (lanțul scrape → normalize → import
+    în același proces). db_path: DB-ul pentru catalogul parserului, aproape-duplicate și
+    rezolvarea numelor (default: webapp/dev.db). None dacă modul e invalid sau input-ul lipsește.
+
+    shard (i, N) — doar URL-urile shard-ului i din N (modul -url); aproape-duplicatele
+    sunt căutate abia la -merge, peste toate shard-urile. Cu journal, URL-urile deja
+    încheiate sunt sărite și eșecurile sunt notate imediat. on_scraped(scraper, poziție,
+    URL, rețetă), dacă e dat, primește fiecare rețetă imediat după descărcare (ex: scrisă în
+    output-ul shard-ului), iar rețeta nu mai trece prin finalizare și nu e returnată.
+    """
+    if mode not in SCRAPE_MODES:
         print(f"✗ Mod invalid: {mode}")
         print("Utilizare: notion-scrape -url SAU notion-scrape -local")
-        return
-    
+        return None
+    default_input, _, img_dir, mode_name = SCRAPE_MODES[mode]
+    input_file = input_file or default_input
+    is_local = mode == '-local'
+
+    scraper = RecipeScraper(db_path)
     # Setează directorul pentru imagini
     scraper.image_dir = img_dir
     
@@ -2007,75 +2543,128 @@ def scrape_recipes_from_file(mode: str, input_file: str = None, output_file: str
     except FileNotFoundError:
         print(f"✗ Fișierul '{input_file}' nu a fost găsit!")
         print(f"Creează fișierul și adaugă {'URL-uri (un URL per linie)' if not is_local else 'rețete text'}")
-        return
+        return None
     
     recipes = []
     
     if is_local:
         # Mod local - split în rețete multiple
-        # Împarte după separator: ---- (4+ liniuțe) sau === sau 3+ linii goale
-        recipe_blocks = re.split(r'(?:^|\n)\s*-{4,}\s*\n|\n\s*={3,}\s*\n|\n(?:\s*\n){5,}', content)
+        recipe_blocks = _LOCAL_BLOCK_SEPARATOR.split(content)
         
         print(f"Găsite {len(recipe_blocks)} blocuri potențiale de rețete\n")
         
-        for block_num, block in enumerate(recipe_blocks, 1):
-            if not block.strip():
-                continue
-            
-            print(f"\n{'─'*60}")
-            print(f"Procesez blocul {block_num}")
-            print(f"{'─'*60}")
-            
-            # Scrie blocul temporar într-un fișier
-            temp_file = f"/tmp/recipe_block_{block_num}.txt"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                f.write(block.strip())
-            
-            recipe = scraper._parse_local_file(temp_file)
+        blocks = [(block_num, block.strip())
+                  for block_num, block in enumerate(recipe_blocks, 1) if block.strip()]
+        for block_num, recipe in parse_local_blocks(scraper, blocks, jobs):
             if recipe:
-                # Caută imagine locală după numele rețetei (snake_case)
-                if not recipe.get('image_path') and not recipe.get('image_url'):
-                    img_match = _find_local_image(recipe['name'], img_dir)
-                    if img_match:
-                        recipe['image_path'] = img_match
-                        print(f"  🖼  Imagine găsită: {img_match}")
+                _attach_local_image(recipe, img_dir)
                 recipes.append(recipe)
-            
-            # Șterge fișierul temporar
-            os.remove(temp_file)
     else:
         # Mod URL - scrape web
-        lines = [line.strip() for line in content.split('\n')]
-        urls = [line for line in lines if line and not line.startswith('#') and (line.startswith('http://') or line.startswith('https://'))]
+        urls = extract_urls(content)
         
         if not urls:
             print(f"✗ Nu s-au găsit URL-uri în '{input_file}'")
-            return
+            return None
         
         print(f"Găsite {len(urls)} URL-uri\n")
-        for url in urls:
+        entries = list(enumerate(urls))
+        if shard:
+            entries = select_shard(urls, shard)
+            print(f"Shard {shard[0]}/{shard[1]}: {len(entries)} URL-uri\n")
+        if journal:
+            completed = journal.completed()
+            pending = [(pos, url) for pos, url in entries if canonical_url(url) not in completed]
+            if len(pending) < len(entries):
+                print(f"  ↷ {len(entries) - len(pending)} URL-uri deja încheiate (jurnal)\n")
+            entries = pending
+        for position, url in entries:
             recipe = scraper.scrape_recipe(url)
-            if recipe:
+            if recipe and on_scraped:
+                on_scraped(scraper, position, url, recipe)
+            elif recipe:
                 recipes.append(recipe)
+            elif journal:
+                journal.record(position, url, 'failed')
     
-    # Rezolvă interactiv numele de ingrediente necunoscute
+    return scraper, finish_scraped_recipes(recipes, db_path, skip_near_duplicates,
+                                           flag_near_duplicates=shard is None)
+
+
+def _attach_local_image(recipe: Dict, img_dir: str):
+    """Caută imagine locală după numele rețetei (snake_case)."""
+    if not recipe.get('image_path') and not recipe.get('image_url'):
+        img_match = _find_local_image(recipe['name'], img_dir)
+        if img_match:
+            recipe['image_path'] = img_match
+            print(f"  🖼  Imagine găsită: {img_match}")
+
+
+MAPPINGS_PATH = 'data/ingredient_mappings.json'
+
+
+def _resolver_db_path(db_path: str = None) -> str:
+    """DB-ul pentru aproape-duplicate și rezolvarea numelor (default: webapp/dev.db)."""
+    resolved = db_path or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webapp', 'dev.db')
+    return resolved if os.path.isfile(resolved) else 'webapp/dev.db'
+
+
+def finish_scraped_recipes(recipes: list, db_path: str = None, skip_near_duplicates: bool = False,
+                           flag_near_duplicates: bool = True) -> list:
+    """
+    Aproape-duplicate (dacă flag_near_duplicates), apoi rezolvare interactivă a numelor
+    de ingrediente necunoscute.
+    """
+    db_path_for_resolver = _resolver_db_path(db_path)
+    if recipes and flag_near_duplicates:
+        recipes = _flag_near_duplicates(recipes, db_path_for_resolver, MAPPINGS_PATH,
+                                        skip=skip_near_duplicates)
     if recipes:
-        db_path_for_resolver = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'webapp', 'dev.db')
-        if not os.path.isfile(db_path_for_resolver):
-            db_path_for_resolver = 'webapp/dev.db'
-        mappings_path = 'data/ingredient_mappings.json'
-        recipes = _resolve_ingredient_names_interactive(recipes, db_path_for_resolver, mappings_path)
+        recipes = _resolve_ingredient_names_interactive(recipes, db_path_for_resolver, MAPPINGS_PATH)
+    return recipes
+
+
+def recipes_to_txt(scraper: RecipeScraper, recipes: list) -> str:
+    """Rețetele în formatul txt scraped (același conținut ca fișierul de output)."""
+    return '\n'.join(scraper.convert_to_txt_format(recipe) for recipe in recipes)
+
+
+def scrape_recipes_from_file(mode: str, input_file: str = None, output_file: str = None,
+                             skip_near_duplicates: bool = False, jobs: int = 1,
+                             shard: tuple = None, db_path: str = None):
+    """Citește URL-uri sau rețete text și scrie în formatul txt
+
+    Args:
+        mode: '-url' pentru web scraping sau '-local' pentru fișiere locale
+        input_file: cale custom pentru fișierul de input (opțional)
+        output_file: cale custom pentru fișierul de output (opțional)
+        skip_near_duplicates: elimină rețetele aproape duplicate (altfel doar le marchează)
+        jobs: procese pentru parsarea blocurilor în modul -local (default: 1, serial)
+        shard: (i, N) — doar shard-ul i din N; output și jurnal proprii (.shard-i-of-N),
+               fiecare rețetă e scrisă imediat după descărcare, iar numele se rezolvă
+               la final; o rulare repetată (și după Ctrl+C / crash) continuă de unde a rămas
+        db_path: DB-ul pentru aproape-duplicate și rezolvarea numelor (default: webapp/dev.db)
+    """
+    output_file = output_file or SCRAPE_MODES[mode][1]
+    if shard:
+        scrape_shard(mode, input_file, output_file, shard, skip_near_duplicates, jobs, db_path)
+        return
+    result = scrape_recipes(mode, input_file, skip_near_duplicates, jobs, db_path)
+    if result is None:
+        return
+    scraper, recipes = result
 
     # Scrie în fișier
     if recipes:
         with open(output_file, 'w', encoding='utf-8') as f:
-            for i, recipe in enumerate(recipes):
-                if i > 0:
-                    f.write('\n')  # Separator între rețete
-                f.write(scraper.convert_to_txt_format(recipe))
-        
+            f.write(recipes_to_txt(scraper, recipes))
+
         print(f"\n{'='*60}")
         print(f"✓ {len(recipes)} rețete salvate în '{output_file}'")
+        line_stats = scraper.ingredient_processor.cache_stats()['lines']
+        if line_stats['hits'] + line_stats['misses']:
+            print(f"  ℹ Cache ingrediente: {line_stats['hits']}/{line_stats['hits'] + line_stats['misses']} "
+                  f"linii refolosite ({line_stats['hit_rate']:.0%})")
         print(f"{'='*60}\n")
         print(f"Pentru a importa în Notion, rulează:")
         print(f"  notion-import {output_file}")
@@ -2083,6 +2672,301 @@ def scrape_recipes_from_file(mode: str, input_file: str = None, output_file: str
         print(f"\n✗ Nu s-au putut extrage rețete")
 
 
+def scrape_shard(mode: str, input_file: str, output_file: str, shard: tuple,
+                 skip_near_duplicates: bool = False, jobs: int = 1, db_path: str = None):
+    """
+    Un shard: fiecare rețetă e adăugată în output-ul shard-ului și notată 'scraped' în
+    jurnal imediat după descărcare; rezolvarea interactivă a numelor rulează la final,
+    peste tot ce a rămas 'scraped' (inclusiv dintr-o rulare întreruptă).
+    """
+    output_file = shard_output_path(output_file, shard)
+    journal = ShardJournal(journal_path(output_file))
+    if not journal.completed() and os.path.isfile(output_file):
+        # Output rămas fără jurnal (ex: alt shard cu același nume): shard-ul începe de la zero
+        open(output_file, 'w').close()
+    saved = []
+
+    def save(scraper: RecipeScraper, position: int, url: str, recipe: Dict):
+        block = scraper.convert_to_txt_format(recipe)
+        append = os.path.isfile(output_file) and os.path.getsize(output_file) > 0
+        with open(output_file, 'a' if append else 'w', encoding='utf-8') as f:
+            f.write(('\n' if append else '') + block)
+        journal.record(position, url, 'scraped', recipe['name'])
+        saved.append(recipe['name'])
+
+    result = scrape_recipes(mode, input_file, skip_near_duplicates, jobs, db_path,
+                            shard=shard, journal=journal, on_scraped=save)
+    if result is None:
+        return
+    resolved = resolve_shard_output(output_file, journal, db_path)
+
+    if saved or resolved:
+        print(f"\n{'='*60}")
+        print(f"✓ {len(saved)} rețete noi salvate în '{output_file}'"
+              + (f" ({resolved} cu numele rezolvate acum)" if resolved != len(saved) else ""))
+        print(f"{'='*60}\n")
+        print(f"După ce toate cele {shard[1]} shard-uri au terminat, combină-le cu:")
+        print(f"  python scripts/scrape_recipes.py -merge -o {SCRAPE_MODES[mode][1]}")
+    else:
+        print(f"\nℹ Nicio rețetă nouă în shard-ul {shard[0]}/{shard[1]} ('{output_file}')")
+
+
+def merge_shards_from_files(output_file: str = None, paths: list = None, db_path: str = None,
+                            skip_near_duplicates: bool = False):
+    """-merge: combină output-urile shard-urilor (implicit toate *.shard-i-of-N ale output-ului)."""
+    output_file = output_file or SCRAPE_MODES['-url'][1]
+    if not paths:
+        root, ext = os.path.splitext(output_file)
+        pattern = re.compile(re.escape(os.path.basename(root)) + r'\.shard-(\d+)-of-(\d+)' + re.escape(ext) + '$')
+        directory = os.path.dirname(output_file) or '.'
+        found = [(m, name) for name in os.listdir(directory) if (m := pattern.match(name))]
+        found.sort(key=lambda item: (int(item[0].group(2)), int(item[0].group(1))))
+        paths = [os.path.join(directory, name) for _, name in found]
+    if not paths:
+        print(f"✗ Nu s-au găsit shard-uri pentru '{output_file}'")
+        return
+
+    print(f"\n{'='*60}")
+    print(f"Merge shard-uri → {output_file}")
+    print(f"{'='*60}\n")
+    for path in paths:
+        print(f"  • {path}")
+    print()
+    written, duplicates, near_dupes = merge_shard_outputs(paths, output_file, db_path,
+                                                          skip_near_duplicates)
+    removed = []
+    if duplicates:
+        removed.append(f"{duplicates} duplicate între shard-uri")
+    if near_dupes:
+        removed.append(f"{near_dupes} aproape duplicate")
+    print(f"\n✓ {written} rețete salvate în '{output_file}'"
+          + (f" ({', '.join(removed)} eliminate)" if removed else ""))
+
+
+# ──────────────────────────────────────────────────────────────
+# --watch: doar intrările adăugate în input, pe măsură ce apar
+# ──────────────────────────────────────────────────────────────
+
+WATCH_STATE_FILE = 'data/cache/scrape_watch.json'
+WATCH_MAX_FAILURES = 3      # după atâtea încercări eșuate, intrarea nu mai e reluată
+
+
+class WatchState:
+    """
+    Intrările deja procesate ale unui input urmărit (URL canonic / hash de bloc local),
+    în data/cache/scrape_watch.json — după o repornire, watch-ul preia și ce s-a
+    adăugat între timp, fără să reia tot fișierul.
+    """
+
+    def __init__(self, input_path: str, path: str = WATCH_STATE_FILE):
+        self.path = path
+        self.input_key = os.path.abspath(input_path)
+        entry = self._load().get(self.input_key)
+        self.is_new = entry is None
+        self.seen = set((entry or {}).get('seen', []))
+        self.failures: Dict[str, int] = dict((entry or {}).get('failures', {}))
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        # Recitit înainte de scriere: alte watch-uri (alte input-uri) folosesc același fișier
+        data = self._load()
+        data[self.input_key] = {'seen': sorted(self.seen), 'failures': self.failures}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def _watch_files(input_path: str, output_file: str) -> list:
+    """Fișierul urmărit sau toate fișierele .txt din director (fără output-ul însuși)."""
+    if os.path.isdir(input_path):
+        output = os.path.abspath(output_file)
+        return sorted(path for path in (os.path.join(input_path, name)
+                                        for name in os.listdir(input_path) if name.endswith('.txt'))
+                      if os.path.abspath(path) != output)
+    return [input_path]
+
+
+def _watch_signature(input_path: str, output_file: str) -> tuple:
+    signature = []
+    for path in _watch_files(input_path, output_file):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _watch_entries(input_path: str, output_file: str, is_local: bool) -> list:
+    """(cheie, intrare) în ordinea din fișiere, fără duplicate: URL-uri sau blocuri locale."""
+    entries = {}
+    for path in _watch_files(input_path, output_file):
+        try:
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            continue
+        if is_local:
+            for block in split_local_blocks(content):
+                key = hashlib.blake2b(block.encode('utf-8'), digest_size=12).hexdigest()
+                entries.setdefault(key, block)
+        else:
+            for url in extract_urls(content):
+                entries.setdefault(canonical_url(url), url)
+    return list(entries.items())
+
+
+class _WatchImporter:
+    """
+    --import: fiecare lot nou e importat imediat. Catalogul, mapările și choices sunt
+    reîncărcate când se schimbă cheia snapshot-ului de catalog pentru dev.db — după
+    importuri, grocery items create la rezolvarea interactivă sau modificări din webapp.
+    """
+
+    def __init__(self, db_path: str):
+        from mapping_tables import connect as connect_mapping_tables
+
+        self.db_path = db_path
+        self.mapping_conn = connect_mapping_tables(db_path, readonly=False)
+        self.db_key = None
+        self._load()
+
+    def _load(self):
+        from grocery_catalog import catalog_key
+        from import_recipes import load_choices, load_grocery_items
+        from mapping_tables import NameMappings
+        from normalize_units import CHOICES_FILE
+
+        self.db_key = catalog_key(self.db_path)
+        self.grocery_items = load_grocery_items(self.db_path)
+        self.folded = FoldedIndex(self.grocery_items)
+        self.name_mappings = NameMappings(self.mapping_conn) if self.mapping_conn else None
+        self.choices = load_choices(CHOICES_FILE, self.mapping_conn)
+
+    def run(self, text: str, skip_near_duplicates: bool = False):
+        from grocery_catalog import catalog_key
+        from import_recipes import iter_scraped_recipes, print_import_summary, run_import
+
+        if catalog_key(self.db_path) != self.db_key:
+            self._load()
+        stats = run_import(iter_scraped_recipes(text.splitlines()), self.db_path,
+                           self.grocery_items, self.choices, self.name_mappings, self.folded,
+                           skip_near_duplicates=skip_near_duplicates)
+        print_import_summary(stats, skip_near_duplicates)
+
+    def close(self):
+        if self.mapping_conn is not None:
+            self.mapping_conn.close()
+
+
+def _watch_batch(scraper: RecipeScraper, new: list, is_local: bool, state: WatchState,
+                 output_file: str, skip_near_duplicates: bool, db_path: Optional[str],
+                 importer: Optional[_WatchImporter]) -> int:
+    """Procesează intrările noi, le adaugă în output (și în DB cu --import)."""
+    print(f"\n{'─'*60}")
+    print(f"＋ {len(new)} {'blocuri' if is_local else 'URL-uri'} noi")
+    print(f"{'─'*60}")
+    recipes = []
+    for key, entry in new:
+        recipe = scraper.parse_local_text(entry) if is_local else scraper.scrape_recipe(entry)
+        if recipe:
+            if is_local:
+                _attach_local_image(recipe, scraper.image_dir)
+            recipes.append(recipe)
+            state.seen.add(key)
+            state.failures.pop(key, None)
+            continue
+        failures = state.failures.get(key, 0) + 1
+        label = entry if not is_local else entry.splitlines()[0][:60]
+        if failures >= WATCH_MAX_FAILURES:
+            print(f"  ✗ Renunț la '{label}' după {failures} încercări")
+            state.seen.add(key)
+            state.failures.pop(key, None)
+        else:
+            print(f"  ⚠ '{label}' eșuat ({failures}/{WATCH_MAX_FAILURES}) — reîncerc la următoarea modificare")
+            state.failures[key] = failures
+
+    recipes = finish_scraped_recipes(recipes, db_path, skip_near_duplicates)
+    if recipes:
+        text = recipes_to_txt(scraper, recipes)
+        append = os.path.isfile(output_file) and os.path.getsize(output_file) > 0
+        with open(output_file, 'a', encoding='utf-8') as f:
+            f.write(('\n' if append else '') + text)
+        print(f"\n✓ {len(recipes)} rețete adăugate în '{output_file}'")
+        if importer:
+            importer.run(text, skip_near_duplicates)
+    # După scrierea output-ului: o oprire bruscă reia lotul, nu îl pierde
+    state.save()
+    return len(recipes)
+
+
+def watch_recipes(mode: str, input_path: str = None, output_file: str = None,
+                  interval: float = 2.0, skip_near_duplicates: bool = False,
+                  db_path: str = None, import_to_db: bool = False):
+    """
+    --watch: urmărește input-ul (fișier sau director cu .txt) și procesează doar
+    intrările noi. La prima pornire pe un input, intrările existente sunt considerate
+    deja procesate; modificările sunt preluate după ce fișierul nu s-a mai schimbat
+    un interval (ca un bloc scris pe jumătate să nu fie parsat).
+    """
+    default_input, default_output, img_dir, mode_name = SCRAPE_MODES[mode]
+    input_path = input_path or default_input
+    output_file = output_file or default_output
+    is_local = mode == '-local'
+    if not os.path.exists(input_path):
+        print(f"✗ '{input_path}' nu există!")
+        return
+
+    scraper = RecipeScraper(db_path)
+    scraper.image_dir = img_dir
+    state = WatchState(input_path)
+    importer = _WatchImporter(db_path or 'webapp/dev.db') if import_to_db else None
+
+    print(f"\n{'='*60}")
+    print(f"Recipe Scraper - {mode_name} (watch)")
+    print(f"{'='*60}\n")
+    print(f"  Input  : {input_path}{' (director)' if os.path.isdir(input_path) else ''}")
+    print(f"  Output : {output_file}")
+    if importer:
+        print(f"  Import : {importer.db_path}")
+    if state.is_new:
+        existing = _watch_entries(input_path, output_file, is_local)
+        state.seen.update(key for key, _ in existing)
+        state.save()
+        print(f"  {len(existing)} intrări existente considerate deja procesate")
+    print(f"\nAștept intrări noi (verificare la {interval:g} s, Ctrl+C pentru oprire)...")
+
+    total = 0
+    previous = processed = None
+    try:
+        while True:
+            signature = _watch_signature(input_path, output_file)
+            # Neschimbat de la verificarea anterioară → scrierea în fișier s-a terminat
+            if signature == previous and signature != processed:
+                processed = signature
+                new = [(key, entry) for key, entry in _watch_entries(input_path, output_file, is_local)
+                       if key not in state.seen]
+                if new:
+                    total += _watch_batch(scraper, new, is_local, state, output_file,
+                                          skip_near_duplicates, db_path, importer)
+                    print(f"\nAștept intrări noi...")
+            previous = signature
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print(f"\n✓ Watch oprit — {total} rețete noi în '{output_file}'")
+    finally:
+        if importer:
+            importer.close()
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Utilizare:")
@@ -2090,6 +2974,11 @@ if __name__ == "__main__":
         print("  python scrape_recipes.py -local             # Parsează fișiere text locale (default paths)")
         print("  python scrape_recipes.py -url   -i <input> -o <output>")
         print("  python scrape_recipes.py -local -i <input> -o <output>")
+        print("  ... --skip-near-duplicates                  # Ignoră rețetele aproape duplicate")
+        print("  ... -j <N>                                  # -local: parsează blocurile pe N procese")
+        print("  python scrape_recipes.py -url --shard 2/4   # Doar shard-ul 2 din 4 (output + jurnal proprii)")
+        print("  python scrape_recipes.py -merge [-o <output>] [shard-uri...]  # Combină shard-urile")
+        print("  ... --watch [--interval <s>] [--import] [--db <dev.db>]  # Doar intrările noi, pe măsură ce apar")
         print("\nDefault paths:")
         print("  -url  : data/urls/recipe_urls.txt    → data/urls/scraped_recipe_urls.txt")
         print("  -local: data/local/local_recipes.txt → data/local/scraped_local_recipes.txt")
@@ -2104,7 +2993,7 @@ if __name__ == "__main__":
 
     mode = sys.argv[1]
 
-    if mode not in ['-url', '-local']:
+    if mode not in ['-url', '-local', '-merge']:
         print(f"✗ Flag invalid: {mode}")
         print("Utilizare: python scrape_recipes.py -url SAU python scrape_recipes.py -local")
         sys.exit(1)
@@ -2112,6 +3001,14 @@ if __name__ == "__main__":
     # Parsare opțională -i / -o
     custom_input = None
     custom_output = None
+    skip_near_duplicates = False
+    jobs = 1
+    shard = None
+    shard_files = []
+    watch = False
+    interval = 2.0
+    import_to_db = False
+    db_path = None
     argv_rest = sys.argv[2:]
     i = 0
     while i < len(argv_rest):
@@ -2121,7 +3018,54 @@ if __name__ == "__main__":
         elif argv_rest[i] in ('-o', '--output') and i + 1 < len(argv_rest):
             custom_output = argv_rest[i + 1]
             i += 2
+        elif argv_rest[i] in ('-j', '--jobs') and i + 1 < len(argv_rest):
+            jobs = max(1, int(argv_rest[i + 1]))
+            i += 2
+        elif argv_rest[i] == '--skip-near-duplicates':
+            skip_near_duplicates = True
+            i += 1
+        elif argv_rest[i] == '--shard' and i + 1 < len(argv_rest):
+            try:
+                shard = parse_shard(argv_rest[i + 1])
+            except ValueError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+            i += 2
+        elif argv_rest[i] == '--watch':
+            watch = True
+            i += 1
+        elif argv_rest[i] == '--interval' and i + 1 < len(argv_rest):
+            interval = max(0.2, float(argv_rest[i + 1]))
+            i += 2
+        elif argv_rest[i] == '--import':
+            import_to_db = True
+            i += 1
+        elif argv_rest[i] in ('-d', '--db') and i + 1 < len(argv_rest):
+            db_path = argv_rest[i + 1]
+            i += 2
         else:
+            if mode == '-merge' and not argv_rest[i].startswith('-'):
+                shard_files.append(argv_rest[i])
             i += 1
 
-    scrape_recipes_from_file(mode, input_file=custom_input, output_file=custom_output)
+    if import_to_db and not watch:
+        print("✗ --import se poate folosi doar cu --watch "
+              "(altfel: import_recipes.py pe fișierul scraped)")
+        sys.exit(1)
+    if mode == '-merge':
+        merge_shards_from_files(custom_output, shard_files, db_path, skip_near_duplicates)
+        sys.exit(0)
+    if shard and mode != '-url':
+        print("✗ --shard se poate folosi doar cu -url")
+        sys.exit(1)
+    if watch:
+        if shard:
+            print("✗ --watch nu se poate combina cu --shard")
+            sys.exit(1)
+        watch_recipes(mode, custom_input, custom_output, interval, skip_near_duplicates,
+                      db_path, import_to_db)
+        sys.exit(0)
+
+    scrape_recipes_from_file(mode, input_file=custom_input, output_file=custom_output,
+                             skip_near_duplicates=skip_near_duplicates, jobs=jobs, shard=shard,
+                             db_path=db_path)
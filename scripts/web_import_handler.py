@@ -5,12 +5,25 @@ web_import_handler.py — Bridge între web UI și logica Python de import rețe
 Mod de utilizare (apelat de Next.js API routes prin subprocess):
   echo '{"urls": ["https://..."]}' | python scripts/web_import_handler.py --mode parse-urls
   echo '{"text": "=== Recipe ===\n..."}' | python scripts/web_import_handler.py --mode parse-text
+  echo '{"urls": [...]}' | python scripts/web_import_handler.py --mode parse-urls --stream
+      → NDJSON: o linie per rețetă/eroare (cu "url"), în ordinea terminării
 
 Output: JSON array de rețete parsate → stdout
 Logs:   scrise în stderr (stdout rămâne JSON curat)
+
+Mod worker (proces de lungă durată — scraper, catalog și cache-uri rămân încărcate):
+  python scripts/web_import_handler.py --serve                  # NDJSON pe stdin/stdout
+  python scripts/web_import_handler.py --serve --socket /tmp/recipes.sock
+
+  Cerere  (o linie): {"id": 1, "mode": "parse-text", "text": "..."}
+                     {"id": 2, "mode": "parse-urls", "urls": ["https://..."], "stream": true}
+  Răspuns (o linie): {"id": 1, "result": [...], "ms": 3.2}
+                     {"id": 2, "item": {..., "url": "https://..."}}   (stream, per rezultat)
+                     {"id": 2, "result": {"count": 3}, "ms": 812.4}
 """
 
 import argparse
+import hashlib
 import json
 import sys
 import os
@@ -18,106 +31,178 @@ import io
 import re
 import base64
 import mimetypes
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import redirect_stdout, redirect_stderr
-from fractions import Fraction
 
 # Schimbă directorul curent în scripts/ pentru ca importurile să funcționeze
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 os.chdir(SCRIPT_DIR)
 sys.path.insert(0, SCRIPT_DIR)
 
+from grocery_catalog import catalog_key
+from ingredient_grammar import parse_quantity, tokenize
+from parse_cache import canonical_text, open_cache
+
+MODES = ("parse-urls", "parse-text", "normalize-text")
+
+
+# ──────────────────────────────────────────────────────────────
+# Stare caldă (refolosită între cereri în modul worker)
+# ──────────────────────────────────────────────────────────────
+
+_local = threading.local()
+
+
+def get_scraper():
+    """
+    RecipeScraper-ul thread-ului curent. Traducătorul (GoogleTranslator) își modifică
+    starea la fiecare cerere, deci nu poate fi partajat între thread-uri; catalogul și
+    procesorul de ingrediente sunt singleton-uri la nivel de proces, deci un scraper
+    în plus e ieftin.
+    """
+    scraper = getattr(_local, "scraper", None)
+    if scraper is None:
+        buf = io.StringIO()
+        with redirect_stdout(buf), redirect_stderr(buf):
+            from scrape_recipes import RecipeScraper
+            scraper = _local.scraper = RecipeScraper()
+    return scraper
+
+
+_parse_cache = None     # None = nedeschis încă, False = dezactivat / indisponibil
+_sources_hash = None
+
+# Modulele prin care trece parsarea (direct sau prin fallback-ul scraped)
+_PARSER_MODULES = (
+    "web_import_handler.py", "ingredient_grammar.py", "scrape_recipes.py",
+    "ingredient_processor.py", "normalize_units.py", "import_recipes.py",
+    "grocery_catalog.py", "mapping_store.py", "mapping_tables.py",
+)
+CATALOG_DB_PATH = os.path.join(os.path.dirname(SCRIPT_DIR), "webapp", "dev.db")
+
+
+def _parser_version() -> str:
+    """
+    Hash-ul surselor parserului + cheia snapshot-ului de catalog: orice modificare
+    a codului sau a grocery items din dev.db invalidează cache-ul.
+    """
+    global _sources_hash
+    if _sources_hash is None:
+        digest = hashlib.blake2b(digest_size=8)
+        for name in _PARSER_MODULES:
+            with open(os.path.join(SCRIPT_DIR, name), "rb") as f:
+                digest.update(f.read())
+        _sources_hash = digest.hexdigest()
+    return f"{_sources_hash}:{catalog_key(CATALOG_DB_PATH)}"
+
+
+def get_parse_cache():
+    """
+    Cache-ul de rezultate (parse_cache.py), deschis la prima folosire. Versiunea e
+    reverificată la fiecare cerere — în modul worker catalogul se poate schimba.
+    """
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = open_cache(_parser_version()) or False
+    elif _parse_cache:
+        _parse_cache.version = _parser_version()
+    return _parse_cache or None
+
+
+def disable_parse_cache():
+    global _parse_cache
+    _parse_cache = False
+
 
 # ──────────────────────────────────────────────────────────────
 # Parsare URL-uri web
 # ──────────────────────────────────────────────────────────────
 
-def parse_urls(urls: list) -> list:
+DEFAULT_URL_WORKERS = 4
+
+
+def _parse_one_url(url: str) -> list:
     """
-    Scrape-uiește URL-urile și returnează lista de rețete parsate.
+    Un URL → rețetele parsate (sau o eroare), fiecare cu câmpul "url".
     Flux: RecipeScraper → convert_to_txt_format → parse_text
     (aceleași funcții ca la importul din txt, cu excepția pasului de scraping).
+    Print-urile scraper-ului merg unde e stdout-ul curent — apelantul decide.
     """
-    buf = io.StringIO()
-    with redirect_stdout(buf), redirect_stderr(buf):
-        from scrape_recipes import RecipeScraper
+    try:
+        scraper = get_scraper()
+        recipe_raw = scraper.scrape_recipe(url)
+        if not recipe_raw:
+            return [{"error": f"Nu s-a putut extrage rețeta de la {url}", "url": url}]
 
-    scraper = RecipeScraper()
-    results = []
+        # Convertim la format txt (=== / # grup / ## Steps)
+        txt = scraper.convert_to_txt_format(recipe_raw)
 
-    for url in urls:
-        url = url.strip()
-        if not url:
-            continue
-        try:
-            # Redirect print-uri din scraper în stderr (nu poluăm stdout JSON)
-            buf = io.StringIO()
-            with redirect_stdout(buf):
-                recipe_raw = scraper.scrape_recipe(url)
-
-            if not recipe_raw:
-                results.append({"error": f"Nu s-a putut extrage rețeta de la {url}", "url": url})
-                continue
+        # Parsăm prin același pipeline ca importul din txt
+        parsed_list = parse_text(txt)
+        if not parsed_list:
+            return [{"error": f"Nu s-a putut parsa rețeta de la {url}", "url": url}]
+        return [{**parsed, "url": url} for parsed in parsed_list]
 
-            # Convertim la format txt (=== / # grup / ## Steps)
-            buf2 = io.StringIO()
-            with redirect_stdout(buf2):
-                txt = scraper.convert_to_txt_format(recipe_raw)
+    except Exception as e:
+        return [{"error": str(e), "url": url}]
 
-            # Parsăm prin același pipeline ca importul din txt
-            parsed_list = parse_text(txt)
-            if not parsed_list:
-                results.append({"error": f"Nu s-a putut parsa rețeta de la {url}", "url": url})
-                continue
 
-            results.extend(parsed_list)
+def iter_parse_urls(urls: list, workers: int = DEFAULT_URL_WORKERS):
+    """
+    Generator: rezultatele (rețetă sau eroare) în ordinea în care se termină.
+    URL-urile sunt procesate concurent pe `workers` thread-uri — scraping-ul e
+    dominat de rețea; fiecare thread are scraper-ul lui (get_scraper), catalogul
+    și cache-urile sunt partajate.
+    Apelantul trebuie să țină stdout-ul redirecționat cât iterează.
+    """
+    urls = [url.strip() for url in urls if url and url.strip()]
+    if not urls:
+        return
+    if workers <= 1 or len(urls) == 1:
+        for url in urls:
+            yield from _parse_one_url(url)
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as pool:
+        futures = [pool.submit(_parse_one_url, url) for url in urls]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def parse_urls(urls: list, workers: int = DEFAULT_URL_WORKERS) -> list:
+    """Scrape-uiește URL-urile și returnează lista de rețete parsate, în ordinea URL-urilor."""
+    order = {url.strip(): i for i, url in reversed(list(enumerate(urls)))}
+    # Print-urile din scraper nu poluează stdout JSON
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        results = list(iter_parse_urls(urls, workers))
+    # sorted e stabil → rețetele aceluiași URL își păstrează ordinea
+    return sorted(results, key=lambda r: order.get(r.get("url"), len(order)))
 
-        except Exception as e:
-            results.append({"error": str(e), "url": url})
 
-    return results
+def stream_parse_urls(urls: list, out, workers: int = DEFAULT_URL_WORKERS) -> int:
+    """Scrie fiecare rezultat ca o linie NDJSON în `out` imediat ce e gata."""
+    count = 0
+    # Un singur redirect pe toată durata (redirect_stdout e global, nu per thread):
+    # log-urile scraper-ului merg în stderr, stdout rămâne NDJSON curat
+    with redirect_stdout(sys.stderr):
+        for result in iter_parse_urls(urls, workers):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+    return count
 
 
 # ──────────────────────────────────────────────────────────────
 # Parser format simplu (nou)
 # ──────────────────────────────────────────────────────────────
 
-# Unități recunoscute pentru detecție automată
-_KNOWN_UNITS = {
-    'g', 'kg', 'mg', 'ml', 'l', 'dl', 'cl',
-    'tsp', 'tbsp', 'cup', 'cups',
-    'oz', 'lb', 'lbs',
-    'piece', 'pieces', 'buc', 'buc.',
-    'slice', 'slices', 'handful', 'pinch', 'scoop',
-    'can', 'bottle', 'clove', 'cloves', 'bunch', 'head', 'heads',
-    'cm', 'mm', 'inch',
-    # română
-    'linguriță', 'lingurițe', 'linguri', 'lingurite', 'lingura',
-    'ceasca', 'ceașcă', 'cești', 'cana',
-    'bucată', 'bucăți', 'fir', 'fire',
-}
-
 _META_RE = re.compile(
     r'^(Servings|Time|Difficulty|Favorite|Link|Image|Categories|Category|Batch):\s*(.*)',
     re.IGNORECASE
 )
 _STEP_RE = re.compile(r'^(\d+)[.)]\s+(.*)')
-_QTY_RE  = re.compile(r'^([¼½¾\d][¼½¾\d\s./,]*)\s+(.+)$')
-# Compact notation: "200g Ciocolată", "1.5kg Făină" (no space between qty and unit)
-_COMPACT_QTY_RE = re.compile(r'^([¼½¾\d][¼½¾\d./,]*)([a-zA-ZĂăȘșȚțÎîÂâ]+\.?)\s+(.+)$')
-
-# Caractere Unicode fracții → float
-_FRAC_MAP = {'½': '1/2', '¼': '1/4', '¾': '3/4'}
-
-
-def _to_float(s: str):
-    s = s.strip()
-    for ch, rep in _FRAC_MAP.items():
-        s = s.replace(ch, rep)
-    s = s.replace(',', '.')
-    try:
-        return float(Fraction(s))
-    except Exception:
-        return None
 
 
 def _parse_simple_ingredient(line: str):
@@ -128,49 +213,26 @@ def _parse_simple_ingredient(line: str):
     if not line:
         return None, None, None, None
 
+    tokens = tokenize(line)
+    if tokens is None:
+        # Fără cantitate (ex: "pătrunjel verde")
+        return None, None, line.lower(), None
+
+    qty = parse_quantity(tokens.qty)
+    unit = tokens.unit
+    name = tokens.name
+
     # Format vechi cu brackets: [qty unit] name
-    m_bracket = re.match(r'^\[([^\]]+)\]\s*(.+)$', line)
-    if m_bracket:
-        bracket, name = m_bracket.group(1).strip(), m_bracket.group(2).strip()
-        m_qu = re.match(r'^([¼½¾\d][¼½¾\d\s./,]*)\s+(.+)$', bracket)
-        if m_qu:
-            qty = _to_float(m_qu.group(1))
-            raw_unit = m_qu.group(2).strip() or None
-            unit = _ABBR_MAP.get(raw_unit.lower().rstrip('.'), raw_unit.rstrip('.')) if raw_unit else None
-        else:
-            qty = _to_float(bracket)
-            unit = "piece" if _to_float(bracket) is not None else None
+    if tokens.bracketed:
+        if unit:
+            unit = _ABBR_MAP.get(unit.lower().rstrip('.'), unit.rstrip('.'))
+        elif qty is not None:
+            unit = "piece"
         name_parts = name.split(',', 1)
         obs = name_parts[1].strip() or None if len(name_parts) > 1 else None
         name = name_parts[0].strip()
         return qty, unit, name.lower(), obs
 
-    # Format nou: qty [unit] name
-    m_qty = _QTY_RE.match(line)
-    if not m_qty:
-        # Try compact notation: "200g Ciocolată"
-        m_compact = _COMPACT_QTY_RE.match(line)
-        if m_compact and m_compact.group(2).lower().rstrip('.') in _KNOWN_UNITS:
-            qty = _to_float(m_compact.group(1))
-            unit = m_compact.group(2)
-            name = m_compact.group(3).strip()
-        else:
-            # Fără cantitate (ex: "pătrunjel verde")
-            return None, None, line.lower(), None
-    else:
-        qty = _to_float(m_qty.group(1))
-        rest = m_qty.group(2).strip()
-
-        # Detectează unitate ca prim cuvânt dacă e în lista cunoscută
-        parts = rest.split(None, 1)
-        first = parts[0].rstrip('.')
-        if first.lower() in _KNOWN_UNITS and len(parts) > 1:
-            unit = parts[0]
-            name = parts[1]
-        else:
-            unit = None
-            name = rest
-
     # Split obs FIRST (everything after first comma), then clean name
     name_parts = name.split(',', 1)
     obs = name_parts[1].strip() if len(name_parts) > 1 else None
@@ -349,6 +411,64 @@ def parse_txt_simple(text: str) -> list:
 # Parsare text manual
 # ──────────────────────────────────────────────────────────────
 
+_TITLE_LINE_RE = re.compile(r'^===\s*(.+?)\s*===$')
+# Image: cu cale locală → rezultatul depinde de fișierul de pe disc (și conține base64)
+_LOCAL_IMAGE_RE = re.compile(r'^\s*image:\s*(?!https?://|data:)\S', re.IGNORECASE | re.MULTILINE)
+
+
+def _split_recipe_blocks(text: str) -> list:
+    """
+    Blocurile '=== Titlu ===' + liniile lor. Textul dinaintea primului titlu e
+    ignorat oricum de parse_txt_simple; normalize_text și parser-ul își resetează
+    starea la fiecare titlu → parsarea bloc cu bloc dă același rezultat.
+    """
+    blocks = []
+    current = None
+    for line in text.splitlines():
+        if _TITLE_LINE_RE.match(line.strip()):
+            if current is not None:
+                blocks.append("\n".join(current))
+            current = [line]
+        elif current is not None:
+            current.append(line)
+    if current is not None:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def _parse_simple_blocks(text: str) -> list:
+    """
+    parse_txt_simple(normalize_text(text)), cu rezultatul memorat per rețetă:
+    la un text lipit din nou, doar blocurile modificate sunt re-parsate.
+    """
+    cache = get_parse_cache()
+    recipes = []
+    for block in _split_recipe_blocks(text):
+        if not cache or _LOCAL_IMAGE_RE.search(block):
+            recipes.extend(parse_txt_simple(normalize_text(block)))
+            continue
+        # Spațiile de la capăt de linie nu contează pentru parser
+        block = canonical_text(block)
+        parsed = cache.get("parse-text", block)
+        if parsed is None:
+            parsed = parse_txt_simple(normalize_text(block))
+            cache.put("parse-text", block, parsed)
+        recipes.extend(parsed)
+    return recipes
+
+
+def normalize_text_cached(text: str) -> str:
+    """normalize_text prin cache (cheia = textul exact: liniile neatinse rămân identice)."""
+    cache = get_parse_cache()
+    if not cache:
+        return normalize_text(text)
+    normalized = cache.get("normalize-text", text)
+    if normalized is None:
+        normalized = normalize_text(text)
+        cache.put("normalize-text", text, normalized)
+    return normalized
+
+
 def parse_text(text: str) -> list:
     """
     Parsează text în format simplu (nou) sau scraped (vechi).
@@ -370,26 +490,24 @@ def parse_text(text: str) -> list:
     if not text.strip():
         return []
 
-    # Normalizează unitățile românești înainte de parsare
-    # "400 de grame de fasole" → "400 g fasole", "3 linguri de" → "3 tbsp" etc.
-    text = normalize_text(text)
-
-    # Format cu === titlu === → folosim noul parser simplu
+    # Format cu === titlu === → noul parser simplu, bloc cu bloc prin cache
     if "===" in text:
         try:
-            return parse_txt_simple(text)
+            return _parse_simple_blocks(text)
         except Exception as e:
             return [{"error": str(e)}]
 
+    # Normalizează unitățile românești înainte de parsare
+    # "400 de grame de fasole" → "400 g fasole", "3 linguri de" → "3 tbsp" etc.
+    text = normalize_text(text)
+
     # Fallback: format vechi fără ===
     buf = io.StringIO()
     with redirect_stdout(buf), redirect_stderr(buf):
         from import_recipes import parse_scraped_file
-        from scrape_recipes import RecipeScraper
 
-    import tempfile
     try:
-        scraper = RecipeScraper()
+        scraper = get_scraper()
         recipe_blocks = re.split(
             r'(?:^|\n)\s*-{4,}\s*\n|\n(?:\s*\n){5,}', text
         )
@@ -397,26 +515,19 @@ def parse_text(text: str) -> list:
         for block in recipe_blocks:
             if not block.strip():
                 continue
-            with tempfile.NamedTemporaryFile(
-                mode='w', suffix='.txt', encoding='utf-8', delete=False
-            ) as f:
-                f.write(block.strip())
-                tmp_path = f.name
-            try:
-                buf2 = io.StringIO()
-                with redirect_stdout(buf2):
-                    recipe_raw = scraper._parse_local_file(tmp_path)
-                if recipe_raw:
-                    buf3 = io.StringIO()
-                    with redirect_stdout(buf3):
-                        txt = scraper.convert_to_txt_format(recipe_raw)
-                    buf4 = io.StringIO()
-                    with redirect_stdout(buf4):
-                        parsed = parse_scraped_file(txt)
-                    if parsed:
-                        recipes.extend(parsed)
-            finally:
-                os.unlink(tmp_path)
+            # Blocul e parsat direct din memorie (fără fișier temporar)
+            buf2 = io.StringIO()
+            with redirect_stdout(buf2):
+                recipe_raw = scraper.parse_local_text(block.strip())
+            if recipe_raw:
+                buf3 = io.StringIO()
+                with redirect_stdout(buf3):
+                    txt = scraper.convert_to_txt_format(recipe_raw)
+                buf4 = io.StringIO()
+                with redirect_stdout(buf4):
+                    parsed = parse_scraped_file(txt)
+                if parsed:
+                    recipes.extend(parsed)
         return recipes
     except Exception as e:
         return [{"error": str(e)}]
@@ -426,28 +537,6 @@ def parse_text(text: str) -> list:
 # Ingredient line normalizer (Romanian → structured)
 # ──────────────────────────────────────────────────────────────
 
-# Maps Romanian unit words to standard abbreviations
-_RO_UNITS = [
-    # longer patterns first to avoid partial matches
-    (r'\blingurițe?\b',        'tsp'),
-    (r'\blingurite?\b',        'tsp'),
-    (r'\blinguri\b',           'tbsp'),
-    (r'\blingura\b',           'tbsp'),
-    (r'\bcanã\b|\bcana\b|\bcani\b|\bcăni\b|\bceașcă\b|\bceașca\b|\bcești\b', 'cup'),
-    (r'\bbucăți\b|\bbucati\b|\bbucată\b|\bbucata\b', 'buc'),
-    (r'\bfire?\b',             'fire'),
-    (r'\bgrame?\b',            'g'),
-    (r'\bkilograme?\b',        'kg'),
-    (r'\bmililitri?\b',        'ml'),
-    (r'\blitri?\b',            'l'),
-]
-
-# "X de <unit>" or "X <unit>." patterns — Romanian genitive construction
-_DE_UNIT_RE = re.compile(
-    r'^([\d¼½¾][\d\s./,¼½¾-]*?)\s+(?:de\s+)?(grame?|g|kilograme?|kg|mililitri?|ml\.?|litri?|l|linguri?ță?|linguri|lingurița|lingurite|lingura|tbsp|tsp|cup|cupe?|cana|cani|căni|ceașcă|buc\.?|bucăți|fire?)\s+(?:de\s+)?(.+)$',
-    re.IGNORECASE | re.UNICODE,
-)
-
 _ABBR_MAP = {
     'grame': 'g', 'gram': 'g',
     'kilograme': 'kg', 'kilogram': 'kg',
@@ -474,13 +563,11 @@ def _normalize_ingredient_line(line: str) -> str:
     if not line:
         return line
 
-    m = _DE_UNIT_RE.match(line)
-    if m:
-        qty_raw = m.group(1).strip()
-        unit_raw = m.group(2).strip().lower().rstrip('.')
-        name = m.group(3).strip()
+    tokens = tokenize(line)
+    if tokens and tokens.unit and not tokens.bracketed:
+        unit_raw = tokens.unit.lower().rstrip('.')
         unit = _ABBR_MAP.get(unit_raw, unit_raw)
-        return f'{qty_raw} {unit} {name}'
+        return f'{tokens.qty} {unit} {tokens.name}'
 
     return line
 
@@ -540,6 +627,111 @@ def normalize_text(text: str) -> str:
     return '\n'.join(result)
 
 
+# ──────────────────────────────────────────────────────────────
+# Dispatch + mod worker
+# ──────────────────────────────────────────────────────────────
+
+def run_mode(mode: str, data: dict):
+    """Rezultatul JSON pentru un mod (același la apel unic și în worker)."""
+    if mode == "parse-urls":
+        return parse_urls(data.get("urls", []), data.get("workers", DEFAULT_URL_WORKERS))
+    if mode == "parse-text":
+        return parse_text(data.get("text", ""))
+    if mode == "normalize-text":
+        return {"text": normalize_text_cached(data.get("text", ""))}
+    raise ValueError(f"Mod necunoscut: {mode!r} (așteptat: {' | '.join(MODES)})")
+
+
+# Scraper-ul și redirect_stdout sunt per proces → cererile se execută pe rând
+_REQUEST_LOCK = threading.Lock()
+
+
+def handle_request(line: str, emit=None) -> dict:
+    """
+    O linie NDJSON → răspunsul, cu latența cererii în milisecunde.
+    Cu "stream": true la parse-urls, fiecare rezultat e trimis prin `emit` ca
+    {"id", "item"} imediat ce e gata; răspunsul final are doar numărul lor.
+    """
+    start = time.perf_counter()
+    req_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("cererea trebuie să fie un obiect JSON")
+        req_id = request.get("id")
+        with _REQUEST_LOCK, redirect_stdout(sys.stderr):
+            if request.get("stream") and request.get("mode") == "parse-urls" and emit:
+                count = 0
+                for item in iter_parse_urls(request.get("urls", []),
+                                            request.get("workers", DEFAULT_URL_WORKERS)):
+                    emit({"id": req_id, "item": item})
+                    count += 1
+                response = {"id": req_id, "result": {"count": count}}
+            else:
+                response = {"id": req_id, "result": run_mode(request.get("mode"), request)}
+    except Exception as e:
+        response = {"id": req_id, "error": str(e)}
+    response["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return response
+
+
+def serve_lines(lines, write):
+    """Procesează cereri NDJSON până la EOF; fiecare răspuns e scris imediat."""
+    def emit(message: dict):
+        write(json.dumps(message, ensure_ascii=False) + "\n")
+
+    for line in lines:
+        if line.strip():
+            emit(handle_request(line, emit))
+
+
+def warm_up():
+    """Încarcă scraper-ul + catalogul înainte de prima cerere (best effort)."""
+    start = time.perf_counter()
+    try:
+        get_scraper()
+        print(f"  ✓ Worker pregătit în {(time.perf_counter() - start) * 1000:.0f} ms", file=sys.stderr)
+    except Exception as e:
+        # Fără dependențele scraper-ului, parse-text/normalize-text tot funcționează
+        print(f"  ⚠ Scraper indisponibil ({e}); doar formatul === e suportat", file=sys.stderr)
+
+
+def serve(socket_path: str = None):
+    warm_up()
+    if not socket_path:
+        out = sys.stdout
+
+        def write(text: str):
+            out.write(text)
+            out.flush()
+        serve_lines(sys.stdin, write)
+        return
+
+    # Importate doar în modul socket (nu la fiecare apel --mode)
+    import signal
+    import socketserver
+
+    class SocketHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def write(text: str):
+                self.wfile.write(text.encode("utf-8"))
+                self.wfile.flush()
+            serve_lines(io.TextIOWrapper(self.rfile, encoding="utf-8"), write)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # socket rămas de la o rulare anterioară
+    with socketserver.ThreadingUnixStreamServer(socket_path, SocketHandler) as server:
+        print(f"  ✓ Ascult pe {socket_path}", file=sys.stderr)
+        # SIGTERM (ex: oprit de supervisor) → ieșire curată, socket-ul e șters
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+
 # ──────────────────────────────────────────────────────────────
 # Main
 # ──────────────────────────────────────────────────────────────
@@ -548,12 +740,28 @@ def main():
     parser = argparse.ArgumentParser(description="Web Import Handler pentru recipe scraper")
     parser.add_argument(
         "--mode",
-        choices=["parse-urls", "parse-text", "normalize-text"],
-        required=True,
+        choices=MODES,
         help="parse-urls | parse-text | normalize-text"
     )
+    parser.add_argument("--stream", action="store_true",
+                        help="parse-urls: NDJSON, câte o linie per rezultat, imediat ce e gata")
+    parser.add_argument("--workers", type=int, default=DEFAULT_URL_WORKERS,
+                        help=f"parse-urls: URL-uri procesate concurent (default: {DEFAULT_URL_WORKERS})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Nu folosi cache-ul de rezultate parse-text / normalize-text")
+    parser.add_argument("--serve", action="store_true",
+                        help="Worker de lungă durată: cereri NDJSON pe stdin sau --socket")
+    parser.add_argument("--socket", help="Cale socket Unix pentru --serve (default: stdin/stdout)")
     args = parser.parse_args()
 
+    if args.no_cache:
+        disable_parse_cache()
+    if args.serve:
+        serve(args.socket)
+        return
+    if not args.mode:
+        parser.error("--mode e obligatoriu (sau --serve)")
+
     try:
         data = json.load(sys.stdin)
     except json.JSONDecodeError as e:
@@ -561,14 +769,14 @@ def main():
         sys.exit(1)
 
     if args.mode == "parse-urls":
-        result = parse_urls(data.get("urls", []))
-        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
-    elif args.mode == "parse-text":
-        result = parse_text(data.get("text", ""))
-        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
-    elif args.mode == "normalize-text":
-        normalized = normalize_text(data.get("text", ""))
-        json.dump({"text": normalized}, sys.stdout, ensure_ascii=False, indent=2)
+        urls = data.get("urls", [])
+        if args.stream:
+            stream_parse_urls(urls, sys.stdout, args.workers)
+        else:
+            json.dump(parse_urls(urls, args.workers), sys.stdout, ensure_ascii=False, indent=2)
+        return
+
+    json.dump(run_mode(args.mode, data), sys.stdout, ensure_ascii=False, indent=2)
 
 
 if __name__ == "__main__":
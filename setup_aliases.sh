@@ -10,6 +10,11 @@ alias notion-cd='cd /Users/danielprundeanu/Documents/GitHub/notion'
 alias notion-scrape-url='cd /Users/danielprundeanu/Documents/GitHub/notion && source .venv/bin/activate && python scripts/scrape_recipes.py -url'
 alias notion-scrape-local='cd /Users/danielprundeanu/Documents/GitHub/notion && source .venv/bin/activate && python scripts/scrape_recipes.py -local'
 alias notion-scrape='notion-scrape-url'  # Default: scrape URLs
+alias notion-watch-url='cd /Users/danielprundeanu/Documents/GitHub/notion && source .venv/bin/activate && python scripts/scrape_recipes.py -url --watch'
+alias notion-watch-local='cd /Users/danielprundeanu/Documents/GitHub/notion && source .venv/bin/activate && python scripts/scrape_recipes.py -local --watch'
+
+# Un singur proces pentru scrape → normalize → import (ex: recipes run -m local)
+alias recipes='cd /Users/danielprundeanu/Documents/GitHub/notion && source .venv/bin/activate && python scripts/recipes.py'
 
 # Edit source files
 alias notion-urls='code /Users/danielprundeanu/Documents/GitHub/notion/data/urls/recipe_urls.txt'
@@ -7,6 +7,7 @@
  *   npx tsx scripts/seed-import-mappings.ts
  *
  * Idempotent (upsert by unique key). Skips mappings whose grocery item no longer exists.
+ * Keys are lowercased, like api/import/confirm does, so lookups by lowercased key match.
  */
 
 import { readFileSync, existsSync } from "fs";
@@ -45,9 +46,10 @@ async function main() {
   const mappings = readJson(MAPPINGS_PATH);
   const ids = new Set((await prisma.groceryItem.findMany({ select: { id: true } })).map((g) => g.id));
   let mAdded = 0, mSkipped = 0;
-  for (const [rawName, val] of Object.entries(mappings)) {
+  for (const [rawKey, val] of Object.entries(mappings)) {
+    const rawName = rawKey.toLowerCase().trim();
     const v = val as { groceryItemId?: string; groceryItemName?: string };
-    if (!v.groceryItemId || !ids.has(v.groceryItemId)) { mSkipped++; continue; }
+    if (!rawName || !v.groceryItemId || !ids.has(v.groceryItemId)) { mSkipped++; continue; }
     await prisma.ingredientNameMapping.upsert({
       where: { rawName },
       update: { groceryItemId: v.groceryItemId, groceryItemName: v.groceryItemName ?? "" },
@@ -60,7 +62,8 @@ async function main() {
   // 2. Unit rules
   const choices = readJson(CHOICES_PATH);
   let uAdded = 0, uSkipped = 0;
-  for (const [key, val] of Object.entries(choices)) {
+  for (const [rawKey, val] of Object.entries(choices)) {
+    const key = rawKey.toLowerCase().trim();
     const c = val as { action?: string; unit?: string; rate?: number; from_unit?: string | null };
     if (c.action !== "use_unit" || !c.unit || c.rate == null) { uSkipped++; continue; }
     await prisma.unitRule.upsert({